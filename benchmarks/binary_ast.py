@@ -0,0 +1,61 @@
+"""
+Benchmark: loading a cached AST against parsing the source again.
+Times ASTParser on the benchmark corpus, then the ``binary_ast`` encoding
+of the resulting tree (``dumps``/``loads``, and ``load`` through a memory
+map) next to ``pickle`` at its highest protocol, with the size of each.
+
+Usage (from the project root):
+    python -m benchmarks.binary_ast [--copies N] [--repeat N]
+"""
+
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+from benchmarks.corpus import program
+from src.frontend.ast_parser import ASTParser
+from src.utils import binary_ast
+
+
+def best(repeat: int, function, *args):
+    """``(result, fastest time)`` of ``repeat`` calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--copies", type=int, default=300)
+    arguments.add_argument("--repeat", type=int, default=5)
+    options = arguments.parse_args()
+
+    source = program(options.copies)
+    tree, parse_time = best(options.repeat, ASTParser().parse, source)
+    data, dumps_time = best(options.repeat, binary_ast.dumps, tree)
+    loaded, loads_time = best(options.repeat, binary_ast.loads, data)
+    assert str(loaded) == str(tree)
+    pickled, pickle_time = best(options.repeat, pickle.dumps, tree, pickle.HIGHEST_PROTOCOL)
+    _, unpickle_time = best(options.repeat, pickle.loads, pickled)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.tycast")
+        with open(path, "wb") as file:
+            binary_ast.dump(tree, file)
+        _, mmap_time = best(options.repeat, binary_ast.load, path)
+
+    print(f"corpus: {len(source)} characters of source")
+    print(f"{'':<22}{'write s':>10}{'read s':>10}{'bytes':>12}")
+    print(f"{'ASTParser.parse':<22}{'':>10}{parse_time:>10.3f}{len(source):>12}")
+    print(f"{'binary_ast':<22}{dumps_time:>10.3f}{loads_time:>10.3f}{len(data):>12}")
+    print(f"{'binary_ast.load (mmap)':<22}{'':>10}{mmap_time:>10.3f}{'':>12}")
+    print(f"{'pickle':<22}{pickle_time:>10.3f}{unpickle_time:>10.3f}{len(pickled):>12}")
+    print(f"loading is {parse_time / loads_time:.1f}x faster than parsing")
+
+
+if __name__ == "__main__":
+    main()
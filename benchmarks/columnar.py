@@ -0,0 +1,66 @@
+"""
+Benchmark: corpus-wide queries on a ColumnarAST against tree walks.
+Parses ``--programs`` small programs from the benchmark corpus, converts
+them to one ``ColumnarAST`` and answers three questions both ways: the
+node-kind histogram, the deepest node, and the number of ``printInt``
+calls. Needs NumPy.
+
+Usage (from the project root):
+    python -m benchmarks.columnar [--programs N]
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from benchmarks.corpus import program
+from src.frontend.ast_parser import ASTParser
+from src.utils.columnar import ColumnarAST
+from src.utils.nodes import FuncCall
+from src.utils.traversal import iter_child_nodes
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def walked(trees):
+    """The three answers from Python walks over the object trees."""
+    kinds, deepest, calls = Counter(), 0, 0
+    for tree in trees:
+        stack = [(tree, 0)]
+        while stack:
+            node, depth = stack.pop()
+            kinds[type(node).__name__] += 1
+            deepest = max(deepest, depth)
+            calls += isinstance(node, FuncCall) and node.name == "printInt"
+            stack.extend((child, depth + 1) for child in iter_child_nodes(node))
+    return dict(kinds), deepest, calls
+
+
+def vectorized(columns):
+    """The three answers from array operations on the columns."""
+    return columns.kind_histogram(), columns.max_depth(), columns.count(FuncCall, "printInt")
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--programs", type=int, default=2000)
+    options = arguments.parse_args()
+
+    parser = ASTParser()
+    trees = [parser.parse(program(1)) for _ in range(options.programs)]
+    columns, convert_time = timed(ColumnarAST.from_trees, trees)
+    by_walk, walk_time = timed(walked, trees)
+    by_arrays, array_time = timed(vectorized, columns)
+    assert by_walk == by_arrays
+    print(f"{options.programs} programs, {len(columns)} nodes")
+    print(f"tree walks          {walk_time:10.4f} s")
+    print(f"ColumnarAST queries {array_time:10.4f} s  ({walk_time / array_time:.0f}x faster)")
+    print(f"conversion (once)   {convert_time:10.4f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Synthetic TyC corpus shared by the benchmarks.
+``program(copies)`` repeats a handful of typical declarations (structs,
+loops, switches, calls, struct literals) under fresh names, so the size
+of the source and of its AST grows linearly with ``copies``.
+"""
+
+_TEMPLATE = """
+struct Point{i} {{ int x; int y; string label; }};
+
+Point{i} make{i}(int x, int y) {{
+    Point{i} p = {{x, y, "p{i}"}};
+    return p;
+}}
+
+int sum{i}(int n) {{
+    int total = 0;
+    for (auto k = 0; k < n; ++k) {{
+        if (k % 3 == 0 && k != 9) total = total + k * 2;
+        else {{ total = total - 1; continue; }}
+    }}
+    return total;
+}}
+
+scale{i}(float f, int n) {{
+    auto result = f * 1.5e2 / (n + 1);
+    while (result > 100.0 || !(n == 0)) {{ result = result / 2; n--; }}
+    return result;
+}}
+
+void main{i}() {{
+    auto n = readInt();
+    Point{i} p = make{i}(n, -n);
+    p.x = p.y = sum{i}(n) + p.x;
+    switch (n % 4) {{
+        case 0: printInt(p.x); break;
+        case 1: case 2: printFloat(scale{i}(2.5, n)); break;
+        default: printString(p.label);
+    }}
+}}
+"""
+
+
+def program(copies: int) -> str:
+    """Source of a TyC program built from ``copies`` renamed copies of the template."""
+    return "".join(_TEMPLATE.format(i=i) for i in range(copies))
@@ -0,0 +1,71 @@
+"""
+Benchmark: parsing and printing deeply nested TyC programs.
+Parses machine-generated programs that nest up to 100k levels deep with
+ASTParser and renders them with ``src.utils.serializer.render``, doubling
+the depth each round. With no recursion anywhere, the time per level
+stays flat as the depth grows, which is what linear time looks like.
+
+Usage (from the project root):
+    python -m benchmarks.deep_nesting [--max-depth N] [--antlr]
+
+``--antlr`` also times TyCParser with ASTGeneration in explicit-stack
+mode on the operator chain (much slower, and the ANTLR parser itself
+still recurses on the other shapes).
+"""
+
+import argparse
+import time
+
+from src.frontend.ast_parser import ASTParser
+from src.frontend.session import FrontEndSession
+from src.utils.serializer import render
+
+SHAPES = {
+    "a + a + ... + a": lambda n: "void f() { x = " + " + ".join(["a"] * n) + "; }",
+    "(1 + (1 + ...))": lambda n: "void f() { x = " + "(1 + " * n + "1" + ")" * n + "; }",
+    "x = x = ... = 1": lambda n: "void f() { " + "x = " * n + "1; }",
+    "f(1, f(1, ...))": lambda n: "void f() { x = " + "f(1, " * n + "1" + ")" * n + "; }",
+    "{{{ ... }}}": lambda n: "void f() " + "{" * n + "x;" + "}" * n,
+    "if else if ...": lambda n: "void f() { " + "if (a) x; else " * n + "y; }",
+}
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def depths(max_depth: int):
+    depth = max_depth
+    while depth * 8 >= max_depth and depth > 0:
+        yield depth
+        depth //= 2
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--max-depth", type=int, default=100_000)
+    arguments.add_argument("--antlr", action="store_true")
+    options = arguments.parse_args()
+
+    parser = ASTParser()
+    print(f"{'shape':<18}{'depth':>8}{'parse s':>10}{'render s':>10}{'us/level':>10}")
+    for name, make in SHAPES.items():
+        for depth in sorted(depths(options.max_depth)):
+            program, parse_time = timed(parser.parse, make(depth))
+            _, render_time = timed(render, program)
+            per_level = (parse_time + render_time) / depth * 1e6
+            print(f"{name:<18}{depth:>8}{parse_time:>10.3f}{render_time:>10.3f}{per_level:>10.2f}")
+
+    if options.antlr:
+        session = FrontEndSession(fast_lexer=True, explicit_stack=True)
+        make = SHAPES["a + a + ... + a"]
+        print(f"\n{'TyCParser + ASTGeneration':<26}{'depth':>8}{'build s':>10}{'us/level':>10}")
+        for depth in sorted(depths(options.max_depth)):
+            _, build_time = timed(session.build_ast, make(depth))
+            print(f"{'a + a + ... + a':<26}{depth:>8}{build_time:>10.3f}{build_time / depth * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: several light analyses run one after the other against the
+same analyses fused into one traversal with ``traversal.Fused``.
+The passes collect declared names, count literals, build the call graph,
+flag empty blocks and measure the deepest block nesting.
+
+Usage (from the project root):
+    python -m benchmarks.fused [--copies N] [--repeat N]
+"""
+
+import argparse
+import time
+from collections import Counter, defaultdict
+
+from benchmarks.corpus import program
+from src.frontend.ast_parser import ASTParser
+from src.utils.traversal import Fused, Walker
+
+
+class Symbols(Walker):
+    def __init__(self):
+        self.names = set()
+
+    def enter_func_decl(self, node):
+        self.names.add(node.name)
+
+    def enter_param(self, node):
+        self.names.add(node.name)
+
+    def enter_var_decl(self, node):
+        self.names.add(node.name)
+
+
+class Literals(Walker):
+    def __init__(self):
+        self.counts = Counter()
+
+    def enter_int_literal(self, node):
+        self.counts["int"] += 1
+
+    def enter_float_literal(self, node):
+        self.counts["float"] += 1
+
+    def enter_string_literal(self, node):
+        self.counts["string"] += 1
+
+
+class CallGraph(Walker):
+    def __init__(self):
+        self.calls = defaultdict(set)
+        self.function = None
+
+    def enter_func_decl(self, node):
+        self.function = node.name
+
+    def enter_func_call(self, node):
+        self.calls[self.function].add(node.name)
+
+
+class EmptyBlocks(Walker):
+    def __init__(self):
+        self.count = 0
+
+    def enter_block_stmt(self, node):
+        if not node.statements:
+            self.count += 1
+
+
+class Nesting(Walker):
+    def __init__(self):
+        self.depth = self.deepest = 0
+
+    def enter_block_stmt(self, node):
+        self.depth += 1
+        self.deepest = max(self.deepest, self.depth)
+
+    def leave_block_stmt(self, node):
+        self.depth -= 1
+
+
+PASSES = (Symbols, Literals, CallGraph, EmptyBlocks, Nesting)
+
+
+def results(walkers) -> list:
+    return [sorted(vars(walker).items()) for walker in walkers]
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--copies", type=int, default=500)
+    arguments.add_argument("--repeat", type=int, default=7)
+    options = arguments.parse_args()
+
+    tree = ASTParser().parse(program(options.copies))
+    separate_time = fused_time = float("inf")
+    for _ in range(options.repeat):
+        start = time.process_time()
+        separate = [cls().run(tree) for cls in PASSES]
+        separate_time = min(separate_time, time.process_time() - start)
+        start = time.process_time()
+        fused = Fused(*(cls() for cls in PASSES)).run(tree).walkers
+        fused_time = min(fused_time, time.process_time() - start)
+        assert results(separate) == results(fused)
+    print(f"{len(PASSES)} passes       seconds")
+    print(f"{'one by one':<16}{separate_time:>10.4f}")
+    print(f"{'fused':<16}{fused_time:>10.4f}")
+    print(f"fused takes {fused_time / separate_time:.0%} of the time")
+
+
+if __name__ == "__main__":
+    main()
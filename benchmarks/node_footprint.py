@@ -0,0 +1,90 @@
+"""
+Report: memory per AST node with ``__slots__`` against dict-backed nodes.
+Parses the benchmark corpus and copies its AST twice under tracemalloc:
+once into the ``nodes.py`` classes and once into dict-backed twins laid
+out like the nodes before they had ``__slots__`` (a ``__dict__`` holding
+``line``, ``column`` and the fields). Both copies share the same strings
+and numbers and the bytes of their child lists are left out, so the
+difference is the node layout alone.
+
+Usage (from the project root):
+    python -m benchmarks.node_footprint [--copies N]
+"""
+
+import argparse
+import sys
+import tracemalloc
+from collections import Counter
+
+from benchmarks.corpus import program
+from src.frontend.ast_parser import ASTParser
+from src.utils.nodes import ASTNode
+from src.utils.traversal import walk
+
+_TWINS = {}
+
+
+def fields(cls) -> tuple:
+    """Every slot of a node class, base classes first (the ``__init__`` order)."""
+    return tuple(name for klass in reversed(cls.__mro__) for name in vars(klass).get("__slots__", ()))
+
+
+def slotted(cls, names, values):
+    node = object.__new__(cls)  # a fresh node, even of a shared type
+    for name, value in zip(names, values):
+        setattr(node, name, value)
+    return node
+
+
+def dict_backed(cls, names, values):
+    twin = _TWINS.get(cls)
+    if twin is None:
+        twin = _TWINS[cls] = type(cls.__name__, (), {})
+    node = twin()
+    for name, value in zip(names, values):
+        setattr(node, name, value)
+    return node
+
+
+def footprint(root: ASTNode, make) -> tuple:
+    """``(node count, bytes of the nodes)`` of a copy of ``root`` built with ``make``."""
+    nodes = list(walk(root))
+    tracemalloc.start()
+    copies, list_bytes = {}, 0
+    for node in reversed(nodes):
+        values = []
+        for name in fields(type(node)):
+            value = getattr(node, name)
+            if isinstance(value, ASTNode):
+                value = copies[id(value)]
+            elif isinstance(value, list):
+                value = [copies[id(item)] for item in value]
+                list_bytes += sys.getsizeof(value)
+            values.append(value)
+        copies[id(node)] = make(type(node), fields(type(node)), values)
+    root_copy = copies[id(root)]
+    del copies, values, value
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del root_copy
+    return len(nodes), used - list_bytes
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--copies", type=int, default=500)
+    options = arguments.parse_args()
+
+    root = ASTParser().parse(program(options.copies))
+    kinds = Counter(type(node).__name__ for node in walk(root))
+    count, before = footprint(root, dict_backed)
+    _, after = footprint(root, slotted)
+    print(f"corpus: {count} nodes, {len(kinds)} node classes (python {sys.version.split()[0]})")
+    print(f"{'layout':<14}{'total MiB':>12}{'bytes/node':>12}")
+    print(f"{'__dict__':<14}{before / 2**20:>12.2f}{before / count:>12.1f}")
+    print(f"{'__slots__':<14}{after / 2**20:>12.2f}{after / count:>12.1f}")
+    print(f"saved {1 - after / before:.0%} of the node memory")
+
+
+if __name__ == "__main__":
+    main()
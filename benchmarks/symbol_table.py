@@ -0,0 +1,69 @@
+"""
+Benchmark: the persistent ``SymbolTable`` against copying a dict of the
+visible names at every scope.
+Simulates checking deeply nested blocks: each block declares a few
+variables, looks up names from every level and keeps a snapshot before
+each statement. The copying environment pays for all visible names at
+each block and snapshot, so its time per block grows with the depth.
+
+Usage (from the project root):
+    python -m benchmarks.symbol_table [--depth N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from src.semantics.symbol_table import SymbolTable
+
+_DECLARED = 4  # variables per block, each followed by a statement
+
+
+def persistent(depth: int):
+    table = SymbolTable()
+    snapshots = []
+    for level in range(depth):
+        table.push()
+        for index in range(_DECLARED):
+            table.declare(f"v{index}_{level}", level)
+            table.lookup(f"v{index}_{level // 2}")
+            snapshots.append(table.snapshot())
+    for _ in range(depth):
+        table.pop()
+    return snapshots
+
+
+def copying(depth: int):
+    scopes = [{}]
+    snapshots = []
+    for level in range(depth):
+        scopes.append(dict(scopes[-1]))
+        for index in range(_DECLARED):
+            scopes[-1][f"v{index}_{level}"] = level
+            scopes[-1].get(f"v{index}_{level // 2}")
+            snapshots.append(dict(scopes[-1]))
+    for _ in range(depth):
+        scopes.pop()
+    return snapshots
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--depth", type=int, default=1000)
+    arguments.add_argument("--repeat", type=int, default=3)
+    options = arguments.parse_args()
+
+    print(f"{'depth':>8}{'persistent':>14}{'copying':>14}")
+    for depth in (options.depth // 4, options.depth // 2, options.depth):
+        times = []
+        for build in (persistent, copying):
+            best = float("inf")
+            for _ in range(options.repeat):
+                start = time.process_time()
+                build(depth)
+                best = min(best, time.process_time() - start)
+            times.append(best)
+        print(f"{depth:>8}{times[0]:>14.4f}{times[1]:>14.4f}")
+
+
+if __name__ == "__main__":
+    main()
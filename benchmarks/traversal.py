@@ -0,0 +1,95 @@
+"""
+Benchmark: the explicit-stack ``traverse`` engine against ``BaseVisitor``.
+Counts the identifiers of the benchmark corpus with a ``BaseVisitor``
+subclass, a ``Walker`` and a bare ``traverse`` callback, taking turns,
+then walks a program nested deeper than the recursion limit, which only
+the engine can do.
+
+Usage (from the project root):
+    python -m benchmarks.traversal [--copies N] [--depth N] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.corpus import program
+from src.frontend.ast_parser import ASTParser
+from src.utils.nodes import Identifier
+from src.utils.traversal import Walker, traverse
+from src.utils.visitor import BaseVisitor
+
+
+class VisitorCount(BaseVisitor):
+    def __init__(self):
+        self.count = 0
+
+    def visit_identifier(self, node, o=None):
+        self.count += 1
+
+
+class WalkerCount(Walker):
+    def __init__(self):
+        self.count = 0
+
+    def enter_identifier(self, node):
+        self.count += 1
+
+
+def visitor_count(tree) -> int:
+    counter = VisitorCount()
+    counter.visit(tree)
+    return counter.count
+
+
+def traverse_count(tree) -> int:
+    count = 0
+
+    def pre(node):
+        nonlocal count
+        if node.__class__ is Identifier:
+            count += 1
+
+    traverse(tree, pre)
+    return count
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--copies", type=int, default=500)
+    arguments.add_argument("--depth", type=int, default=100000)
+    arguments.add_argument("--repeat", type=int, default=7)
+    options = arguments.parse_args()
+
+    tree = ASTParser().parse(program(options.copies))
+    ways = {
+        "BaseVisitor": visitor_count,
+        "Walker": lambda tree: WalkerCount().run(tree).count,
+        "traverse": traverse_count,
+    }
+    times = dict.fromkeys(ways, float("inf"))
+    for _ in range(options.repeat):
+        counts = set()
+        for name, count in ways.items():
+            start = time.process_time()
+            counts.add(count(tree))
+            times[name] = min(times[name], time.process_time() - start)
+        assert len(counts) == 1
+    print(f"{'corpus':<16}{'seconds':>10}")
+    for name, seconds in times.items():
+        print(f"{name:<16}{seconds:>10.4f}")
+
+    deep = ASTParser().parse("void f() { x = " + " + ".join(["a"] * options.depth) + "; }")
+    start = time.process_time()
+    count = traverse_count(deep)
+    print(f"{options.depth}-deep chain: traverse found {count} identifiers in "
+          f"{time.process_time() - start:.4f} s", end="")
+    try:
+        visitor_count(deep)
+        print()
+    except RecursionError:
+        print(f"; BaseVisitor hit the recursion limit ({sys.getrecursionlimit()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: scaling of the union-find type inference in
+``src.semantics.type_inference``.
+Checks programs built from growing numbers of copies of the benchmark
+corpus, then functions whose ``auto`` variables are chained by
+assignments (``a0 = a1; a1 = a2; ...``) before the last one gets a type,
+the worst case for inference that follows bindings one step at a time.
+Time per node stays flat in both when inference is near-linear.
+
+Usage (from the project root):
+    python -m benchmarks.type_inference [--copies N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import program
+from src.frontend.ast_parser import ASTParser
+from src.semantics.type_inference import infer_types
+from src.utils.traversal import walk
+
+
+def chained(count: int) -> str:
+    declarations = " ".join(f"auto a{i};" for i in range(count))
+    assignments = " ".join(f"a{i} = a{i + 1};" for i in range(count - 1))
+    return f"void f() {{ {declarations} {assignments} a{count - 1} = 1.5; }}"
+
+
+def measure(source: str, repeat: int):
+    tree = ASTParser().parse(source)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        infer_types(tree)
+        best = min(best, time.process_time() - start)
+    return sum(1 for _ in walk(tree)), best
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--copies", type=int, default=100)
+    arguments.add_argument("--repeat", type=int, default=5)
+    options = arguments.parse_args()
+
+    print(f"{'program':<24}{'nodes':>10}{'seconds':>10}{'us/node':>10}")
+    for scale in (1, 2, 4, 8):
+        for name, source in (
+            (f"corpus x{options.copies * scale}", program(options.copies * scale)),
+            (f"chain of {1000 * scale}", chained(1000 * scale)),
+        ):
+            nodes, seconds = measure(source, options.repeat)
+            print(f"{name:<24}{nodes:>10}{seconds:>10.4f}{seconds / nodes * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
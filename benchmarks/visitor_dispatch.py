@@ -0,0 +1,67 @@
+"""
+Benchmark: table-driven ``ASTVisitor.visit`` against ``accept`` double dispatch.
+Runs the same ``BaseVisitor`` subclass (it counts identifiers and calls)
+over the benchmark corpus twice, taking turns: once through the dispatch
+tables and once with ``visit`` overridden to go through
+``node.accept(self, o)`` as it used to (which also makes ``BaseVisitor``
+send every child through that ``visit``).
+
+Usage (from the project root):
+    python -m benchmarks.visitor_dispatch [--copies N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import program
+from src.frontend.ast_parser import ASTParser
+from src.utils.visitor import BaseVisitor
+
+
+class Counter(BaseVisitor):
+    def __init__(self):
+        self.identifiers = self.calls = 0
+
+    def visit_identifier(self, node, o=None):
+        self.identifiers += 1
+
+    def visit_func_call(self, node, o=None):
+        self.calls += 1
+        super().visit_func_call(node, o)
+
+
+class AcceptCounter(Counter):
+    def visit(self, node, o=None):
+        return node.accept(self, o)
+
+
+def timed(visitor_class, tree) -> tuple:
+    """``(counts, seconds)`` of one visit of ``tree``."""
+    visitor = visitor_class()
+    start = time.process_time()
+    visitor.visit(tree)
+    return (visitor.identifiers, visitor.calls), time.process_time() - start
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arguments.add_argument("--copies", type=int, default=500)
+    arguments.add_argument("--repeat", type=int, default=7)
+    options = arguments.parse_args()
+
+    tree = ASTParser().parse(program(options.copies))
+    table_time = accept_time = float("inf")
+    for _ in range(options.repeat):
+        counts, seconds = timed(Counter, tree)
+        table_time = min(table_time, seconds)
+        accept_counts, seconds = timed(AcceptCounter, tree)
+        accept_time = min(accept_time, seconds)
+        assert counts == accept_counts
+    print(f"{'dispatch':<16}{'seconds':>10}")
+    print(f"{'node.accept':<16}{accept_time:>10.4f}")
+    print(f"{'table':<16}{table_time:>10.4f}")
+    print(f"table dispatch takes {table_time / accept_time:.0%} of the accept time")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,259 @@ into Abstract Syntax Trees using the visitor pattern.
 """
 
 from functools import reduce
+from antlr4 import ParserRuleContext
+from antlr4.tree.Tree import TerminalNode
 from build.TyCVisitor import TyCVisitor
 from build.TyCParser import TyCParser
 from src.utils.nodes import *
 
 
 class ASTGeneration(TyCVisitor):
-    """AST Generation visitor for TyC language."""
+    """AST Generation visitor for TyC language.
 
-    pass
+    With ``explicit_stack=True`` the parse tree is visited without Python
+    recursion, so a chain of 100k ``+`` (one rule context per operator)
+    does not hit the recursion limit.
+    """
+
+    def __init__(self, explicit_stack: bool = False):
+        super().__init__()
+        self.explicit_stack = explicit_stack
+        # ASTs of the rule contexts already visited, while ``visit`` runs
+        # in explicit-stack mode.
+        self._built = None
+
+    def visit(self, tree):
+        if not self.explicit_stack:
+            return tree.accept(self)
+        if self._built is not None:
+            return self._built.pop(tree)
+        # Visit every rule context below ``tree`` children first, so that
+        # each ``visitX`` finds the ASTs of its children in ``_built``
+        # instead of visiting them itself.
+        built = self._built = {}
+        try:
+            stack = [(tree, False)]
+            while stack:
+                ctx, ready = stack.pop()
+                if ready:
+                    built[ctx] = ctx.accept(self)
+                    continue
+                stack.append((ctx, True))
+                for child in ctx.getChildren():
+                    if isinstance(child, ParserRuleContext):
+                        stack.append((child, False))
+            return built.pop(tree)
+        finally:
+            self._built = None
+
+    # ------------------------------------------------------------------
+    # Program and declarations
+    # ------------------------------------------------------------------
+
+    # program: (structDecl | funcDecl)* EOF
+    def visitProgram(self, ctx: TyCParser.ProgramContext):
+        decls = [self.visit(child) for child in ctx.getChildren()
+                 if not isinstance(child, TerminalNode)]
+        return Program(decls)
+
+    # structDecl: STRUCT ID LB memberDecl* RB SEMI
+    def visitStructDecl(self, ctx: TyCParser.StructDeclContext):
+        return StructDecl(ctx.ID().getText(), [self.visit(m) for m in ctx.memberDecl()])
+
+    # memberDecl: explicitType ID SEMI
+    def visitMemberDecl(self, ctx: TyCParser.MemberDeclContext):
+        return MemberDecl(self.visit(ctx.explicitType()), ctx.ID().getText())
+
+    # funcDecl: returnType? ID LP paramList? RP block
+    def visitFuncDecl(self, ctx: TyCParser.FuncDeclContext):
+        return_type = self.visit(ctx.returnType()) if ctx.returnType() else None
+        params = self.visit(ctx.paramList()) if ctx.paramList() else []
+        return FuncDecl(return_type, ctx.ID().getText(), params, self.visit(ctx.block()))
+
+    # paramList: param (COMMA param)*
+    def visitParamList(self, ctx: TyCParser.ParamListContext):
+        return [self.visit(p) for p in ctx.param()]
+
+    # param: explicitType ID
+    def visitParam(self, ctx: TyCParser.ParamContext):
+        return Param(self.visit(ctx.explicitType()), ctx.ID().getText())
+
+    # ------------------------------------------------------------------
+    # Types
+    # ------------------------------------------------------------------
+
+    # explicitType: INT | FLOAT | STRING | ID
+    def visitExplicitType(self, ctx: TyCParser.ExplicitTypeContext):
+        if ctx.INT():
+            return IntType()
+        if ctx.FLOAT():
+            return FloatType()
+        if ctx.STRING():
+            return StringType()
+        return StructType(ctx.ID().getText())
+
+    # returnType: VOID | explicitType
+    def visitReturnType(self, ctx: TyCParser.ReturnTypeContext):
+        return VoidType() if ctx.VOID() else self.visit(ctx.explicitType())
+
+    # varType: AUTO | explicitType  ('auto' is represented by None)
+    def visitVarType(self, ctx: TyCParser.VarTypeContext):
+        return None if ctx.AUTO() else self.visit(ctx.explicitType())
+
+    # ------------------------------------------------------------------
+    # Statements
+    # ------------------------------------------------------------------
+
+    # IF LP expr RP stmt (ELSE stmt)?
+    def visitIfStmt(self, ctx: TyCParser.IfStmtContext):
+        else_stmt = self.visit(ctx.stmt(1)) if ctx.ELSE() else None
+        return IfStmt(self.visit(ctx.expr()), self.visit(ctx.stmt(0)), else_stmt)
+
+    # WHILE LP expr RP stmt
+    def visitWhileStmt(self, ctx: TyCParser.WhileStmtContext):
+        return WhileStmt(self.visit(ctx.expr()), self.visit(ctx.stmt()))
+
+    # FOR LP forInit expr? SEMI expr? RP stmt
+    def visitForStmt(self, ctx: TyCParser.ForStmtContext):
+        # Both expressions are optional, so tell them apart by their
+        # position relative to the SEMI that ends the condition.
+        condition = update = None
+        seen_semi = False
+        for child in ctx.getChildren():
+            if isinstance(child, TerminalNode):
+                seen_semi = seen_semi or child.getSymbol().type == TyCParser.SEMI
+            elif isinstance(child, TyCParser.ExprContext):
+                if seen_semi:
+                    update = self.visit(child)
+                else:
+                    condition = self.visit(child)
+        return ForStmt(self.visit(ctx.forInit()), condition, update, self.visit(ctx.stmt()))
+
+    # forInit: varDecl | expr? SEMI
+    def visitForInit(self, ctx: TyCParser.ForInitContext):
+        if ctx.varDecl():
+            return self.visit(ctx.varDecl())
+        if ctx.expr():
+            return ExprStmt(self.visit(ctx.expr()))
+        return None
+
+    # SWITCH LP expr RP LB switchCase* RB
+    def visitSwitchStmt(self, ctx: TyCParser.SwitchStmtContext):
+        cases = []
+        default_case = None
+        for group in ctx.switchCase():
+            for label in self.visit(group):
+                if isinstance(label, DefaultStmt):
+                    default_case = label
+                else:
+                    cases.append(label)
+        return SwitchStmt(self.visit(ctx.expr()), cases, default_case)
+
+    # switchCase: (CASE expr COLON | DEFAULT COLON)+ stmt*
+    def visitSwitchCase(self, ctx: TyCParser.SwitchCaseContext):
+        # Stacked labels share one statement list, which belongs to the last
+        # label; the earlier ones fall through to it with an empty body.
+        labels = []
+        for child in ctx.getChildren():
+            if isinstance(child, TerminalNode):
+                if child.getSymbol().type == TyCParser.DEFAULT:
+                    labels.append(DefaultStmt([]))
+            elif isinstance(child, TyCParser.ExprContext):
+                labels.append(CaseStmt(self.visit(child), []))
+        labels[-1].statements = [self.visit(s) for s in ctx.stmt()]
+        return labels
+
+    # BREAK SEMI
+    def visitBreakStmt(self, ctx: TyCParser.BreakStmtContext):
+        return BreakStmt()
+
+    # CONTINUE SEMI
+    def visitContinueStmt(self, ctx: TyCParser.ContinueStmtContext):
+        return ContinueStmt()
+
+    # RETURN expr? SEMI
+    def visitReturnStmt(self, ctx: TyCParser.ReturnStmtContext):
+        return ReturnStmt(self.visit(ctx.expr()) if ctx.expr() else None)
+
+    # block
+    def visitBlockStmt(self, ctx: TyCParser.BlockStmtContext):
+        return self.visit(ctx.block())
+
+    # varDecl
+    def visitVarDeclStmt(self, ctx: TyCParser.VarDeclStmtContext):
+        return self.visit(ctx.varDecl())
+
+    # expr SEMI
+    def visitExprStmt(self, ctx: TyCParser.ExprStmtContext):
+        return ExprStmt(self.visit(ctx.expr()))
+
+    # block: LB stmt* RB
+    def visitBlock(self, ctx: TyCParser.BlockContext):
+        return BlockStmt([self.visit(s) for s in ctx.stmt()])
+
+    # varDecl: varType ID (ASSIGN expr)? SEMI
+    def visitVarDecl(self, ctx: TyCParser.VarDeclContext):
+        init_value = self.visit(ctx.expr()) if ctx.expr() else None
+        return VarDecl(self.visit(ctx.varType()), ctx.ID().getText(), init_value)
+
+    # ------------------------------------------------------------------
+    # Expressions
+    # ------------------------------------------------------------------
+
+    # ID LP exprList? RP
+    def visitFuncCall(self, ctx: TyCParser.FuncCallContext):
+        args = self.visit(ctx.exprList()) if ctx.exprList() else []
+        return FuncCall(ctx.ID().getText(), args)
+
+    # LB exprList? RB
+    def visitStructLiteral(self, ctx: TyCParser.StructLiteralContext):
+        return StructLiteral(self.visit(ctx.exprList()) if ctx.exprList() else [])
+
+    # ID
+    def visitIdExpr(self, ctx: TyCParser.IdExprContext):
+        return Identifier(ctx.ID().getText())
+
+    # INTLIT
+    def visitIntLitExpr(self, ctx: TyCParser.IntLitExprContext):
+        return IntLiteral(int(ctx.INTLIT().getText()))
+
+    # FLOATLIT
+    def visitFloatLitExpr(self, ctx: TyCParser.FloatLitExprContext):
+        return FloatLiteral(float(ctx.FLOATLIT().getText()))
+
+    # STRLIT (the lexer has already removed the quotes)
+    def visitStringLitExpr(self, ctx: TyCParser.StringLitExprContext):
+        return StringLiteral(ctx.STRLIT().getText())
+
+    # LP expr RP
+    def visitParentExpr(self, ctx: TyCParser.ParentExprContext):
+        return self.visit(ctx.expr())
+
+    # expr DOT ID
+    def visitMemberAccess(self, ctx: TyCParser.MemberAccessContext):
+        return MemberAccess(self.visit(ctx.expr()), ctx.ID().getText())
+
+    # expr (INCR | DECR)
+    def visitPostfixExpr(self, ctx: TyCParser.PostfixExprContext):
+        return PostfixOp(ctx.getChild(1).getText(), self.visit(ctx.expr()))
+
+    # (INCR | DECR) expr
+    def visitPrefixExpr(self, ctx: TyCParser.PrefixExprContext):
+        return PrefixOp(ctx.getChild(0).getText(), self.visit(ctx.expr()))
+
+    # (NOT | SUB | ADD) expr
+    def visitUnaryExpr(self, ctx: TyCParser.UnaryExprContext):
+        return PrefixOp(ctx.getChild(0).getText(), self.visit(ctx.expr()))
+
+    # expr op expr, for every binary precedence level
+    def visitBinaryOp(self, ctx: TyCParser.BinaryOpContext):
+        return BinaryOp(self.visit(ctx.expr(0)), ctx.getChild(1).getText(), self.visit(ctx.expr(1)))
+
+    # <assoc=right> expr ASSIGN expr
+    def visitAssignExpr(self, ctx: TyCParser.AssignExprContext):
+        return AssignExpr(self.visit(ctx.expr(0)), self.visit(ctx.expr(1)))
+
+    # exprList: expr (COMMA expr)*
+    def visitExprList(self, ctx: TyCParser.ExprListContext):
+        return [self.visit(e) for e in ctx.expr()]
@@ -0,0 +1,15 @@
+"""
+Front-end helpers for TyC compiler (lexing and parsing entry points)
+"""
+
+import os
+import sys
+
+# The generated lexer imports ``lexererr`` as a top-level module, so the
+# build directory has to be importable before anything from ``build`` is used.
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_build_dir = os.path.join(_project_root, "build")
+if _build_dir not in sys.path:
+    sys.path.insert(0, _build_dir)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
@@ -0,0 +1,620 @@
+"""
+Direct-to-AST parser for TyC.
+ASTParser is a hand-written recursive-descent parser with a Pratt loop for
+the ``expr`` rule that builds ``src.utils.nodes`` objects straight from the
+token stream, skipping the ANTLR parse tree and the ASTGeneration visit.
+It accepts exactly the language of ``src/grammar/TyC.g4``, produces ASTs
+that print identically to the TyCParser + ASTGeneration path, and raises
+the same ``SyntaxException`` (or lexer error) as ``NewErrorListener``.
+"""
+
+from typing import Generator, Optional
+
+from antlr4.Token import Token
+
+from build.TyCLexer import TyCLexer as T
+from src.frontend.char_stream import CompactInputStream
+from src.frontend.fast_lexer import FastLexer
+from src.frontend.token_buffer import TokenBufferStream
+from src.utils.error_listener import SyntaxException
+from src.utils.nodes import *
+
+# Binding power of each infix operator, following the precedence
+# predicates ANTLR generates for the left-recursive ``expr`` rule.
+_MEMBER_PREC = 11
+_POSTFIX_PREC = 10
+_PREFIX_OPERAND_PREC = 9  # operand of ++x / --x
+_UNARY_OPERAND_PREC = 8  # operand of !x / -x / +x
+_BINARY_PREC = {
+    T.MUL: 7, T.DIV: 7, T.MOD: 7,
+    T.ADD: 6, T.SUB: 6,
+    T.LT: 5, T.LEQ: 5, T.GT: 5, T.GEQ: 5,
+    T.EQ: 4, T.NEQ: 4,
+    T.AND: 3,
+    T.OR: 2,
+    T.ASSIGN: 1,
+}
+
+# What an unfinished operand is waiting for in the expression parser.
+_BINARY, _ASSIGN, _PREFIX, _PAREN, _CALL, _STRUCT = range(6)
+
+_PREFIX_OPS = frozenset((T.INCR, T.DECR))
+# Binding power of every operator that can follow an operand.
+_OPERATOR_PREC = {T.DOT: _MEMBER_PREC, T.INCR: _POSTFIX_PREC, T.DECR: _POSTFIX_PREC, **_BINARY_PREC}
+_UNARY_OPS = frozenset((T.NOT, T.SUB, T.ADD))
+# Type nodes are shared (see ``nodes.Type``), so the parser hands out these.
+_PRIMITIVE_TYPES = {T.INT: IntType(), T.FLOAT: FloatType(), T.STRING: StringType()}
+_VOID_TYPE = VoidType()
+_EXPLICIT_TYPES = frozenset((T.INT, T.FLOAT, T.STRING, T.ID))
+_VAR_TYPES = frozenset((T.AUTO, T.INT, T.FLOAT, T.STRING))
+
+_EXPR_START = frozenset((T.ID, T.LB, T.INTLIT, T.FLOATLIT, T.STRLIT, T.LP)) | _PREFIX_OPS | _UNARY_OPS
+_STMT_START = _EXPR_START | _VAR_TYPES | frozenset(
+    (T.IF, T.WHILE, T.FOR, T.SWITCH, T.BREAK, T.CONTINUE, T.RETURN)
+)
+_NESTED_STMT_START = frozenset((T.IF, T.WHILE, T.FOR, T.SWITCH, T.LB))
+_DECL_START = frozenset((T.STRUCT, T.VOID)) | _EXPLICIT_TYPES
+# Tokens that may follow a leading ID in an expression statement.
+_AFTER_ID_IN_EXPR = frozenset((T.LP, T.DOT, T.SEMI)) | _PREFIX_OPS | frozenset(_BINARY_PREC)
+
+
+# How many tokens past a syntax error ANTLR reads before reporting it.
+_READ_NONE = 0  # sync after a loop iteration reports the token as is
+_READ_NEXT = 1  # a mismatched token first checks if the next one would fit
+_READ_ALL = -1  # a no-viable-alternative report prints the remaining input
+
+
+class _Failure(Exception):
+    """Internal syntax error at token ``index``.
+
+    ``reads`` mirrors how far ANTLR reads before the error reaches
+    ``NewErrorListener``, so that a lexer error in those tokens wins over
+    the syntax error exactly as it does with TyCParser.
+    """
+
+    def __init__(self, index: int, reads: int = _READ_NEXT):
+        self.index = index
+        self.reads = reads
+
+
+def _syntax_error(line: int, column: int, text: str) -> SyntaxException:
+    return SyntaxException(f"Error on line {line} col {column}: {text}")
+
+
+def _lexed(index: int) -> bool:
+    """``_fetch`` for token stores that are lexed to EOF up front."""
+    return True
+
+
+class ASTParser:
+    """Parse TyC source directly into a ``Program``.
+
+    Tokens are pulled lazily from the lexer exactly as far as the ANTLR
+    parser would read them, so lexer errors and syntax errors are reported
+    in the same order. One instance can be reused for many sources.
+
+    Nesting depth is limited only by memory: expressions are parsed with
+    an explicit operator stack and statement rules are generators driven
+    by ``_run``, so 100k chained operators or nested blocks neither hit
+    the recursion limit nor slow down.
+    """
+
+    def __init__(self, fast_lexer: bool = True):
+        self.make_input = str if fast_lexer else CompactInputStream
+        self.lexer = FastLexer("") if fast_lexer else T(CompactInputStream(""))
+        self.token_stream = TokenBufferStream(self.lexer)
+        # Reads the lexer until the given token index (EOF stops it).
+        self._fetch = self.token_stream.sync
+        # Failure of a full expression by start index. ``{`` opens both a
+        # block and a struct literal, and each nested ``{`` in ``{{{x;}}}``
+        # retries the struct literal over the same tokens: without this
+        # the retries make deeply nested blocks quadratic.
+        self._failed = {}
+
+    def parse(self, source: str) -> Program:
+        """AST of ``source``; lexer errors and ``SyntaxException`` are raised."""
+        self.lexer.inputStream = self.make_input(source)
+        self.token_stream.setTokenSource(self.lexer)
+        buffer = self._buffer = self.token_stream.buffer
+        self._types = buffer.types
+        self._pos = 0
+        self._failed.clear()
+        self._fetch(0)
+        try:
+            return self._program()
+        except _Failure as failure:
+            self._fetch(len(source) if failure.reads == _READ_ALL else failure.index + failure.reads)
+            index = min(failure.index, len(buffer) - 1)
+            raise _syntax_error(buffer.lines[index], buffer.columns[index], buffer.text(index)) from None
+        finally:
+            self._buffer = self._types = None
+
+    def parse_decl(self, tokens, index: int):
+        """Top-level declaration at token ``index``: ``(decl, end index)``.
+
+        ``tokens`` is a TokenBuffer or IncrementalLexer lexed up to EOF. At
+        the end of the program ``(None, index)`` is returned; anything else
+        that cannot start a declaration raises the ``SyntaxException`` of a
+        full parse.
+        """
+        self._buffer, self._types, self._pos = tokens, tokens.types, index
+        self._fetch = _lexed
+        self._failed.clear()
+        try:
+            ttype = self._types[index]
+            if ttype == T.STRUCT:
+                decl = self._struct_decl()
+            elif ttype in _DECL_START:
+                decl = self._func_decl()
+            else:
+                self._expect(Token.EOF)
+                return None, index
+            return decl, self._pos
+        except _Failure as failure:
+            index = min(failure.index, len(tokens) - 1)
+            raise _syntax_error(tokens.line(index), tokens.column(index), tokens.text(index)) from None
+        finally:
+            self._buffer = self._types = None
+            self._fetch = self.token_stream.sync
+
+    # ------------------------------------------------------------------
+    # Token buffer
+    # ------------------------------------------------------------------
+
+    def _la(self, k: int) -> int:
+        """Type of the k-th token after the current one (k=0 is current)."""
+        index = self._pos + k
+        self._fetch(index)
+        types = self._types
+        return types[index] if index < len(types) else Token.EOF
+
+    def _advance(self):
+        """Consume the current token and return its text."""
+        text = self._buffer.text(self._pos)
+        if self._types[self._pos] != Token.EOF:
+            self._pos += 1
+            self._fetch(self._pos)
+        return text
+
+    def _expect(self, ttype: int, reads: int = _READ_NEXT) -> str:
+        if self._types[self._pos] != ttype:
+            raise _Failure(self._pos, reads)
+        return self._advance()
+
+    def _try(self, rule):
+        """Run ``rule`` speculatively: ``(node, end, failure)``, position restored."""
+        start = self._pos
+        try:
+            node = rule()
+            return node, self._pos, None
+        except _Failure as failure:
+            return None, failure.index, failure
+        finally:
+            self._pos = start
+
+    @staticmethod
+    def _run(rule: Generator):
+        """Value of a statement rule, run without nesting Python frames.
+
+        Statement rules are generators: to parse a nested statement they
+        ``yield`` the generator of that rule and are sent back its result,
+        or have its exception thrown in at the ``yield``. This loop keeps
+        the chain of unfinished rules on an explicit stack, so blocks,
+        ``if``/``else`` chains and loop bodies can nest to any depth.
+        """
+        stack = [rule]
+        value = error = None
+        while True:
+            try:
+                if error is None:
+                    call = stack[-1].send(value)
+                else:
+                    call, error = stack[-1].throw(error), None
+            except StopIteration as done:
+                stack.pop()
+                if not stack:
+                    return done.value
+                value, error = done.value, None
+                continue
+            except Exception as e:
+                stack.pop()
+                if not stack:
+                    raise
+                value, error = None, e
+                continue
+            stack.append(call)
+            value = None
+
+    # ------------------------------------------------------------------
+    # Declarations
+    # ------------------------------------------------------------------
+
+    def _program(self) -> Program:
+        decls = []
+        while self._types[self._pos] in _DECL_START:
+            if self._types[self._pos] == T.STRUCT:
+                decls.append(self._struct_decl())
+            else:
+                decls.append(self._func_decl())
+        self._expect(Token.EOF, _READ_NONE if decls else _READ_NEXT)
+        return Program(decls)
+
+    def _struct_decl(self) -> StructDecl:
+        self._advance()
+        name = self._expect(T.ID)
+        self._expect(T.LB)
+        members = []
+        while self._types[self._pos] in _EXPLICIT_TYPES:
+            member_type = self._explicit_type()
+            members.append(MemberDecl(member_type, self._expect(T.ID)))
+            self._expect(T.SEMI)
+        self._expect(T.RB, _READ_NONE if members else _READ_NEXT)
+        self._expect(T.SEMI)
+        return StructDecl(name, members)
+
+    def _func_decl(self) -> FuncDecl:
+        return_type = None
+        ttype = self._types[self._pos]
+        if ttype == T.VOID:
+            self._advance()
+            return_type = _VOID_TYPE
+        elif ttype != T.ID:
+            return_type = self._explicit_type()
+        else:
+            # ``returnType? ID LP``: a struct return type is an ID followed by an ID.
+            following = self._la(1)
+            if following == T.ID:
+                return_type = self._explicit_type()
+            elif following != T.LP:
+                raise _Failure(self._pos + 1, _READ_ALL)
+        name = self._expect(T.ID)
+        self._expect(T.LP)
+        params = []
+        if self._types[self._pos] in _EXPLICIT_TYPES:
+            params.append(self._param())
+            while self._types[self._pos] == T.COMMA:
+                self._advance()
+                params.append(self._param())
+        self._expect(T.RP)
+        return FuncDecl(return_type, name, params, self._run(self._block()))
+
+    def _param(self) -> Param:
+        param_type = self._explicit_type()
+        return Param(param_type, self._expect(T.ID))
+
+    def _explicit_type(self) -> Type:
+        ttype = self._types[self._pos]
+        if ttype == T.ID:
+            return StructType(self._advance())
+        if ttype in _PRIMITIVE_TYPES:
+            self._advance()
+            return _PRIMITIVE_TYPES[ttype]
+        raise _Failure(self._pos)
+
+    # ------------------------------------------------------------------
+    # Statements
+    # ------------------------------------------------------------------
+
+    def _block(self) -> Generator:
+        self._expect(T.LB)
+        statements = []
+        while self._types[self._pos] in _STMT_START:
+            statements.append(self._simple_stmt() or (yield self._nested_stmt()))
+        self._expect(T.RB, _READ_NONE if statements else _READ_NEXT)
+        return BlockStmt(statements)
+
+    def _nested_stmt(self) -> Generator:
+        """Rule for a statement that holds other statements (see ``_run``)."""
+        ttype = self._types[self._pos]
+        if ttype == T.IF:
+            return self._if_stmt()
+        if ttype == T.WHILE:
+            return self._while_stmt()
+        if ttype == T.FOR:
+            return self._for_stmt()
+        if ttype == T.SWITCH:
+            return self._switch_stmt()
+        return self._block_or_struct_literal_stmt()
+
+    def _simple_stmt(self) -> Optional[Stmt]:
+        """A statement that holds no others, or None where ``_nested_stmt`` applies.
+
+        Statements are read as ``self._simple_stmt() or (yield
+        self._nested_stmt())``, which keeps the generators of ``_run``
+        to the statements that actually nest.
+        """
+        ttype = self._types[self._pos]
+        if ttype in _NESTED_STMT_START:
+            return None
+        if ttype == T.BREAK:
+            self._advance()
+            self._expect(T.SEMI)
+            return BreakStmt()
+        if ttype == T.CONTINUE:
+            self._advance()
+            self._expect(T.SEMI)
+            return ContinueStmt()
+        if ttype == T.RETURN:
+            self._advance()
+            expr = self._expr() if self._types[self._pos] in _EXPR_START else None
+            self._expect(T.SEMI)
+            return ReturnStmt(expr)
+        if ttype in _VAR_TYPES or (ttype == T.ID and self._starts_var_decl()):
+            return self._var_decl()
+        if ttype in _EXPR_START:
+            return self._expr_stmt()
+        raise _Failure(self._pos, _READ_ALL)
+
+    def _if_stmt(self) -> Generator:
+        self._advance()
+        condition = self._paren_expr()
+        then_stmt = self._simple_stmt() or (yield self._nested_stmt())
+        else_stmt = None
+        if self._types[self._pos] == T.ELSE:
+            self._advance()
+            else_stmt = self._simple_stmt() or (yield self._nested_stmt())
+        return IfStmt(condition, then_stmt, else_stmt)
+
+    def _while_stmt(self) -> Generator:
+        self._advance()
+        condition = self._paren_expr()
+        return WhileStmt(condition, self._simple_stmt() or (yield self._nested_stmt()))
+
+    def _starts_var_decl(self) -> bool:
+        """At an ID: ``ID ID`` starts a declaration, anything else an expression."""
+        following = self._la(1)
+        if following == T.ID:
+            return True
+        if following not in _AFTER_ID_IN_EXPR:
+            raise _Failure(self._pos + 1, _READ_ALL)
+        return False
+
+    def _expr_stmt(self) -> ExprStmt:
+        expr = self._expr()
+        self._expect(T.SEMI)
+        return ExprStmt(expr)
+
+    def _block_or_struct_literal_stmt(self) -> Generator:
+        """Decide between a nested block and a statement like ``{1, 2};``.
+
+        Both alternatives start with ``{``. ANTLR tries them in parallel
+        and keeps the one that survives longer. Once the block has closed
+        it wins every tie: when both stay viable (as in ``{} + x;``) and
+        when both break on the same later token. The same outcome is
+        reproduced here with speculative parses.
+        """
+        # ``_try`` of the block, which nests and so is yielded to ``_run``.
+        start = self._pos
+        try:
+            block, block_end, block_failure = (yield self._block()), self._pos, None
+        except _Failure as failure:
+            block, block_end, block_failure = None, failure.index, failure
+        self._pos = start
+        stmt, stmt_end, stmt_failure = self._try(self._expr_stmt)
+        if block_failure is None:
+            # After the block, the same tokens have to read as further
+            # statements for the block to stay viable as long as the expression.
+            block_death = yield self._statements_death(block_end, stmt_end)
+        else:
+            block_death = block_failure.index
+
+        if stmt_failure is None:
+            chosen_block = block_death >= stmt_end
+        elif block_death == stmt_failure.index and block_failure is not None:
+            raise _Failure(block_death, _READ_ALL)
+        else:
+            chosen_block = block_death >= stmt_failure.index
+
+        if chosen_block:
+            if block_failure is not None:
+                raise block_failure
+            self._pos = block_end
+            return block
+        if stmt_failure is not None:
+            raise stmt_failure
+        self._pos = stmt_end
+        return stmt
+
+    def _statements_death(self, start: int, limit: int) -> Generator:
+        """Index where ``stmt*`` read from ``start`` breaks, if before ``limit``."""
+        saved = self._pos
+        self._pos = start
+        try:
+            while self._pos < limit:
+                if self._types[self._pos] not in _STMT_START:
+                    return self._pos
+                self._simple_stmt() or (yield self._nested_stmt())
+            return float("inf")
+        except _Failure as failure:
+            return failure.index
+        finally:
+            self._pos = saved
+
+    def _var_decl(self) -> VarDecl:
+        if self._types[self._pos] == T.AUTO:
+            self._advance()
+            var_type = None
+        else:
+            var_type = self._explicit_type()
+        name = self._expect(T.ID)
+        init_value = None
+        if self._types[self._pos] == T.ASSIGN:
+            self._advance()
+            init_value = self._expr()
+        self._expect(T.SEMI)
+        return VarDecl(var_type, name, init_value)
+
+    def _for_stmt(self) -> Generator:
+        self._advance()
+        self._expect(T.LP)
+        ttype = self._types[self._pos]
+        if ttype in _VAR_TYPES or (ttype == T.ID and self._starts_var_decl()):
+            init = self._var_decl()
+        elif ttype in _EXPR_START:
+            init = self._expr_stmt()
+        elif ttype == T.SEMI:
+            self._advance()
+            init = None
+        else:
+            raise _Failure(self._pos, _READ_ALL)
+        condition = self._expr() if self._types[self._pos] in _EXPR_START else None
+        self._expect(T.SEMI)
+        update = self._expr() if self._types[self._pos] in _EXPR_START else None
+        self._expect(T.RP)
+        return ForStmt(init, condition, update, self._simple_stmt() or (yield self._nested_stmt()))
+
+    def _switch_stmt(self) -> Generator:
+        self._advance()
+        expr = self._paren_expr()
+        self._expect(T.LB)
+        cases = []
+        default_case = None
+        while self._types[self._pos] in (T.CASE, T.DEFAULT):
+            # Stacked labels share one statement list, owned by the last label.
+            labels = []
+            while self._types[self._pos] in (T.CASE, T.DEFAULT):
+                if self._advance() == "case":
+                    labels.append(CaseStmt(self._expr(), []))
+                else:
+                    labels.append(DefaultStmt([]))
+                self._expect(T.COLON)
+            statements = labels[-1].statements
+            while self._types[self._pos] in _STMT_START:
+                statements.append(self._simple_stmt() or (yield self._nested_stmt()))
+            for label in labels:
+                if isinstance(label, DefaultStmt):
+                    default_case = label
+                else:
+                    cases.append(label)
+        self._expect(T.RB, _READ_NONE if cases or default_case else _READ_NEXT)
+        return SwitchStmt(expr, cases, default_case)
+
+    # ------------------------------------------------------------------
+    # Expressions
+    # ------------------------------------------------------------------
+
+    def _paren_expr(self) -> Expr:
+        self._expect(T.LP)
+        expr = self._expr()
+        self._expect(T.RP)
+        return expr
+
+    def _expr(self, min_prec: int = 0) -> Expr:
+        """Pratt loop: fold every infix/postfix operator binding at least ``min_prec``.
+
+        Operands that are themselves expressions (right operands, prefix
+        operands, parentheses and argument lists) do not recurse: what is
+        left to do with each one is pushed on ``pending`` with the index
+        where the operand starts (-1 unless it is a full expression) and
+        resumed once the operand is complete, so nesting depth costs no
+        Python frames.
+        """
+        types, failed = self._types, self._failed
+        start = self._pos if min_prec == 0 else -1
+        pending = []
+        try:
+            while True:
+                # Descend to the first operand, noting every opener on the way.
+                if min_prec == 0 and self._pos in failed:
+                    raise failed[self._pos]
+                ttype = types[self._pos]
+                if ttype == T.ID:
+                    if self._la(1) == T.LP:
+                        name = self._advance()
+                        self._advance()
+                        if types[self._pos] in _EXPR_START:
+                            pending.append((_CALL, [], name, min_prec, self._pos))
+                            min_prec = 0
+                            continue
+                        self._expect(T.RP)
+                        left = FuncCall(name, [])
+                    else:
+                        left = Identifier(self._advance())
+                elif ttype == T.INTLIT:
+                    left = IntLiteral(int(self._advance()))
+                elif ttype == T.FLOATLIT:
+                    left = FloatLiteral(float(self._advance()))
+                elif ttype == T.STRLIT:
+                    left = StringLiteral(self._advance())
+                elif ttype == T.LB:
+                    self._advance()
+                    if types[self._pos] in _EXPR_START:
+                        pending.append((_STRUCT, [], None, min_prec, self._pos))
+                        min_prec = 0
+                        continue
+                    self._expect(T.RB)
+                    left = StructLiteral([])
+                elif ttype == T.LP:
+                    self._advance()
+                    pending.append((_PAREN, None, None, min_prec, self._pos))
+                    min_prec = 0
+                    continue
+                elif ttype in _PREFIX_OPS:
+                    pending.append((_PREFIX, self._advance(), None, min_prec, -1))
+                    min_prec = _PREFIX_OPERAND_PREC
+                    continue
+                elif ttype in _UNARY_OPS:
+                    pending.append((_PREFIX, self._advance(), None, min_prec, -1))
+                    min_prec = _UNARY_OPERAND_PREC
+                    continue
+                else:
+                    raise _Failure(self._pos, _READ_ALL)
+
+                # Fold operators onto ``left``; an operator that needs a right
+                # operand goes back to the top of the outer loop.
+                while True:
+                    ttype = types[self._pos]
+                    prec = _OPERATOR_PREC.get(ttype, -1)
+                    if prec >= min_prec:
+                        if ttype in _BINARY_PREC:
+                            if ttype == T.ASSIGN:
+                                # Right associative: the right operand may hold another '='.
+                                self._advance()
+                                pending.append((_ASSIGN, left, None, min_prec, -1))
+                                min_prec = prec
+                            else:
+                                pending.append((_BINARY, left, self._advance(), min_prec, -1))
+                                min_prec = prec + 1
+                            break
+                        if ttype == T.DOT:
+                            self._advance()
+                            left = MemberAccess(left, self._expect(T.ID))
+                        else:
+                            left = PostfixOp(self._advance(), left)
+                    elif not pending:
+                        return left
+                    else:
+                        # ``left`` is complete: resume whatever was waiting for it.
+                        kind, first, second, min_prec, _ = pending.pop()
+                        if kind == _BINARY:
+                            left = BinaryOp(first, second, left)
+                        elif kind == _ASSIGN:
+                            left = AssignExpr(first, left)
+                        elif kind == _PREFIX:
+                            left = PrefixOp(first, left)
+                        elif kind == _PAREN:
+                            self._expect(T.RP)
+                        else:
+                            # One more argument of a call (``second``) or value of
+                            # a struct literal.
+                            first.append(left)
+                            if types[self._pos] == T.COMMA:
+                                self._advance()
+                                pending.append((kind, first, second, min_prec, self._pos))
+                                min_prec = 0
+                                break
+                            if kind == _CALL:
+                                self._expect(T.RP)
+                                left = FuncCall(second, first)
+                            else:
+                                self._expect(T.RB)
+                                left = StructLiteral(first)
+        except _Failure as failure:
+            # Every full expression still open here fails the same way
+            # whenever it is parsed again (see ``_failed``).
+            if start >= 0:
+                failed[start] = failure
+            for *_, operand_start in pending:
+                if operand_start >= 0:
+                    failed[operand_start] = failure
+            raise
@@ -0,0 +1,103 @@
+"""
+Compact character stream for TyC sources.
+ANTLR's ``InputStream`` stores the source as a list of Python ints, about
+8 bytes of pointer plus a shared or 28-byte int object per character, on
+top of the source string itself. CompactInputStream keeps only one flat
+buffer: ``bytes`` (or a memory-mapped file) for ASCII/Latin-1 text and an
+``array`` of 16- or 32-bit code points otherwise. It is a drop-in
+replacement for ``InputStream`` in ``TyCLexer``.
+"""
+
+import mmap
+import re
+from array import array
+
+from antlr4.InputStream import InputStream
+
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
+class CompactInputStream(InputStream):
+    """``InputStream`` over a flat ``bytes``/``array``/``mmap`` buffer.
+
+    ``LA``, ``index``, ``size``, ``seek`` and ``getText`` behave exactly
+    like ``InputStream``; only the storage differs. Indexing any of the
+    buffers yields the code point as an ``int``, which is what the lexer
+    simulator consumes, and token text is decoded on demand.
+    """
+
+    __slots__ = ("_decode", "_mmap")
+
+    def __init__(self, data: str = ""):
+        self.name = "<compact>"
+        self._index = 0
+        self._mmap = None
+        top = 0 if data.isascii() else max(map(ord, data))
+        if top < 0x100:
+            # ASCII fast path (Latin-1 fits the same one-byte buffer).
+            self.data = data.encode("latin-1")
+            self._decode = _decode_bytes
+        else:
+            self.data = array("H" if top < 0x10000 else "I", map(ord, data))
+            self._decode = _decode_code_points
+        self._size = len(self.data)
+
+    @classmethod
+    def from_file(cls, path: str, encoding: str = "utf-8") -> "CompactInputStream":
+        """Stream over the file at ``path``, memory-mapped when it is ASCII.
+
+        An ASCII file is read straight from the page cache without copying;
+        any other content is decoded with ``encoding`` into a compact buffer.
+        Line endings are kept as they are, like ANTLR's ``FileStream``.
+        """
+        with open(path, "rb") as file:
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                return cls(file.read().decode(encoding))
+        if _NON_ASCII.search(mapped) is not None:
+            text = mapped[:].decode(encoding)
+            mapped.close()
+            return cls(text)
+        stream = cls.__new__(cls)
+        stream.name = path
+        stream._index = 0
+        stream._mmap = stream.data = mapped
+        stream._decode = _decode_bytes
+        stream._size = len(mapped)
+        return stream
+
+    @property
+    def strdata(self) -> str:
+        """The whole source as a string (decoded on every access)."""
+        return self._decode(self.data, 0, self._size)
+
+    def getText(self, start: int, stop: int) -> str:
+        if stop >= self._size:
+            stop = self._size - 1
+        if start >= self._size:
+            return ""
+        return self._decode(self.data, start, stop + 1)
+
+    def close(self):
+        """Release the memory map of a stream built by ``from_file``."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self.data = b""
+            self._size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _decode_bytes(data, start: int, stop: int) -> str:
+    return data[start:stop].decode("latin-1")
+
+
+def _decode_code_points(data, start: int, stop: int) -> str:
+    return "".join(map(chr, data[start:stop]))
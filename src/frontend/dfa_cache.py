@@ -0,0 +1,459 @@
+"""
+Persistent DFA cache for the generated TyC lexer and parser.
+ANTLR builds its prediction DFAs lazily, so every new process starts with
+empty ``decisionsToDFA`` tables and pays the full ATN simulation cost until
+they warm up. This module saves the warmed DFA states of TyCLexer and
+TyCParser to a versioned cache file keyed by the grammar hash and loads
+them back at startup.
+
+The runtime objects cannot simply be pickled: their cached hash codes are
+derived from per-process string hashes, and the DFA graph references the
+shared ATN. States are therefore flattened into plain tuples (ATN states by
+number, prediction contexts and semantic contexts through index tables) and
+rebuilt through the runtime constructors on load.
+"""
+
+import atexit
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from importlib import metadata
+from typing import Optional
+
+from antlr4.PredictionContext import (
+    PredictionContext,
+    SingletonPredictionContext,
+    ArrayPredictionContext,
+)
+from antlr4.atn.ATNConfig import ATNConfig, LexerATNConfig
+from antlr4.atn.ATNConfigSet import ATNConfigSet, OrderedATNConfigSet
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.atn.LexerAction import LexerIndexedCustomAction
+from antlr4.atn.LexerActionExecutor import LexerActionExecutor
+from antlr4.atn.SemanticContext import SemanticContext, Predicate, PrecedencePredicate, AND, OR
+from antlr4.dfa.DFA import DFA
+from antlr4.dfa.DFAState import DFAState, PredPrediction
+
+from src.frontend import _build_dir
+from build.TyCLexer import TyCLexer
+from build.TyCParser import TyCParser
+
+CACHE_VERSION = 1
+
+_NO_EDGE = -1
+_ERROR_EDGE = -2
+
+
+def grammar_key() -> str:
+    """Hash of both generated ATNs, the runtime version and the cache format."""
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_VERSION};{_runtime_version()};".encode())
+    for recognizer in (TyCLexer, TyCParser):
+        digest.update(recognizer.__name__.encode())
+        digest.update(repr(sys.modules[recognizer.__module__].serializedATN()).encode())
+    return digest.hexdigest()
+
+
+def _runtime_version() -> str:
+    try:
+        return metadata.version("antlr4-python3-runtime")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def default_cache_path() -> Optional[str]:
+    """Cache location, overridable with ``TYC_DFA_CACHE`` (``off`` disables it)."""
+    path = os.environ.get("TYC_DFA_CACHE")
+    if path is not None:
+        return None if path.strip().lower() in ("", "0", "off", "no") else path
+    return os.path.join(_build_dir, ".dfa_cache", f"TyC-{grammar_key()[:16]}.dfa")
+
+
+# ============================================================================
+# Encoding
+# ============================================================================
+
+
+class _Encoder:
+    """Flattens the DFAs of one recognizer into picklable tuples."""
+
+    def __init__(self, atn, error_state):
+        self.atn = atn
+        self.error_state = error_state
+        self.contexts = []
+        self.semantics = []
+        self.executors = []
+        self._context_ids = {}
+        self._semantic_ids = {}
+        self._executor_ids = {}
+
+    def context(self, ctx) -> Optional[int]:
+        if ctx is None:
+            return None
+        known = self._context_ids.get(id(ctx))
+        if known is not None:
+            return known
+        # Prediction contexts can be as deep as the parse that produced
+        # them, so parents are encoded with an explicit stack.
+        stack = [ctx]
+        while stack:
+            top = stack[-1]
+            if id(top) in self._context_ids:
+                stack.pop()
+                continue
+            if top is PredictionContext.EMPTY:
+                self._context_ids[id(top)] = self._append_context(("$",))
+                stack.pop()
+                continue
+            parents = [top.parentCtx] if isinstance(top, SingletonPredictionContext) else top.parents
+            pending = [p for p in parents if p is not None and id(p) not in self._context_ids]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if isinstance(top, SingletonPredictionContext):
+                entry = ("S", self._context_ids.get(id(top.parentCtx)), top.returnState)
+            else:
+                entry = (
+                    "A",
+                    tuple(self._context_ids.get(id(p)) for p in top.parents),
+                    tuple(top.returnStates),
+                )
+            self._context_ids[id(top)] = self._append_context(entry)
+        return self._context_ids[id(ctx)]
+
+    def _append_context(self, entry) -> int:
+        self.contexts.append(entry)
+        return len(self.contexts) - 1
+
+    def semantic(self, sem) -> int:
+        known = self._semantic_ids.get(id(sem))
+        if known is not None:
+            return known
+        if sem is SemanticContext.NONE:
+            entry = ("-",)
+        elif isinstance(sem, Predicate):
+            entry = ("P", sem.ruleIndex, sem.predIndex, sem.isCtxDependent)
+        elif isinstance(sem, PrecedencePredicate):
+            entry = ("R", sem.precedence)
+        elif isinstance(sem, AND):
+            entry = ("&", tuple(self.semantic(o) for o in sem.opnds))
+        elif isinstance(sem, OR):
+            entry = ("|", tuple(self.semantic(o) for o in sem.opnds))
+        else:
+            raise TypeError(f"Unsupported semantic context {sem!r}")
+        self.semantics.append(entry)
+        self._semantic_ids[id(sem)] = len(self.semantics) - 1
+        return len(self.semantics) - 1
+
+    def executor(self, executor) -> Optional[int]:
+        if executor is None:
+            return None
+        known = self._executor_ids.get(id(executor))
+        if known is not None:
+            return known
+        self.executors.append(tuple(self._action(a) for a in executor.lexerActions))
+        self._executor_ids[id(executor)] = len(self.executors) - 1
+        return len(self.executors) - 1
+
+    def _action(self, action):
+        if isinstance(action, LexerIndexedCustomAction):
+            return ("I", action.offset, self.atn.lexerActions.index(action.action))
+        return ("L", self.atn.lexerActions.index(action))
+
+    def config(self, cfg):
+        entry = (
+            cfg.state.stateNumber,
+            cfg.alt,
+            self.context(cfg.context),
+            self.semantic(cfg.semanticContext),
+            cfg.reachesIntoOuterContext,
+            cfg.precedenceFilterSuppressed,
+        )
+        if isinstance(cfg, LexerATNConfig):
+            entry += (self.executor(cfg.lexerActionExecutor), cfg.passedThroughNonGreedyDecision)
+        return entry
+
+    def config_set(self, configs):
+        return (
+            isinstance(configs, OrderedATNConfigSet),
+            configs.fullCtx,
+            configs.readonly,
+            configs.uniqueAlt,
+            None if configs.conflictingAlts is None else tuple(sorted(configs.conflictingAlts)),
+            configs.hasSemanticContext,
+            configs.dipsIntoOuterContext,
+            tuple(self.config(c) for c in configs.configs),
+        )
+
+    def edges(self, edges, numbers):
+        if edges is None:
+            return None
+        encoded = []
+        for target in edges:
+            if target is None:
+                encoded.append(_NO_EDGE)
+            elif target is self.error_state:
+                encoded.append(_ERROR_EDGE)
+            else:
+                encoded.append(numbers.get(id(target), _NO_EDGE))
+        return tuple(encoded)
+
+    def dfa(self, dfa):
+        states = list(dfa._states.values())
+        numbers = {id(s): s.stateNumber for s in states}
+        encoded_states = []
+        for s in states:
+            predicates = None
+            if s.predicates is not None:
+                predicates = tuple((self.semantic(p.pred), p.alt) for p in s.predicates)
+            encoded_states.append((
+                s.stateNumber,
+                self.config_set(s.configs),
+                s.isAcceptState,
+                s.prediction,
+                self.executor(s.lexerActionExecutor),
+                s.requiresFullContext,
+                predicates,
+                self.edges(s.edges, numbers),
+            ))
+        if dfa.precedenceDfa:
+            s0 = ("P", self.edges(dfa.s0.edges, numbers))
+        else:
+            s0 = ("S", _NO_EDGE if dfa.s0 is None else numbers.get(id(dfa.s0), _NO_EDGE))
+        return (dfa.decision, s0, tuple(encoded_states))
+
+
+def _encode_recognizer(recognizer, error_state):
+    encoder = _Encoder(recognizer.atn, error_state)
+    dfas = tuple(encoder.dfa(d) for d in recognizer.decisionsToDFA if len(d._states))
+    return {
+        "contexts": encoder.contexts,
+        "semantics": encoder.semantics,
+        "executors": encoder.executors,
+        "dfas": dfas,
+    }
+
+
+# ============================================================================
+# Decoding
+# ============================================================================
+
+
+class _Decoder:
+    """Rebuilds runtime DFA objects for one recognizer from encoded tuples."""
+
+    def __init__(self, atn, error_state, payload):
+        self.atn = atn
+        self.error_state = error_state
+        self.contexts = []
+        for entry in payload["contexts"]:
+            if entry[0] == "$":
+                ctx = PredictionContext.EMPTY
+            elif entry[0] == "S":
+                parent = None if entry[1] is None else self.contexts[entry[1]]
+                ctx = SingletonPredictionContext(parent, entry[2])
+            else:
+                parents = [None if i is None else self.contexts[i] for i in entry[1]]
+                ctx = ArrayPredictionContext(parents, list(entry[2]))
+            self.contexts.append(ctx)
+        self.semantics = []
+        for entry in payload["semantics"]:
+            self.semantics.append(self._semantic(entry))
+        self.executors = [
+            LexerActionExecutor([self._action(a) for a in actions])
+            for actions in payload["executors"]
+        ]
+
+    def _semantic(self, entry):
+        kind = entry[0]
+        if kind == "-":
+            return SemanticContext.NONE
+        if kind == "P":
+            return Predicate(entry[1], entry[2], entry[3])
+        if kind == "R":
+            return PrecedencePredicate(entry[1])
+        # AND/OR constructors simplify their operands; restore them verbatim.
+        cls = AND if kind == "&" else OR
+        sem = cls.__new__(cls)
+        sem.opnds = [self.semantics[i] for i in entry[1]]
+        return sem
+
+    def _action(self, code):
+        if code[0] == "I":
+            return LexerIndexedCustomAction(code[1], self.atn.lexerActions[code[2]])
+        return self.atn.lexerActions[code[1]]
+
+    def config(self, entry):
+        lexer = len(entry) > 6
+        cls = LexerATNConfig if lexer else ATNConfig
+        cfg = cls.__new__(cls)
+        cfg.state = self.atn.states[entry[0]]
+        cfg.alt = entry[1]
+        cfg.context = None if entry[2] is None else self.contexts[entry[2]]
+        cfg.semanticContext = self.semantics[entry[3]]
+        cfg.reachesIntoOuterContext = entry[4]
+        cfg.precedenceFilterSuppressed = entry[5]
+        if lexer:
+            cfg.lexerActionExecutor = None if entry[6] is None else self.executors[entry[6]]
+            cfg.passedThroughNonGreedyDecision = entry[7]
+        return cfg
+
+    def config_set(self, entry):
+        ordered, full_ctx, readonly, unique_alt, conflicting, has_sem, dips, configs = entry
+        result = OrderedATNConfigSet() if ordered else ATNConfigSet(full_ctx)
+        result.fullCtx = full_ctx
+        for cfg in configs:
+            cfg = self.config(cfg)
+            if readonly:
+                result.configs.append(cfg)
+            else:
+                result.getOrAdd(cfg)
+                result.configs.append(cfg)
+        result.uniqueAlt = unique_alt
+        result.conflictingAlts = None if conflicting is None else set(conflicting)
+        result.hasSemanticContext = has_sem
+        result.dipsIntoOuterContext = dips
+        if readonly:
+            result.setReadonly(True)
+        return result
+
+    def load_into(self, dfa, entry):
+        _, s0, encoded_states = entry
+        by_number = {}
+        pending_edges = []
+        for number, configs, accept, prediction, executor, full_ctx, predicates, edges in encoded_states:
+            state = DFAState(number, self.config_set(configs))
+            state.isAcceptState = accept
+            state.prediction = prediction
+            state.lexerActionExecutor = None if executor is None else self.executors[executor]
+            state.requiresFullContext = full_ctx
+            if predicates is not None:
+                state.predicates = [PredPrediction(self.semantics[p], alt) for p, alt in predicates]
+            by_number[number] = state
+            pending_edges.append((state, edges))
+        for state, edges in pending_edges:
+            state.edges = self._edges(edges, by_number)
+
+        dfa._states = {state: state for state in by_number.values()}
+        if s0[0] == "P":
+            dfa.s0.edges = self._edges(s0[1], by_number)
+        else:
+            dfa.s0 = by_number.get(s0[1])
+
+    def _edges(self, edges, by_number):
+        if edges is None:
+            return None
+        return [
+            self.error_state if e == _ERROR_EDGE else by_number.get(e)
+            for e in edges
+        ]
+
+
+def _decode_recognizer(recognizer, error_state, payload) -> int:
+    decoder = _Decoder(recognizer.atn, error_state, payload)
+    loaded = 0
+    for entry in payload["dfas"]:
+        dfa = recognizer.decisionsToDFA[entry[0]]
+        if len(dfa._states):
+            # Already warmed in this process; keep the live states.
+            continue
+        decoder.load_into(dfa, entry)
+        loaded += len(dfa._states)
+    return loaded
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+# Each simulator class has its own sentinel ERROR state for dead edges.
+_RECOGNIZERS = {
+    "lexer": (TyCLexer, LexerATNSimulator.ERROR),
+    "parser": (TyCParser, ParserATNSimulator.ERROR),
+}
+_loaded_sizes = {}
+
+
+def dfa_state_count() -> int:
+    """Total number of DFA states currently held by TyCLexer and TyCParser."""
+    return sum(len(d._states) for r, _ in _RECOGNIZERS.values() for d in r.decisionsToDFA)
+
+
+def load_dfa_cache(path: Optional[str] = None) -> bool:
+    """Load cached DFA states into the empty DFAs of TyCLexer and TyCParser.
+
+    Returns False when the cache is missing, disabled, unreadable or was
+    written for a different grammar; the DFAs then simply warm up as usual.
+    """
+    path = path or default_cache_path()
+    if path is None or not os.path.exists(path):
+        return False
+    # DFAs still empty here are the ones decoding may fill.
+    empty = [
+        (recognizer, [i for i, d in enumerate(recognizer.decisionsToDFA) if not len(d._states)])
+        for recognizer, _ in _RECOGNIZERS.values()
+    ]
+    try:
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+        if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION \
+                or payload.get("key") != grammar_key():
+            return False
+        for name, (recognizer, error_state) in _RECOGNIZERS.items():
+            _decode_recognizer(recognizer, error_state, payload[name])
+    except Exception:
+        # A damaged file can fail in pickle or halfway through decoding;
+        # put back fresh DFAs rather than leave some of them half loaded.
+        for recognizer, indices in empty:
+            dfas = recognizer.decisionsToDFA
+            for i in indices:
+                dfas[i] = DFA(dfas[i].atnStartState, i)
+        return False
+    _loaded_sizes[path] = dfa_state_count()
+    return True
+
+
+def save_dfa_cache(path: Optional[str] = None) -> bool:
+    """Write the current DFA states to the cache file (atomically).
+
+    Nothing is written when no new state was added since the cache was
+    loaded, so processes that only read a warm cache never touch the file.
+    """
+    path = path or default_cache_path()
+    if path is None or dfa_state_count() <= _loaded_sizes.get(path, 0):
+        return False
+    payload = {"version": CACHE_VERSION, "key": grammar_key()}
+    for name, (recognizer, error_state) in _RECOGNIZERS.items():
+        payload[name] = _encode_recognizer(recognizer, error_state)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    _loaded_sizes[path] = dfa_state_count()
+    return True
+
+
+_installed = set()
+
+
+def install_dfa_cache(path: Optional[str] = None) -> bool:
+    """Load the cache now and save the warmed DFAs when the process exits."""
+    path = path or default_cache_path()
+    if path is None:
+        return False
+    loaded = load_dfa_cache(path)
+    if path not in _installed:
+        _installed.add(path)
+        atexit.register(save_dfa_cache, path)
+    return loaded
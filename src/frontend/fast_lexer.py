@@ -0,0 +1,181 @@
+"""
+Regex-driven scanner for TyC.
+FastLexer recognises exactly the token set of ``src/grammar/TyC.g4`` with a
+single precompiled master regular expression instead of the ANTLR lexer
+simulator, which steps through the ATN one code point at a time. It is a
+drop-in token source: it emits ANTLR ``CommonToken`` objects with the same
+types, texts, positions and lexer errors as the generated TyCLexer, so
+``CommonTokenStream``/``TyCParser`` can consume it unchanged.
+"""
+
+import re
+
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.InputStream import InputStream
+from antlr4.Token import CommonToken, Token
+
+from build.TyCLexer import TyCLexer
+from lexererr import ErrorToken, UncloseString, IllegalEscape
+
+# Keywords, operators and separators, taken from the generated lexer so the
+# token types can never drift from the grammar.
+LITERAL_TYPES = {
+    name[1:-1]: ttype
+    for ttype, name in enumerate(TyCLexer.literalNames)
+    if name.startswith("'")
+}
+
+_STR_CHARS = r'(?:\\[bfrnt"\\]|[^"\\\r\n])*'
+
+# Alternatives are ordered so that Python's first-match alternation picks
+# the same lexeme as ANTLR's longest-match rule (ties go to the earlier rule).
+_MASTER = re.compile(
+    "|".join(
+        f"(?P<{name}>{pattern})"
+        for name, pattern in (
+            ("WS", r"[ \t\f\r\n]+"),
+            ("BLOCK_COMMENT", r"/\*.*?\*/"),
+            ("LINE_COMMENT", r"//[^\r\n]*"),
+            ("FLOATLIT", r"[0-9]+\.[0-9]*(?:[eE][+-]?[0-9]+)?"
+                         r"|\.[0-9]+(?:[eE][+-]?[0-9]+)?"
+                         r"|[0-9]+[eE][+-]?[0-9]+"),
+            ("INTLIT", r"[0-9]+"),
+            ("STRLIT", rf'"{_STR_CHARS}"'),
+            ("ILLEGAL_ESCAPE", rf'"{_STR_CHARS}\\[^bfrnt"\\\r\n]'),
+            ("UNCLOSE_STRING", rf'"{_STR_CHARS}\\?'),
+            ("ID", r"[a-zA-Z_][a-zA-Z0-9_]*"),
+            ("OP", "|".join(
+                re.escape(op) for op in sorted(LITERAL_TYPES, key=len, reverse=True)
+                if not op[0].isalpha()
+            )),
+            ("ERROR_CHAR", r"."),
+        )
+    ),
+    re.DOTALL,
+)
+
+_SKIPPED = frozenset(("WS", "BLOCK_COMMENT", "LINE_COMMENT"))
+_ERRORS = frozenset(("ILLEGAL_ESCAPE", "UNCLOSE_STRING", "ERROR_CHAR"))
+_KIND_TYPES = {kind: getattr(TyCLexer, kind) for kind in ("FLOATLIT", "INTLIT", "STRLIT")}
+
+_new_token = CommonToken.__new__
+
+
+class FastLexer:
+    """Token source equivalent to TyCLexer, backed by one master regex.
+
+    Tokens are produced lazily by ``nextToken`` just like the ANTLR lexer,
+    so lexical errors surface at the same point of a parse. After an error
+    the scanner has already moved past the offending lexeme, so callers may
+    keep calling ``nextToken`` to continue; as in TyCLexer, the lexeme's
+    position is left in ``_tokenStartCharIndex``/``Line``/``Column``.
+    """
+
+    def __init__(self, input=""):
+        self._factory = CommonTokenFactory.DEFAULT
+        self._source = (self, None)
+        self.inputStream = input
+
+    @property
+    def inputStream(self):
+        return self._text
+
+    @inputStream.setter
+    def inputStream(self, input):
+        """Reset the scanner on a new ``str`` (or ANTLR ``InputStream``)."""
+        self._text = input.strdata if isinstance(input, InputStream) else input
+        self._pos = 0
+        self._size = len(self._text)
+        self.line = 1
+        self.column = 0
+        self._tokenStartCharIndex = self._tokenStartLine = self._tokenStartColumn = -1
+
+    def restart(self, pos: int, line: int, column: int):
+        """Carry on scanning the current input from offset ``pos``.
+
+        ``pos`` must be where a lexeme starts (or the end of the input),
+        with ``line``/``column`` its position; the scanner has no other state.
+        """
+        self._pos = pos
+        self.line = line
+        self.column = column
+
+    def getSourceName(self):
+        return "<fast>"
+
+    def nextToken(self):
+        ttype, start, stop, line, column = self.scan()
+        if ttype == Token.EOF:
+            text = "<EOF>"
+        elif ttype == TyCLexer.STRLIT:
+            text = self._text[start + 1:stop]
+        else:
+            text = self._text[start:stop + 1]
+        return self._token(ttype, start, stop, text, line, column)
+
+    def scan(self):
+        """Next token as ``(type, start, stop, line, column)``, without a token object.
+
+        Raises the same lexer errors as ``nextToken``; the token text is
+        ``source[start:stop + 1]`` (without the quotes for STRLIT).
+        """
+        text = self._text
+        while True:
+            start = self._pos
+            if start >= self._size:
+                return Token.EOF, start, start - 1, self.line, self.column
+
+            m = _MASTER.match(text, start)
+            kind = m.lastgroup
+            line, column = self.line, self.column
+            end = self._pos = m.end()
+            if kind in _SKIPPED:
+                lexeme = m.group()
+                newlines = lexeme.count("\n")
+                if newlines:
+                    self.line += newlines
+                    self.column = len(lexeme) - lexeme.rfind("\n") - 1
+                else:
+                    self.column += end - start
+                continue
+
+            # Only skipped lexemes can span lines.
+            self.column += end - start
+            if kind == "ID":
+                return LITERAL_TYPES.get(m.group(), TyCLexer.ID), start, end - 1, line, column
+            if kind == "OP":
+                return LITERAL_TYPES[m.group()], start, end - 1, line, column
+            if kind in _ERRORS:
+                # Leave the start of the bad lexeme where TyCLexer does.
+                self._tokenStartCharIndex = start
+                self._tokenStartLine, self._tokenStartColumn = line, column
+                if kind == "ILLEGAL_ESCAPE":
+                    raise IllegalEscape(m.group()[1:])
+                if kind == "UNCLOSE_STRING":
+                    raise UncloseString(m.group()[1:])
+                raise ErrorToken(m.group())
+            return _KIND_TYPES[kind], start, end - 1, line, column
+
+    def _token(self, ttype, start, stop, text, line, column):
+        # Fill the slots directly; CommonToken.__init__ would read the
+        # position from the source and then be overwritten anyway.
+        token = _new_token(CommonToken)
+        token.source = self._source
+        token.type = ttype
+        token.channel = Token.DEFAULT_CHANNEL
+        token.start = start
+        token.stop = stop
+        token.tokenIndex = -1
+        token.line = line
+        token.column = column
+        token._text = text
+        return token
+
+    def getAllTokens(self):
+        """All remaining tokens, excluding EOF (same as ``Lexer.getAllTokens``)."""
+        tokens = []
+        token = self.nextToken()
+        while token.type != Token.EOF:
+            tokens.append(token)
+            token = self.nextToken()
+        return tokens
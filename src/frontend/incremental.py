@@ -0,0 +1,325 @@
+"""
+Incremental relexing and reparsing for TyC.
+After a small edit only the tokens around it can change. IncrementalLexer
+keeps the tokens of a source and, for each edit, restarts the FastLexer at
+the last token the edit cannot have touched and stops as soon as a new
+token starts where an old one did past the edit: from there on the old and
+new sources are the same text.
+
+Tokens after the most recent edit store their offsets and lines relative
+to the end of the source (a gap, as in an editor's gap buffer), so the rest
+of the file never has to be shifted and the cost of an edit does not grow
+with the size of the file.
+
+IncrementalParser builds on it at the granularity of the ``program`` rule:
+top-level declarations whose tokens the edit did not touch keep their
+``StructDecl``/``FuncDecl`` nodes, and only the rest is parsed again.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import List, NamedTuple
+
+from antlr4.Token import Token
+
+from build.TyCLexer import TyCLexer
+from lexererr import LexerError
+from src.frontend.ast_parser import ASTParser
+from src.frontend.fast_lexer import FastLexer
+from src.frontend.token_buffer import TokenBuffer
+from src.utils.nodes import Decl, Program
+
+# How far past the end of a lexeme the master regex may read before it
+# settles on it: "1.e+" followed by a non-digit is "1." after trying an
+# exponent. Tokens ending closer than this to an edit may lex differently.
+_LOOKAHEAD = 3
+
+
+class TokenEdit(NamedTuple):
+    """Tokens ``first`` to ``old_end - 1`` were replaced by ``first`` to ``new_end - 1``.
+
+    Every other token is unchanged apart from its position; the tokens
+    after the edit moved from index ``i`` to ``i + new_end - old_end``.
+    """
+
+    first: int
+    old_end: int
+    new_end: int
+
+
+class IncrementalLexer:
+    """Tokens of a source string, kept up to date across edits.
+
+    ``types`` is a plain array of token types; positions are read with
+    ``start``, ``stop``, ``line`` and ``column`` and the text with ``text``.
+    ``buffer`` returns an ordinary TokenBuffer for the parser. Lexer errors
+    are raised as by ``TokenBuffer.tokenize``; the edit is still applied to
+    ``source`` and the next edit that lexes cleanly rebuilds the tokens.
+    """
+
+    def __init__(self, source: str = ""):
+        self.source = source
+        self._lexer = FastLexer("")
+        self._relex_all()
+
+    def _relex_all(self):
+        self._stale = True
+        self._lexer.inputStream = self.source
+        tokens = TokenBuffer.tokenize(self.source, self._lexer)
+        self.types, self.starts, self.stops = tokens.types, tokens.starts, tokens.stops
+        self.lines, self.columns = tokens.lines, tokens.columns
+        # Tokens from ``_gap`` on store ``start - len(source)`` and
+        # ``line - _last_line`` (the line of EOF) instead of absolute values.
+        self._gap = len(self.types)
+        self._last_line = self.lines[-1]
+        self._stale = False
+
+    # ------------------------------------------------------------------
+    # Token access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def start(self, index: int) -> int:
+        start = self.starts[index]
+        return start if index < self._gap else start + len(self.source)
+
+    def stop(self, index: int) -> int:
+        stop = self.stops[index]
+        return stop if index < self._gap else stop + len(self.source)
+
+    def line(self, index: int) -> int:
+        line = self.lines[index]
+        return line if index < self._gap else line + self._last_line
+
+    def column(self, index: int) -> int:
+        return self.columns[index]
+
+    def text(self, index: int) -> str:
+        """Token text, cut from the source (STRLIT without its quotes)."""
+        ttype = self.types[index]
+        if ttype == Token.EOF:
+            return "<EOF>"
+        start = self.start(index)
+        stop = start + self.stops[index] - self.starts[index]
+        if ttype == TyCLexer.STRLIT:
+            return self.source[start + 1:stop]
+        return self.source[start:stop + 1]
+
+    def buffer(self) -> TokenBuffer:
+        """The tokens as a TokenBuffer with absolute positions (copies the arrays)."""
+        self._move_gap(len(self.types))
+        buffer = TokenBuffer(self.source)
+        buffer.types, buffer.starts, buffer.stops = self.types[:], self.starts[:], self.stops[:]
+        buffer.lines, buffer.columns = self.lines[:], self.columns[:]
+        return buffer
+
+    # ------------------------------------------------------------------
+    # Editing
+    # ------------------------------------------------------------------
+
+    def edit(self, offset: int, removed: int, inserted: str) -> TokenEdit:
+        """Replace ``removed`` characters at ``offset`` by ``inserted`` and relex around them."""
+        old = self.source
+        if offset < 0 or removed < 0 or offset + removed > len(old):
+            raise ValueError(f"edit {offset}+{removed} is outside a source of length {len(old)}")
+        source = old[:offset] + inserted + old[offset + removed:]
+        if self._stale:
+            old_end = len(self.types)
+            self.source = source
+            self._relex_all()
+            return TokenEdit(0, old_end, len(self.types))
+
+        first = self._restart_token(offset)
+        lexer = self._lexer
+        lexer.inputStream = source
+        if first >= 0:
+            lexer.restart(self.start(first), self.line(first), self.columns[first])
+        else:
+            # Leading whitespace or comments may be affected: start from the top.
+            first = 0
+        self._move_gap(first)
+
+        # Old tokens past the edit are matched by their offset from the end
+        # of the source, which the edit does not change.
+        types, starts, lines, columns = self.types, self.starts, self.lines, self.columns
+        edit_end, size = offset + len(inserted), len(source)
+        resync = bisect_left(starts, offset + removed - len(old), first)
+        scanned = TokenBuffer(source)
+        try:
+            while True:
+                ttype, start, stop, line, column = lexer.scan()
+                if start >= edit_end:
+                    while resync < len(types) and starts[resync] < start - size:
+                        resync += 1
+                    if resync < len(types) and starts[resync] == start - size:
+                        break
+                scanned.append(ttype, start, stop, line, column)
+                if ttype == Token.EOF:
+                    resync = len(types)
+                    break
+        except LexerError:
+            self.source = source
+            self._stale = True
+            raise
+
+        if resync < len(types):
+            # The rest of the resynchronising line moves sideways.
+            old_line, shift = lines[resync], column - columns[resync]
+            index = resync
+            while shift and index < len(types) and lines[index] == old_line:
+                columns[index] += shift
+                index += 1
+        types[first:resync] = scanned.types
+        starts[first:resync] = scanned.starts
+        self.stops[first:resync] = scanned.stops
+        lines[first:resync] = scanned.lines
+        columns[first:resync] = scanned.columns
+        self.source = source
+        self._last_line += inserted.count("\n") - old.count("\n", offset, offset + removed)
+        self._gap = first + len(scanned)
+        return TokenEdit(first, resync, self._gap)
+
+    def _restart_token(self, offset: int) -> int:
+        """Index of the token to relex from for an edit at ``offset``, -1 for the start."""
+        source = self.source
+        # The last token that ends well before the edit; everything before
+        # it, skipped text included, is lexed the same way after the edit.
+        index = self._search(self.stops, offset - _LOOKAHEAD) - 1
+        # A "/*" with no "*/" after it lexed as DIV MUL, but the edit may
+        # close it and turn everything in between into a comment. Those
+        # inside strings and comments are not tokens and cannot open one.
+        opener = source.find("/*", max(0, source.rfind("*/") - 1), offset)
+        while opener >= 0:
+            token = self._search(self.starts, opener)
+            if self.start(token) == opener:
+                return min(index, token)
+            opener = source.find("/*", opener + 1, offset)
+        return index
+
+    def _search(self, values: array, offset: int) -> int:
+        """First index whose absolute offset in ``values`` is ``>= offset``."""
+        gap = self._gap
+        if gap > 0 and values[gap - 1] >= offset:
+            return bisect_left(values, offset, 0, gap)
+        return bisect_left(values, offset - len(self.source), gap)
+
+    def _move_gap(self, gap: int):
+        """Make the tokens before ``gap`` absolute and the ones from ``gap`` on relative.
+
+        Costs one step per token between the old and the new gap, which is
+        small when successive edits are close together.
+        """
+        size, last_line = len(self.source), self._last_line
+        if gap > self._gap:
+            low, high, size, last_line = self._gap, gap, size, last_line
+        else:
+            low, high, size, last_line = gap, self._gap, -size, -last_line
+        for values, delta in ((self.starts, size), (self.stops, size), (self.lines, last_line)):
+            values[low:high] = array(values.typecode, map(delta.__add__, values[low:high]))
+        self._gap = gap
+
+
+class IncrementalParser:
+    """``Program`` of a source kept up to date across edits.
+
+    ``edit`` relexes with an IncrementalLexer, keeps the declaration nodes
+    whose tokens lie outside the replaced range and parses declarations
+    again only until a new one ends where a kept one starts. The result and
+    any error are those of ``ASTParser.parse`` on the edited source. After
+    a syntax error the declarations on both sides of it are still reused;
+    after a lexer error the whole source is parsed again.
+    """
+
+    def __init__(self, source: str = ""):
+        self._parser = ASTParser()
+        # Token range ``start[i]`` to ``end[i] - 1`` of each declaration in
+        # ``_decls``. From ``_gap`` on the indexes are stored relative to
+        # the token count, like the offsets in IncrementalLexer.
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._decls: List[Decl] = []
+        self._gap = 0
+        # Indexes into the lists where the tokens of a declaration do not
+        # follow on from the one before: edits and syntax errors leave them.
+        self._holes = [0]
+        self.program = None
+        try:
+            self.tokens = IncrementalLexer(source)
+        except LexerError:
+            # Report what a full parse reports (maybe an earlier syntax error).
+            self._parser.parse(source)
+            raise
+        self._reparse()
+
+    def edit(self, offset: int, removed: int, inserted: str) -> Program:
+        """Apply the edit to the source and return the new ``Program``."""
+        self.program = None
+        count = len(self.tokens)
+        try:
+            change = self.tokens.edit(offset, removed, inserted)
+        except LexerError:
+            self._parser.parse(self.tokens.source)
+            raise
+
+        # Put the gap after the declarations that end before the edit and
+        # drop the ones the edit reaches into.
+        starts, ends = self._starts, self._ends
+        gap = self._gap
+        while gap > 0 and ends[gap - 1] > change.first:
+            gap -= 1
+            starts[gap] -= count
+            ends[gap] -= count
+        while gap < len(ends) and ends[gap] + count <= change.first:
+            starts[gap] += count
+            ends[gap] += count
+            gap += 1
+        touched = gap
+        while touched < len(starts) and starts[touched] + count < change.old_end:
+            touched += 1
+        del starts[gap:touched], ends[gap:touched], self._decls[gap:touched]
+        self._holes = sorted({max(gap, hole - (touched - gap)) if hole > gap else hole
+                              for hole in self._holes} | {gap})
+        self._gap = gap
+        return self._reparse()
+
+    def _reparse(self) -> Program:
+        starts, ends, decls = self._starts, self._ends, self._decls
+        gap, count, holes = self._gap, len(self.tokens), self._holes
+        first, last = holes[0], holes[-1]
+        pos = ends[first - 1] if first else 0
+        new_starts, new_ends, new_decls = [], [], []
+        index = first
+        try:
+            while True:
+                while index < len(starts) and starts[index] + (count if index >= gap else 0) < pos:
+                    index += 1
+                if index < len(starts) and starts[index] + (count if index >= gap else 0) == pos:
+                    if index >= last:
+                        break
+                    # A declaration between two holes lines up again.
+                    end, decl = ends[index] + (count if index >= gap else 0), decls[index]
+                    index += 1
+                else:
+                    decl, end = self._parser.parse_decl(self.tokens, pos)
+                    if decl is None:
+                        index = len(starts)
+                        break
+                new_starts.append(pos)
+                new_ends.append(end)
+                new_decls.append(decl)
+                pos = end
+            self._holes = []
+        except Exception:
+            # Holes past the syntax error stay, moved with the declarations.
+            moved = len(new_decls) - (index - first)
+            self._holes = [first + len(new_decls)] + [hole + moved for hole in holes if hole > index]
+            raise
+        finally:
+            starts[first:index] = new_starts
+            ends[first:index] = new_ends
+            decls[first:index] = new_decls
+            self._gap = first + len(new_decls) + max(0, gap - index)
+        self.program = Program(decls[:])
+        return self.program
@@ -0,0 +1,114 @@
+"""
+Parallel parsing of large TyC programs.
+A TyC program is one file holding a flat sequence of ``struct ... ;`` and
+function declarations, and every declaration parses independently of the
+others. ``parse_parallel`` cuts the source into runs of whole declarations
+with a brace-depth scan, lexes and parses the runs in a process pool with
+ASTParser and joins the declarations into one ``Program`` in source order.
+Workers send their declarations back in the ``binary_ast`` encoding, which
+is far smaller and quicker to produce than a pickle of the nodes.
+Whenever a run does not lex or parse on its own (which only happens around
+a lexer or syntax error), the file is parsed serially instead, so the
+result and every error message are exactly those of ``ASTParser.parse``.
+"""
+
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Optional
+
+from lexererr import LexerError
+from src.frontend.ast_parser import ASTParser
+from src.frontend.fast_lexer import FastLexer, _STR_CHARS
+from src.frontend.token_buffer import TokenBuffer
+from src.utils import binary_ast
+from src.utils.error_listener import SyntaxException
+from src.utils.nodes import Program
+
+# The lexemes that can hide a brace, and the braces themselves. Braces only
+# ever lex as LB/RB, so outside strings and comments these are the tokens.
+_BRACES = re.compile(rf'"{_STR_CHARS}"|/\*.*?\*/|//[^\r\n]*|[{{}}]', re.DOTALL)
+# What may sit between the closing brace of a struct and its semicolon.
+_STRUCT_END = re.compile(r"(?:[ \t\f\r\n]+|/\*.*?\*/|//[^\r\n]*)*;", re.DOTALL)
+
+# Runs handed out per worker, so that uneven declarations still balance.
+_RUNS_PER_WORKER = 4
+
+_worker_parser = None
+
+
+def parse_parallel(source: str, workers: Optional[int] = None,
+                   executor: Optional[Executor] = None) -> Program:
+    """AST of ``source``, with the declarations parsed in worker processes.
+
+    ``executor`` is reused if given; otherwise a ``ProcessPoolExecutor``
+    with ``workers`` processes lives for this call. ``workers`` (default:
+    one per CPU) also sets how many runs the source is cut into. Lexer
+    errors and ``SyntaxException`` are raised as by ``ASTParser.parse``.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = _split(source, workers * _RUNS_PER_WORKER)
+    if len(tasks) < 2:
+        return ASTParser().parse(source)
+
+    if executor is None:
+        with ProcessPoolExecutor(workers) as pool:
+            runs = list(pool.map(_parse_run, tasks))
+    else:
+        runs = list(executor.map(_parse_run, tasks))
+    if any(run is None for run in runs):
+        return ASTParser().parse(source)
+    return Program([decl for run in runs for decl in binary_ast.loads(run).decls])
+
+
+def _split(source: str, count: int) -> List[tuple]:
+    """Cut ``source`` into about ``count`` runs of whole top-level declarations.
+
+    A declaration ends with the ``}`` that closes its outermost brace, or
+    the ``;`` after it for a struct. Each run is returned as the
+    ``(text, line, column)`` of its first character.
+    """
+    target = max(1, len(source) // count)
+    tasks = []
+    depth = last = 0
+    line = 1
+    for match in _BRACES.finditer(source):
+        brace = match.group()
+        if brace == "{":
+            depth += 1
+        elif brace == "}":
+            depth -= 1
+            cut = match.end()
+            if depth == 0 and cut - last >= target:
+                struct_end = _STRUCT_END.match(source, cut)
+                if struct_end is not None:
+                    cut = struct_end.end()
+                tasks.append((source[last:cut], line, last - source.rfind("\n", 0, last) - 1))
+                line += source.count("\n", last, cut)
+                last = cut
+    if last < len(source) or not tasks:
+        tasks.append((source[last:], line, last - source.rfind("\n", 0, last) - 1))
+    return tasks
+
+
+def _parse_run(task: tuple) -> Optional[bytes]:
+    """Declarations of one run as an encoded ``Program``, or None if the run
+    does not lex and parse on its own."""
+    global _worker_parser
+    text, line, column = task
+    lexer = FastLexer(text)
+    lexer.restart(0, line, column)
+    if _worker_parser is None:
+        _worker_parser = ASTParser()
+    decls = []
+    try:
+        tokens = TokenBuffer.tokenize(text, lexer)
+        pos, eof = 0, len(tokens) - 1
+        while pos < eof:
+            decl, pos = _worker_parser.parse_decl(tokens, pos)
+            if decl is None:
+                return None
+            decls.append(decl)
+    except (LexerError, SyntaxException):
+        return None
+    return binary_ast.dumps(Program(decls))
@@ -0,0 +1,37 @@
+"""
+Parsing entry points for TyC programs.
+This module drives TyCParser with two-stage prediction: a fast SLL pass
+that bails out on the first error, followed by a full LL pass only when
+the SLL pass fails.
+"""
+
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+
+from src.utils.error_listener import NewErrorListener
+
+
+def parse_program(parser):
+    """Parse with SLL prediction first and fall back to full LL on failure.
+
+    SLL prediction is enough for almost every valid program and is much
+    cheaper than full LL in the Python runtime. If the SLL pass reports an
+    error, the input is either invalid or needs full context, so the parse
+    is repeated in LL mode with ``NewErrorListener`` to get the exact
+    syntax error (or the correct tree).
+    """
+    interp = parser._interp
+    parser.removeErrorListeners()
+    parser._errHandler = BailErrorStrategy()
+    interp.predictionMode = PredictionMode.SLL
+    try:
+        return parser.program()
+    except ParseCancellationException:
+        pass
+
+    parser.reset()
+    parser.addErrorListener(NewErrorListener.INSTANCE)
+    parser._errHandler = DefaultErrorStrategy()
+    interp.predictionMode = PredictionMode.LL
+    return parser.program()
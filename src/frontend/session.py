@@ -0,0 +1,99 @@
+"""
+Reusable front-end session for TyC programs.
+A session keeps one TyCLexer/TyCParser pair per thread and rewinds it for
+every new source string instead of constructing fresh lexer, token stream
+and parser objects (and their ATN simulators) on each call.
+"""
+
+import threading
+
+from antlr4 import CommonTokenStream
+
+from build.TyCLexer import TyCLexer
+from build.TyCParser import TyCParser
+from src.frontend.ast_parser import ASTParser
+from src.frontend.char_stream import CompactInputStream
+from src.frontend.fast_lexer import FastLexer
+from src.frontend.parsing import parse_program
+from src.frontend.streaming import LexError, iter_tokens
+
+
+class _Pipeline:
+    """Lexer, token stream, parser and AST builders owned by one thread."""
+
+    def __init__(self, fast_lexer: bool = False):
+        # FastLexer scans the source string directly; TyCLexer needs a char stream.
+        self.make_input = str if fast_lexer else CompactInputStream
+        self.lexer = FastLexer("") if fast_lexer else TyCLexer(CompactInputStream(""))
+        self.token_stream = CommonTokenStream(self.lexer)
+        self.parser = TyCParser(self.token_stream)
+        self.ast_generator = None
+        self.ast_parser = None
+
+    def load(self, source: str):
+        """Point the pipeline at a new source string and reset all state."""
+        # Assigning the input stream resets the lexer; setTokenSource drops
+        # the buffered tokens; setTokenStream resets the parser.
+        self.lexer.inputStream = self.make_input(source)
+        self.token_stream.setTokenSource(self.lexer)
+        self.parser.setTokenStream(self.token_stream)
+
+
+class FrontEndSession:
+    """Tokenize, parse and build ASTs with per-thread pooled lexer/parser instances.
+
+    The results match the ``Tokenizer``, ``Parser`` and ``ASTGenerator``
+    test wrappers, which now delegate to a shared session. With
+    ``fast_lexer=True`` the regex-driven FastLexer replaces TyCLexer, and
+    with ``direct_ast=True`` ``build_ast`` uses ASTParser, which skips the
+    parse tree altogether. ``explicit_stack=True`` runs ASTGeneration in
+    its explicit-stack mode, for parse trees too deep to visit recursively.
+    """
+
+    def __init__(self, fast_lexer: bool = False, direct_ast: bool = False, explicit_stack: bool = False):
+        self.fast_lexer = fast_lexer
+        self.direct_ast = direct_ast
+        self.explicit_stack = explicit_stack
+        self._local = threading.local()
+
+    def _pipeline(self) -> _Pipeline:
+        pipeline = getattr(self._local, "pipeline", None)
+        if pipeline is None:
+            pipeline = self._local.pipeline = _Pipeline(self.fast_lexer)
+        return pipeline
+
+    def tokenize(self, source: str) -> str:
+        """Comma-separated token texts ending in ``<EOF>``, or the lexer error."""
+        pipeline = self._pipeline()
+        events = iter_tokens(pipeline.make_input(source), pipeline.lexer, stop_on_error=True)
+        return ",".join(
+            event.message if isinstance(event, LexError) else event.text for event in events
+        )
+
+    def parse_tree(self, source: str):
+        """Parse tree of ``source``; lexer and syntax errors are raised."""
+        pipeline = self._pipeline()
+        pipeline.load(source)
+        return parse_program(pipeline.parser)
+
+    def parse(self, source: str) -> str:
+        """``"success"`` or the error message, like ``Parser.parse``."""
+        try:
+            self.parse_tree(source)
+            return "success"
+        except Exception as e:
+            return str(e)
+
+    def build_ast(self, source: str):
+        """AST ``Program`` of ``source``; lexer and syntax errors are raised."""
+        pipeline = self._pipeline()
+        if self.direct_ast:
+            if pipeline.ast_parser is None:
+                pipeline.ast_parser = ASTParser(self.fast_lexer)
+            return pipeline.ast_parser.parse(source)
+        if pipeline.ast_generator is None:
+            from src.astgen.ast_generation import ASTGeneration
+
+            pipeline.ast_generator = ASTGeneration(self.explicit_stack)
+        tree = self.parse_tree(source)
+        return pipeline.ast_generator.visit(tree)
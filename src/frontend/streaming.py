@@ -0,0 +1,105 @@
+"""
+Streaming tokenization for TyC.
+A joined token string and ``CommonTokenStream`` both hold every token of a
+file before anything looks at them. ``iter_tokens`` is a generator that
+hands out each token as soon as it is lexed and keeps nothing behind it, so
+a single forward pass (a linter, a token counter) runs in constant memory
+whatever the size of the source. Lexical errors are reported in-line as
+``LexError`` events and lexing carries on after them.
+"""
+
+from typing import Iterator, List, NamedTuple, Union
+
+from antlr4.Token import Token
+
+from build.TyCLexer import TyCLexer
+from lexererr import LexerError
+from src.frontend.fast_lexer import FastLexer
+
+
+class StreamToken(NamedTuple):
+    """One token: its type, text (STRLIT without quotes), position and offsets."""
+
+    type: int
+    text: str
+    line: int
+    column: int
+    start: int
+    stop: int
+
+
+class LexError(NamedTuple):
+    """A lexical error at the start of the offending lexeme.
+
+    ``kind`` is the name of the lexer error class (``ErrorToken``,
+    ``UncloseString`` or ``IllegalEscape``) and ``message`` its text, e.g.
+    ``"Error Token @"``.
+    """
+
+    kind: str
+    message: str
+    line: int
+    column: int
+    start: int
+
+
+StreamEvent = Union[StreamToken, LexError]
+
+
+def iter_tokens(source, lexer=None, stop_on_error: bool = False) -> Iterator[StreamEvent]:
+    """Yield the tokens of ``source`` one by one, ending with the EOF token.
+
+    ``source`` is a ``str`` or ANTLR char stream. Without ``lexer`` a new
+    FastLexer scans it; a given lexer (FastLexer or TyCLexer) is reset onto
+    ``source`` first. Each lexical error is yielded as a ``LexError`` and
+    lexing resumes after the bad lexeme, unless ``stop_on_error`` is set.
+    """
+    if lexer is None:
+        lexer = FastLexer(source)
+    else:
+        lexer.inputStream = source
+    scan = getattr(lexer, "scan", None)
+    text = lexer.inputStream if scan is not None else None
+    strlit = TyCLexer.STRLIT
+    while True:
+        try:
+            if scan is not None:
+                # FastLexer: slice the text ourselves, no CommonToken is built.
+                ttype, start, stop, line, column = scan()
+                if ttype == Token.EOF:
+                    token_text = "<EOF>"
+                elif ttype == strlit:
+                    token_text = text[start + 1:stop]
+                else:
+                    token_text = text[start:stop + 1]
+                token = StreamToken(ttype, token_text, line, column, start, stop)
+            else:
+                t = lexer.nextToken()
+                token = StreamToken(t.type, t.text, t.line, t.column, t.start, t.stop)
+        except LexerError as e:
+            yield LexError(type(e).__name__, str(e), lexer._tokenStartLine,
+                           lexer._tokenStartColumn, lexer._tokenStartCharIndex)
+            if stop_on_error:
+                return
+            continue
+        yield token
+        if token.type == Token.EOF:
+            return
+
+
+def iter_token_batches(source, size: int = 1024, lexer=None,
+                       stop_on_error: bool = False) -> Iterator[List[StreamEvent]]:
+    """Same events as ``iter_tokens``, in lists of at most ``size``.
+
+    Only one batch is alive at a time; the last one may be shorter.
+    """
+    if size < 1:
+        raise ValueError("batch size must be positive")
+    batch: List[StreamEvent] = []
+    for event in iter_tokens(source, lexer, stop_on_error):
+        batch.append(event)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
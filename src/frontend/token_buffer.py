@@ -0,0 +1,259 @@
+"""
+Column-oriented token storage for TyC.
+CommonTokenStream keeps one CommonToken object per token, each with about
+ten attributes and its own text string. TokenBuffer stores the type,
+start/stop offsets, line and column of every token in parallel typed
+arrays (18 bytes per token) and slices the text from the source only when
+it is asked for. TokenBufferStream puts a token-stream face on a buffer so
+TyCParser can consume it in place of CommonTokenStream.
+"""
+
+from array import array
+
+from antlr4.Token import Token
+
+from build.TyCLexer import TyCLexer
+from src.frontend.fast_lexer import FastLexer
+
+
+class TokenBuffer:
+    """Tokens of one source string, one typed array per field.
+
+    ``types[i]``, ``starts[i]``, ``stops[i]``, ``lines[i]`` and
+    ``columns[i]`` describe token ``i``; the arrays can be scanned
+    directly by tools that walk the stream many times.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.types = array("h")
+        self.starts = array("i")
+        self.stops = array("i")
+        self.lines = array("i")
+        self.columns = array("i")
+
+    @classmethod
+    def tokenize(cls, source: str, lexer=None) -> "TokenBuffer":
+        """Buffer holding every token of ``source`` up to EOF; lexer errors are raised."""
+        stream = TokenBufferStream(lexer if lexer is not None else FastLexer(source))
+        stream.fill()
+        return stream.buffer
+
+    def append(self, ttype: int, start: int, stop: int, line: int, column: int):
+        self.types.append(ttype)
+        self.starts.append(start)
+        self.stops.append(stop)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def text(self, index: int) -> str:
+        """Token text, cut from the source (STRLIT without its quotes)."""
+        ttype = self.types[index]
+        if ttype == Token.EOF:
+            return "<EOF>"
+        if ttype == TyCLexer.STRLIT:
+            return self.source[self.starts[index] + 1:self.stops[index]]
+        return self.source[self.starts[index]:self.stops[index] + 1]
+
+    def line(self, index: int) -> int:
+        return self.lines[index]
+
+    def column(self, index: int) -> int:
+        return self.columns[index]
+
+    def token(self, index: int) -> "BufferToken":
+        return BufferToken(self, index)
+
+    def __iter__(self):
+        return (BufferToken(self, index) for index in range(len(self.types)))
+
+
+class BufferToken:
+    """Read-only ``Token`` view of one entry of a TokenBuffer."""
+
+    __slots__ = ("_buffer", "tokenIndex")
+
+    channel = Token.DEFAULT_CHANNEL
+
+    def __init__(self, buffer: TokenBuffer, index: int):
+        self._buffer = buffer
+        self.tokenIndex = index
+
+    @property
+    def type(self) -> int:
+        return self._buffer.types[self.tokenIndex]
+
+    @property
+    def start(self) -> int:
+        return self._buffer.starts[self.tokenIndex]
+
+    @property
+    def stop(self) -> int:
+        return self._buffer.stops[self.tokenIndex]
+
+    @property
+    def line(self) -> int:
+        return self._buffer.lines[self.tokenIndex]
+
+    @property
+    def column(self) -> int:
+        return self._buffer.columns[self.tokenIndex]
+
+    @property
+    def text(self) -> str:
+        return self._buffer.text(self.tokenIndex)
+
+    def getTokenSource(self):
+        return None
+
+    def getInputStream(self):
+        return None
+
+    def __eq__(self, other):
+        return (isinstance(other, BufferToken) and other._buffer is self._buffer
+                and other.tokenIndex == self.tokenIndex)
+
+    def __hash__(self):
+        return hash((id(self._buffer), self.tokenIndex))
+
+    def __str__(self):
+        text = self.text.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+        return f"[@{self.tokenIndex},{self.start}:{self.stop}='{text}',<{self.type}>,{self.line}:{self.column}]"
+
+
+class TokenBufferStream:
+    """Token stream for TyCParser backed by a TokenBuffer.
+
+    Tokens are pulled from the lexer on demand exactly like
+    CommonTokenStream does, so lexer errors surface at the same point of
+    the parse. The regex FastLexer is read through its ``scan`` fast path
+    and no token objects are built; any other lexer's tokens are copied
+    into the buffer and dropped.
+    """
+
+    def __init__(self, lexer):
+        self.setTokenSource(lexer)
+
+    def setTokenSource(self, lexer):
+        """Start over on ``lexer``'s current input (drops the buffered tokens)."""
+        self.tokenSource = lexer
+        source = lexer.inputStream
+        self.buffer = TokenBuffer(source if isinstance(source, str) else str(source))
+        self._scan = getattr(lexer, "scan", None) or self._scan_tokens
+        self._fetched_eof = False
+        self.index = -1
+
+    def _scan_tokens(self):
+        token = self.tokenSource.nextToken()
+        return token.type, token.start, token.stop, token.line, token.column
+
+    def sync(self, index: int) -> bool:
+        """Make sure token ``index`` is buffered; False if EOF comes first."""
+        buffer = self.buffer
+        while len(buffer.types) <= index:
+            if self._fetched_eof:
+                return False
+            ttype, start, stop, line, column = self._scan()
+            buffer.append(ttype, start, stop, line, column)
+            self._fetched_eof = ttype == Token.EOF
+        return True
+
+    def _lazy_init(self):
+        if self.index == -1:
+            self.sync(0)
+            self.index = 0
+
+    # ------------------------------------------------------------------
+    # TokenStream interface used by the ANTLR runtime
+    # ------------------------------------------------------------------
+
+    def getTokenSource(self):
+        return self.tokenSource
+
+    @property
+    def size(self) -> int:
+        return len(self.buffer)
+
+    def mark(self) -> int:
+        return 0
+
+    def release(self, marker: int):
+        pass
+
+    def reset(self):
+        self.seek(0)
+
+    def seek(self, index: int):
+        self._lazy_init()
+        self.sync(index)
+        self.index = min(index, len(self.buffer) - 1)
+
+    def get(self, index: int) -> BufferToken:
+        self._lazy_init()
+        self.sync(index)
+        return BufferToken(self.buffer, index)
+
+    def consume(self):
+        if self.index == -1:
+            self._lazy_init()
+        index = self.index
+        if self.buffer.types[index] == Token.EOF:
+            raise Exception("cannot consume EOF")
+        if index + 1 < len(self.buffer.types) or self.sync(index + 1):
+            self.index = index + 1
+
+    def LA(self, k: int) -> int:
+        if self.index == -1:
+            self._lazy_init()
+        if k == 0:
+            return 0
+        index = self.index + k - 1 if k > 0 else self.index + k
+        if index < 0:
+            return 0
+        types = self.buffer.types
+        if index >= len(types) and not self.sync(index):
+            return Token.EOF
+        return types[index]
+
+    def LT(self, k: int):
+        if self.index == -1:
+            self._lazy_init()
+        if k == 0:
+            return None
+        if k < 0:
+            index = self.index + k
+            return BufferToken(self.buffer, index) if index >= 0 else None
+        index = self.index + k - 1
+        if index >= len(self.buffer.types) and not self.sync(index):
+            index = len(self.buffer.types) - 1
+        return BufferToken(self.buffer, index)
+
+    def fill(self):
+        """Read the lexer up to EOF (like ``BufferedTokenStream.fill``)."""
+        self._lazy_init()
+        while self.sync(len(self.buffer)):
+            pass
+
+    def getText(self, start=None, stop=None) -> str:
+        """Concatenated token texts from ``start`` to ``stop`` (tokens or indexes), up to EOF."""
+        self._lazy_init()
+        self.fill()
+        if isinstance(start, BufferToken):
+            start = start.tokenIndex
+        if isinstance(stop, BufferToken):
+            stop = stop.tokenIndex
+        buffer = self.buffer
+        start = 0 if start is None else start
+        stop = len(buffer) - 1 if stop is None or stop >= len(buffer) else stop
+        if start < 0 or stop < 0:
+            return ""
+        texts = []
+        for index in range(start, stop + 1):
+            if buffer.types[index] == Token.EOF:
+                break
+            texts.append(buffer.text(index))
+        return "".join(texts)
+
@@ -0,0 +1,3 @@
+"""
+Semantic analysis modules for TyC compiler
+"""
@@ -0,0 +1,36 @@
+class StaticError(Exception):
+    def __str__(self):
+        return self.message
+
+
+class UndeclaredIdentifier(StaticError):
+    def __init__(self, name):
+        self.message = "Undeclared Identifier: " + name
+
+
+class UndeclaredFunction(StaticError):
+    def __init__(self, name):
+        self.message = "Undeclared Function: " + name
+
+
+class UndeclaredStruct(StaticError):
+    def __init__(self, name):
+        self.message = "Undeclared Struct: " + name
+
+
+class TypeMismatchInExpression(StaticError):
+    def __init__(self, expr):
+        self.node = expr
+        self.message = "Type Mismatch In Expression: " + str(expr)
+
+
+class TypeMismatchInStatement(StaticError):
+    def __init__(self, stmt):
+        self.node = stmt
+        self.message = "Type Mismatch In Statement: " + str(stmt)
+
+
+class TypeCannotBeInferred(StaticError):
+    def __init__(self, stmt):
+        self.node = stmt
+        self.message = "Type Cannot Be Inferred: " + str(stmt)
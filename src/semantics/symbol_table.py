@@ -0,0 +1,164 @@
+"""
+Scoped symbol table for the semantic phase (the Scope Rules section of
+the specification).
+Entering and leaving a scope, declaring a name and looking one up all
+take constant time (lookups amortized), however deep the nesting, and
+``snapshot()`` captures the names visible at that point, also in
+constant time, without copying anything:
+
+    table = SymbolTable()
+    table.declare("x", param)
+    table.push()                 # a block, a for statement...
+    table.declare("x", var_decl) # shadows the parameter
+    here = table.snapshot()
+    table.pop()
+    table.lookup("x")            param
+    here.lookup("x")             var_decl, still
+
+Each scope keeps the names declared in it, numbered in order, and never
+forgets them; a snapshot is a scope plus how many of its names had been
+declared, which is all it takes to answer later what was visible then.
+Live lookups go through a stack of entries per name instead, so they do
+not walk the scopes: leaving a scope only marks it closed, and its
+entries are dropped from those stacks the next time the name is looked up.
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+class _Entry:
+    """One declaration of a name in a scope."""
+
+    __slots__ = ("index", "value", "shadowed", "scope")
+
+    def __init__(self, index: int, value: Any, shadowed: Optional["_Entry"], scope: "_Scope"):
+        self.index = index  # number of names declared in the scope before this one
+        self.value = value
+        self.shadowed = shadowed  # earlier declaration of the same name in the scope
+        self.scope = scope
+
+
+class _Scope:
+    __slots__ = ("parent", "opened_at", "names", "count", "open")
+
+    def __init__(self, parent: Optional["_Scope"]):
+        self.parent = parent
+        # Names of the parent declared before this scope was entered.
+        self.opened_at = parent.count if parent is not None else 0
+        self.names: Dict[str, _Entry] = {}
+        self.count = 0
+        self.open = True
+
+
+class Snapshot:
+    """The names visible at one point of the analysis; see ``SymbolTable.snapshot``."""
+
+    __slots__ = ("_scope", "_count")
+
+    def __init__(self, scope: _Scope, count: int):
+        self._scope = scope
+        self._count = count
+
+    def lookup(self, name: str, default: Any = None) -> Any:
+        """Value of the innermost declaration of ``name`` visible then."""
+        scope, limit = self._scope, self._count
+        while scope is not None:
+            entry = scope.names.get(name)
+            while entry is not None and entry.index >= limit:
+                entry = entry.shadowed
+            if entry is not None:
+                return entry.value
+            scope, limit = scope.parent, scope.opened_at
+        return default
+
+    def __contains__(self, name: str) -> bool:
+        return self.lookup(name, _MISSING) is not _MISSING
+
+    def names(self) -> Dict[str, Any]:
+        """Every visible name and the value of its innermost declaration."""
+        visible: Dict[str, Any] = {}
+        scope, limit = self._scope, self._count
+        while scope is not None:
+            for name, entry in scope.names.items():
+                if name not in visible:
+                    while entry is not None and entry.index >= limit:
+                        entry = entry.shadowed
+                    if entry is not None:
+                        visible[name] = entry.value
+            scope, limit = scope.parent, scope.opened_at
+        return visible
+
+    @property
+    def depth(self) -> int:
+        """Number of scopes entered around the outermost one."""
+        depth, scope = 0, self._scope.parent
+        while scope is not None:
+            depth, scope = depth + 1, scope.parent
+        return depth
+
+
+_MISSING = object()
+
+
+class SymbolTable:
+    """Nested scopes of names, the outermost one open from the start."""
+
+    def __init__(self):
+        self._scope = _Scope(None)
+        self._depth = 0
+        # name -> its entries in open (and not yet dropped closed) scopes, innermost last
+        self._live: Dict[str, List[_Entry]] = {}
+
+    @property
+    def depth(self) -> int:
+        """Number of scopes entered (and not left) around the outermost one."""
+        return self._depth
+
+    def push(self):
+        """Enter a new innermost scope."""
+        self._scope = _Scope(self._scope)
+        self._depth += 1
+
+    def pop(self):
+        """Leave the innermost scope; its names stop being visible."""
+        scope = self._scope
+        if scope.parent is None:
+            raise IndexError("pop from the outermost scope")
+        scope.open = False
+        self._scope = scope.parent
+        self._depth -= 1
+
+    def declare(self, name: str, value: Any):
+        """Declare ``name`` in the innermost scope, shadowing any outer
+        declaration of it (and any earlier one in the same scope)."""
+        scope = self._scope
+        entry = _Entry(scope.count, value, scope.names.get(name), scope)
+        scope.names[name] = entry
+        scope.count += 1
+        stack = self._live.get(name)
+        if stack is None:
+            self._live[name] = [entry]
+        else:
+            stack.append(entry)
+
+    def lookup(self, name: str, default: Any = None) -> Any:
+        """Value of the innermost visible declaration of ``name``."""
+        stack = self._live.get(name)
+        while stack:
+            entry = stack[-1]
+            if entry.scope.open:
+                return entry.value
+            stack.pop()
+        return default
+
+    def __contains__(self, name: str) -> bool:
+        return self.lookup(name, _MISSING) is not _MISSING
+
+    def declared_here(self, name: str) -> bool:
+        """Whether ``name`` is declared in the innermost scope itself."""
+        return name in self._scope.names
+
+    def snapshot(self) -> Snapshot:
+        """The names visible now. Later declarations and scope changes do
+        not show in it."""
+        return Snapshot(self._scope, self._scope.count)
@@ -0,0 +1,478 @@
+"""
+Type inference and type checking for TyC (the Type Inference section of
+the specification).
+Types not written in the source, those of ``auto`` variables declared
+without a value (Rule 2.2) and of functions declared without a return
+type (Rule 5), start as type variables. A use that fixes one of them
+binds it; a use that only relates two unknowns (``a = b``) merges them.
+``TypeVariables`` keeps them in a union-find structure with path
+compression and union by rank, so the whole program is checked in one
+pass over its declarations, in near-linear time, instead of rescanning
+it until no more types change:
+
+    table = infer_types(ASTParser().parse(source))
+    table.type_of(var_decl)     IntType() once ``x = readInt();`` is seen
+    table.return_type("f")      the return type of ``f``, inferred or not
+
+Each body is checked once. A call to a function whose return type is
+still unknown checks that function first; inside its own body (direct or
+mutual recursion) the call has the function's type variable instead,
+which the first use then binds like any other. A function without a
+``return`` of a value returns ``void``; one whose returned values never
+get a type is an error once the whole program is checked.
+
+Variables are looked up in a ``SymbolTable`` per body. With
+``scopes=True`` the checker also keeps a snapshot of it before every
+statement, so ``table.scope_at(stmt)`` tells which declaration each name
+visible there refers to.
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.utils.nodes import *
+from src.utils.visitor import BaseVisitor
+from .static_error import (
+    TypeCannotBeInferred,
+    TypeMismatchInExpression,
+    TypeMismatchInStatement,
+    UndeclaredFunction,
+    UndeclaredIdentifier,
+    UndeclaredStruct,
+)
+from .symbol_table import Snapshot, SymbolTable
+
+# A type node, or the number of a type variable in ``TypeVariables``.
+# Type nodes are shared (``IntType() is IntType()``), so two known types
+# are the same type exactly when they are the same object.
+Term = Union[Type, int]
+
+_INT, _FLOAT, _STRING, _VOID = IntType(), FloatType(), StringType(), VoidType()
+_NUMBERS = (_INT, _FLOAT)
+_RELATIONAL = frozenset(("==", "!=", "<", "<=", ">", ">="))
+_INT_ONLY = frozenset(("%", "&&", "||"))
+
+# Built-in functions: name -> (parameter types, return type).
+BUILTINS: Dict[str, Tuple[Tuple[Type, ...], Type]] = {
+    "readInt": ((), _INT),
+    "readFloat": ((), _FLOAT),
+    "readString": ((), _STRING),
+    "printInt": ((_INT,), _VOID),
+    "printFloat": ((_FLOAT,), _VOID),
+    "printString": ((_STRING,), _VOID),
+}
+
+
+class TypeVariables:
+    """Type variables numbered from 0, in a union-find forest. The root of
+    each set holds the type bound to the set, or None while unknown."""
+
+    def __init__(self):
+        self.parent: List[int] = []
+        self.rank: List[int] = []
+        self.bound: List[Optional[Type]] = []
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def new(self) -> int:
+        """A fresh unknown type."""
+        var = len(self.parent)
+        self.parent.append(var)
+        self.rank.append(0)
+        self.bound.append(None)
+        return var
+
+    def find(self, var: int) -> int:
+        """The root of the set of ``var``; every variable on the way is
+        pointed straight at it."""
+        parent = self.parent
+        root = var
+        while parent[root] != root:
+            root = parent[root]
+        while parent[var] != root:
+            parent[var], var = root, parent[var]
+        return root
+
+    def resolve(self, term: Term) -> Term:
+        """The type ``term`` stands for, or the root of its set if that is
+        still unknown."""
+        if term.__class__ is not int:
+            return term
+        root = self.find(term)
+        bound = self.bound[root]
+        return root if bound is None else bound
+
+    def unify(self, a: Term, b: Term) -> bool:
+        """Make ``a`` and ``b`` the same type; False if they are two
+        different known types."""
+        a, b = self.resolve(a), self.resolve(b)
+        if a is b:
+            return True
+        if a.__class__ is int:
+            if b.__class__ is not int:
+                self.bound[a] = b
+                return True
+            rank = self.rank
+            if rank[a] < rank[b]:
+                a, b = b, a
+            self.parent[b] = a
+            if rank[a] == rank[b]:
+                rank[a] += 1
+            return True
+        if b.__class__ is int:
+            self.bound[b] = a
+            return True
+        return False
+
+
+class _Function:
+    """What the checker knows about one function."""
+
+    __slots__ = ("decl", "params", "returns", "state", "returns_value")
+
+    def __init__(self, decl: FuncDecl, params: Tuple[Type, ...], returns: Term):
+        self.decl = decl
+        self.params = params
+        self.returns = returns
+        self.state = _UNCHECKED
+        self.returns_value = False  # whether a ``return <expr>`` was seen
+
+
+_UNCHECKED, _CHECKING, _CHECKED = range(3)
+
+
+class _Body:
+    """The ``o`` of the visit methods while a function body is checked."""
+
+    __slots__ = ("function", "symbols")
+
+    def __init__(self, function: _Function):
+        self.function = function
+        # Variable name -> its ``VarDecl`` or ``Param``; the outermost
+        # scope holds the parameters.
+        self.symbols = SymbolTable()
+
+
+class TypeTable:
+    """Types found by ``TypeInference``: that of every expression, variable
+    declaration and parameter, and the return type of every function."""
+
+    def __init__(
+        self,
+        types: Dict[int, Type],
+        returns: Dict[str, Type],
+        nodes: List[ASTNode],
+        scopes: Optional[Dict[int, Snapshot]] = None,
+    ):
+        self._types = types
+        self._returns = returns
+        self._nodes = nodes  # keeps the keys of ``types`` the ids of these nodes
+        self._scopes = scopes
+
+    def type_of(self, node: ASTNode) -> Optional[Type]:
+        """Type of an expression, ``VarDecl`` or ``Param`` of the checked
+        program (None for other nodes)."""
+        return self._types.get(id(node))
+
+    def return_type(self, name: str) -> Type:
+        """Return type of the function ``name``, declared or inferred."""
+        return self._returns[name]
+
+    def scope_at(self, stmt: Stmt) -> Optional[Snapshot]:
+        """Variables visible just before ``stmt``, a statement of a function
+        body, as a snapshot mapping names to their ``VarDecl`` or ``Param``
+        (None unless the table was made with ``scopes=True``)."""
+        return None if self._scopes is None else self._scopes.get(id(stmt))
+
+
+class TypeInference(BaseVisitor):
+    """Infers the types of a program and checks them, raising the
+    ``StaticError`` of the first error found. Expression ``visit_*``
+    methods return the expression's ``Term``."""
+
+    def __init__(self, scopes: bool = False):
+        self.variables = TypeVariables()
+        self.structs: Dict[str, Dict[str, Type]] = {}
+        self.functions: Dict[str, _Function] = {}
+        # id(node) -> term. The nodes are kept so that no other node gets
+        # their ids; pairing them up in tuples instead leaves the garbage
+        # collector one more object to scan per node.
+        self._terms: Dict[int, Term] = {}
+        self._nodes: List[ASTNode] = []
+        # ``auto`` declarations without a value, in the order checked.
+        self._unknown: List[Tuple[VarDecl, int]] = []
+        # id(statement) -> the variables visible before it, if asked for
+        self._scopes: Optional[Dict[int, Snapshot]] = {} if scopes else None
+
+    def infer(self, program: Program) -> TypeTable:
+        self.visit(program)
+        resolve = self.variables.resolve
+        for decl, var in self._unknown:
+            known = resolve(var)
+            if known.__class__ is int:
+                raise TypeCannotBeInferred(decl)
+            if known is _VOID:
+                raise TypeMismatchInStatement(decl)
+        for function in self.functions.values():
+            # Checked last: a later body may still bind the type (mutual recursion).
+            if resolve(function.returns).__class__ is int:
+                raise TypeCannotBeInferred(function.decl)
+        types = {key: resolve(term) for key, term in self._terms.items()}
+        returns = {name: resolve(function.returns) for name, function in self.functions.items()}
+        returns.update((name, signature[1]) for name, signature in BUILTINS.items() if name not in returns)
+        return TypeTable(types, returns, self._nodes, self._scopes)
+
+    def _note(self, node: ASTNode, term: Term) -> Term:
+        self._terms[id(node)] = term
+        self._nodes.append(node)
+        return term
+
+    def _declared(self, type_node: Type) -> Type:
+        if type_node.__class__ is StructType and type_node.struct_name not in self.structs:
+            raise UndeclaredStruct(type_node.struct_name)
+        return type_node
+
+    def _expect(self, expr: Expr, expected: Term, o: _Body) -> bool:
+        # Whether ``expr`` can have the type ``expected``. A struct literal
+        # has no type of its own, so it is checked against the struct's members.
+        if expr.__class__ is not StructLiteral:
+            return self.variables.unify(self.visit(expr, o), expected)
+        expected = self.variables.resolve(expected)
+        if expected.__class__ is int:
+            raise TypeCannotBeInferred(expr)
+        if expected.__class__ is not StructType:
+            return False
+        members = self.structs[expected.struct_name]
+        if len(members) != len(expr.values):
+            return False
+        for value, member_type in zip(expr.values, members.values()):
+            if not self._expect(value, member_type, o):
+                return False
+        self._note(expr, expected)
+        return True
+
+    # ------------------------------------------------------------------
+    # Declarations
+    # ------------------------------------------------------------------
+
+    def visit_program(self, node: Program, o=None):
+        # Struct and function names are global: every signature is known
+        # before the first body is checked.
+        for decl in node.decls:
+            if decl.__class__ is StructDecl:
+                self.structs[decl.name] = {
+                    member.name: self._declared(member.member_type) for member in decl.members
+                }
+        for decl in node.decls:
+            if decl.__class__ is FuncDecl:
+                params = tuple(self._declared(param.param_type) for param in decl.params)
+                returns = self.variables.new() if decl.return_type is None else self._declared(decl.return_type)
+                self.functions[decl.name] = _Function(decl, params, returns)
+        for function in list(self.functions.values()):
+            if function.state == _UNCHECKED:
+                self._check(function)
+
+    def _check(self, function: _Function):
+        function.state = _CHECKING
+        decl = function.decl
+        body = _Body(function)
+        for param, param_type in zip(decl.params, function.params):
+            self._note(param, param_type)
+            body.symbols.declare(param.name, param)
+        self._statement(decl.body, body)
+        if not function.returns_value:
+            self.variables.unify(function.returns, _VOID)
+        function.state = _CHECKED
+
+    # ------------------------------------------------------------------
+    # Statements
+    # ------------------------------------------------------------------
+
+    def _statement(self, stmt: Stmt, o: _Body):
+        if self._scopes is not None:
+            self._scopes[id(stmt)] = o.symbols.snapshot()
+            self._nodes.append(stmt)
+        self.visit(stmt, o)
+
+    def visit_block_stmt(self, node: BlockStmt, o: _Body = None):
+        o.symbols.push()
+        for stmt in node.statements:
+            self._statement(stmt, o)
+        o.symbols.pop()
+
+    def visit_var_decl(self, node: VarDecl, o: _Body = None):
+        if node.var_type is not None:
+            term = self._declared(node.var_type)
+            if node.init_value is not None and not self._expect(node.init_value, term, o):
+                raise TypeMismatchInStatement(node)
+        elif node.init_value is not None:
+            if node.init_value.__class__ is StructLiteral:
+                raise TypeCannotBeInferred(node)
+            term = self.visit(node.init_value, o)
+            if self.variables.resolve(term) is _VOID:
+                raise TypeMismatchInStatement(node)
+        else:
+            term = self.variables.new()
+            self._unknown.append((node, term))
+        self._note(node, term)
+        o.symbols.declare(node.name, node)
+
+    def _condition(self, expr: Expr, stmt: Stmt, o: _Body):
+        if not self.variables.unify(self.visit(expr, o), _INT):
+            raise TypeMismatchInStatement(stmt)
+
+    def visit_if_stmt(self, node: IfStmt, o: _Body = None):
+        self._condition(node.condition, node, o)
+        self._statement(node.then_stmt, o)
+        if node.else_stmt is not None:
+            self._statement(node.else_stmt, o)
+
+    def visit_while_stmt(self, node: WhileStmt, o: _Body = None):
+        self._condition(node.condition, node, o)
+        self._statement(node.body, o)
+
+    def visit_for_stmt(self, node: ForStmt, o: _Body = None):
+        o.symbols.push()
+        if node.init is not None:
+            self.visit(node.init, o)
+        if node.condition is not None:
+            self._condition(node.condition, node, o)
+        if node.update is not None:
+            self.visit(node.update, o)
+        self._statement(node.body, o)
+        o.symbols.pop()
+
+    def visit_switch_stmt(self, node: SwitchStmt, o: _Body = None):
+        self._condition(node.expr, node, o)
+        o.symbols.push()
+        for case in node.cases:
+            self._condition(case.expr, node, o)
+            for stmt in case.statements:
+                self._statement(stmt, o)
+        if node.default_case is not None:
+            for stmt in node.default_case.statements:
+                self._statement(stmt, o)
+        o.symbols.pop()
+
+    def visit_return_stmt(self, node: ReturnStmt, o: _Body = None):
+        returns = o.function.returns
+        if node.expr is None:
+            ok = self.variables.unify(returns, _VOID)
+        else:
+            o.function.returns_value = True
+            if self.variables.resolve(returns) is _VOID:
+                ok = False
+            elif node.expr.__class__ is StructLiteral:
+                ok = self._expect(node.expr, returns, o)
+            else:
+                # A void call has no value to return, even where the
+                # return type is still unknown.
+                term = self.visit(node.expr, o)
+                ok = self.variables.resolve(term) is not _VOID and self.variables.unify(term, returns)
+        if not ok:
+            raise TypeMismatchInStatement(node)
+
+    def visit_expr_stmt(self, node: ExprStmt, o: _Body = None):
+        self.visit(node.expr, o)
+
+    # ------------------------------------------------------------------
+    # Expressions
+    # ------------------------------------------------------------------
+
+    def visit_binary_op(self, node: BinaryOp, o: _Body = None):
+        unify, resolve = self.variables.unify, self.variables.resolve
+        operator = node.operator
+        left, right = self.visit(node.left, o), self.visit(node.right, o)
+        if operator in _INT_ONLY:
+            if not (unify(left, _INT) and unify(right, _INT)):
+                raise TypeMismatchInExpression(node)
+            return self._note(node, _INT)
+        left, right = resolve(left), resolve(right)
+        # An unknown operand takes the type of the other one (its first use).
+        if left.__class__ is int:
+            if right.__class__ is int:
+                raise TypeCannotBeInferred(node)
+            unify(left, right)
+            left = right
+        elif right.__class__ is int:
+            unify(right, left)
+            right = left
+        if left not in _NUMBERS or right not in _NUMBERS:
+            raise TypeMismatchInExpression(node)
+        if operator in _RELATIONAL or left is right is _INT:
+            return self._note(node, _INT)
+        return self._note(node, _FLOAT)
+
+    def visit_prefix_op(self, node: PrefixOp, o: _Body = None):
+        operand = self.visit(node.operand, o)
+        if node.operator in ("+", "-"):
+            operand = self.variables.resolve(operand)
+            if operand.__class__ is int:
+                raise TypeCannotBeInferred(node)
+            if operand not in _NUMBERS:
+                raise TypeMismatchInExpression(node)
+            return self._note(node, operand)
+        if not self.variables.unify(operand, _INT):
+            raise TypeMismatchInExpression(node)
+        return self._note(node, _INT)
+
+    def visit_postfix_op(self, node: PostfixOp, o: _Body = None):
+        if not self.variables.unify(self.visit(node.operand, o), _INT):
+            raise TypeMismatchInExpression(node)
+        return self._note(node, _INT)
+
+    def visit_assign_expr(self, node: AssignExpr, o: _Body = None):
+        lhs = self.visit(node.lhs, o)
+        if not self._expect(node.rhs, lhs, o):
+            raise TypeMismatchInExpression(node)
+        return self._note(node, lhs)
+
+    def visit_member_access(self, node: MemberAccess, o: _Body = None):
+        obj = self.variables.resolve(self.visit(node.obj, o))
+        if obj.__class__ is int:
+            raise TypeCannotBeInferred(node)
+        if obj.__class__ is not StructType or node.member not in self.structs[obj.struct_name]:
+            raise TypeMismatchInExpression(node)
+        return self._note(node, self.structs[obj.struct_name][node.member])
+
+    def visit_func_call(self, node: FuncCall, o: _Body = None):
+        function = self.functions.get(node.name)
+        if function is not None:
+            params, returns = function.params, function.returns
+        elif node.name in BUILTINS:
+            params, returns = BUILTINS[node.name]
+        else:
+            raise UndeclaredFunction(node.name)
+        if len(node.args) != len(params):
+            raise TypeMismatchInExpression(node)
+        for arg, param_type in zip(node.args, params):
+            if not self._expect(arg, param_type, o):
+                raise TypeMismatchInExpression(node)
+        if function is not None and function.state == _UNCHECKED and returns.__class__ is int:
+            self._check(function)
+        return self._note(node, returns)
+
+    def visit_identifier(self, node: Identifier, o: _Body = None):
+        decl = o.symbols.lookup(node.name)
+        if decl is None:
+            raise UndeclaredIdentifier(node.name)
+        return self._note(node, self._terms[id(decl)])
+
+    def visit_struct_literal(self, node: StructLiteral, o: _Body = None):
+        # Only reached where nothing gives the literal a struct type.
+        raise TypeCannotBeInferred(node)
+
+    def visit_int_literal(self, node: IntLiteral, o: _Body = None):
+        return self._note(node, _INT)
+
+    def visit_float_literal(self, node: FloatLiteral, o: _Body = None):
+        return self._note(node, _FLOAT)
+
+    def visit_string_literal(self, node: StringLiteral, o: _Body = None):
+        return self._note(node, _STRING)
+
+
+def infer_types(program: Program, scopes: bool = False) -> TypeTable:
+    """Types of ``program``; raises a ``StaticError`` if it does not type-check.
+    ``scopes=True`` also records the variables visible at every statement."""
+    return TypeInference(scopes).infer(program)
@@ -0,0 +1,290 @@
+"""
+Compact binary encoding of TyC ASTs.
+A way to keep parsed programs on disk and to move them between processes
+without pickling deep object graphs (slow, and recursive in the pickle
+module). Version 1 of the format is:
+
+    b"TyCA", version          magic and format version (varint)
+    names                     varint count, then each as varint length + UTF-8
+    strings                   the same, for the values of string literals
+    node count                varint
+    nodes                     pre-order: for each node its tag byte, then
+                              its scalar fields, then its children
+
+The tag is the index of the node class in ``_CLASSES`` plus one; tag 0
+stands for an absent optional child. The scalar fields of a node are
+written in constructor order: identifier names and operators as varint
+indices into the name table, string literal values as indices into the
+string table, integers as zigzag varints, floats as 8 little-endian bytes
+and every child list as its varint length. The children follow, also in
+constructor order, so each node record is self-delimiting.
+
+``loads`` reads the records front to back, then builds the nodes from the
+last record to the first: by then the children of every node are already
+built and sit on a stack in order, so nothing recurses and the tree can
+be of any depth. It accepts any buffer, including an ``mmap``, and
+``load`` maps a file instead of reading it.
+"""
+
+import mmap
+import struct
+from sys import intern
+from typing import BinaryIO, Dict, List
+
+from .nodes import *
+
+MAGIC = b"TyCA"
+VERSION = 1
+
+# Field kinds of the schema.
+_NODE, _NODES, _NAME, _STRING, _INT, _FLOAT = range(6)
+
+# Node classes in tag order. Version 1 of the format: only append to this
+# (and bump ``VERSION``), never reorder.
+_CLASSES = (
+    Program, StructDecl, MemberDecl, FuncDecl, Param,
+    IntType, FloatType, StringType, VoidType, StructType,
+    BlockStmt, VarDecl, IfStmt, WhileStmt, ForStmt, SwitchStmt, CaseStmt, DefaultStmt,
+    BreakStmt, ContinueStmt, ReturnStmt, ExprStmt,
+    BinaryOp, PrefixOp, PostfixOp, AssignExpr, MemberAccess, FuncCall, Identifier,
+    StructLiteral, IntLiteral, FloatLiteral, StringLiteral,
+)
+
+# Constructor arguments of each class as (field, kind) pairs.
+_SCHEMA = {
+    Program: (("decls", _NODES),),
+    StructDecl: (("name", _NAME), ("members", _NODES)),
+    MemberDecl: (("member_type", _NODE), ("name", _NAME)),
+    FuncDecl: (("return_type", _NODE), ("name", _NAME), ("params", _NODES), ("body", _NODE)),
+    Param: (("param_type", _NODE), ("name", _NAME)),
+    IntType: (),
+    FloatType: (),
+    StringType: (),
+    VoidType: (),
+    StructType: (("struct_name", _NAME),),
+    BlockStmt: (("statements", _NODES),),
+    VarDecl: (("var_type", _NODE), ("name", _NAME), ("init_value", _NODE)),
+    IfStmt: (("condition", _NODE), ("then_stmt", _NODE), ("else_stmt", _NODE)),
+    WhileStmt: (("condition", _NODE), ("body", _NODE)),
+    ForStmt: (("init", _NODE), ("condition", _NODE), ("update", _NODE), ("body", _NODE)),
+    SwitchStmt: (("expr", _NODE), ("cases", _NODES), ("default_case", _NODE)),
+    CaseStmt: (("expr", _NODE), ("statements", _NODES)),
+    DefaultStmt: (("statements", _NODES),),
+    BreakStmt: (),
+    ContinueStmt: (),
+    ReturnStmt: (("expr", _NODE),),
+    ExprStmt: (("expr", _NODE),),
+    BinaryOp: (("left", _NODE), ("operator", _NAME), ("right", _NODE)),
+    PrefixOp: (("operator", _NAME), ("operand", _NODE)),
+    PostfixOp: (("operator", _NAME), ("operand", _NODE)),
+    AssignExpr: (("lhs", _NODE), ("rhs", _NODE)),
+    MemberAccess: (("obj", _NODE), ("member", _NAME)),
+    FuncCall: (("name", _NAME), ("args", _NODES)),
+    Identifier: (("name", _NAME),),
+    StructLiteral: (("values", _NODES),),
+    IntLiteral: (("value", _INT),),
+    FloatLiteral: (("value", _FLOAT),),
+    StringLiteral: (("value", _STRING),),
+}
+
+# How ``loads`` builds a node with children from its scalar values ``v``
+# (in stream order) and ``pop``, which returns its children in order.
+# Classes without children are built with ``cls(*v)``.
+_BUILD = {
+    Program: lambda v, pop: Program([pop() for _ in range(v[0])]),
+    StructDecl: lambda v, pop: StructDecl(v[0], [pop() for _ in range(v[1])]),
+    MemberDecl: lambda v, pop: MemberDecl(pop(), v[0]),
+    FuncDecl: lambda v, pop: FuncDecl(pop(), v[0], [pop() for _ in range(v[1])], pop()),
+    Param: lambda v, pop: Param(pop(), v[0]),
+    BlockStmt: lambda v, pop: BlockStmt([pop() for _ in range(v[0])]),
+    VarDecl: lambda v, pop: VarDecl(pop(), v[0], pop()),
+    IfStmt: lambda v, pop: IfStmt(pop(), pop(), pop()),
+    WhileStmt: lambda v, pop: WhileStmt(pop(), pop()),
+    ForStmt: lambda v, pop: ForStmt(pop(), pop(), pop(), pop()),
+    SwitchStmt: lambda v, pop: SwitchStmt(pop(), [pop() for _ in range(v[0])], pop()),
+    CaseStmt: lambda v, pop: CaseStmt(pop(), [pop() for _ in range(v[0])]),
+    DefaultStmt: lambda v, pop: DefaultStmt([pop() for _ in range(v[0])]),
+    ReturnStmt: lambda v, pop: ReturnStmt(pop()),
+    ExprStmt: lambda v, pop: ExprStmt(pop()),
+    BinaryOp: lambda v, pop: BinaryOp(pop(), v[0], pop()),
+    PrefixOp: lambda v, pop: PrefixOp(v[0], pop()),
+    PostfixOp: lambda v, pop: PostfixOp(v[0], pop()),
+    AssignExpr: lambda v, pop: AssignExpr(pop(), pop()),
+    MemberAccess: lambda v, pop: MemberAccess(pop(), v[0]),
+    FuncCall: lambda v, pop: FuncCall(v[0], [pop() for _ in range(v[1])]),
+    StructLiteral: lambda v, pop: StructLiteral([pop() for _ in range(v[0])]),
+}
+
+_TAGS = {cls: tag for tag, cls in enumerate(_CLASSES, 1)}
+# Per tag: the node class, the kinds of its scalar fields in stream order
+# and its ``_BUILD`` entry.
+_LAYOUTS = [None] + [
+    (cls, tuple(kind for _, kind in _SCHEMA[cls] if kind != _NODE), _BUILD.get(cls))
+    for cls in _CLASSES
+]
+_DOUBLE = struct.Struct("<d")
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_table(out: bytearray, table: Dict[str, int]) -> None:
+    _write_varint(out, len(table))
+    for text in table:
+        data = text.encode("utf-8", "surrogatepass")
+        _write_varint(out, len(data))
+        out += data
+
+
+def dumps(node: ASTNode) -> bytes:
+    """The binary encoding of the tree under ``node``."""
+    names: Dict[str, int] = {}
+    strings: Dict[str, int] = {}
+    body = bytearray()
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node is None:
+            body.append(0)
+            continue
+        cls = node.__class__
+        tag = _TAGS.get(cls)
+        if tag is None:
+            raise TypeError(f"cannot encode {cls.__name__} nodes")
+        body.append(tag)
+        children = []
+        for field, kind in _SCHEMA[cls]:
+            value = getattr(node, field)
+            if kind == _NODE:
+                children.append(value)
+            elif kind == _NODES:
+                _write_varint(body, len(value))
+                children.extend(value)
+            elif kind == _NAME:
+                _write_varint(body, names.setdefault(value, len(names)))
+            elif kind == _STRING:
+                _write_varint(body, strings.setdefault(value, len(strings)))
+            elif kind == _INT:
+                _write_varint(body, value << 1 if value >= 0 else (~value << 1) | 1)
+            else:
+                body += _DOUBLE.pack(value)
+        stack.extend(reversed(children))
+
+    out = bytearray(MAGIC)
+    _write_varint(out, VERSION)
+    _write_table(out, names)
+    _write_table(out, strings)
+    _write_varint(out, count)
+    return bytes(out + body)
+
+
+def dump(node: ASTNode, file: BinaryIO) -> None:
+    """Write the binary encoding of ``node`` to the binary file ``file``."""
+    file.write(dumps(node))
+
+
+def loads(data) -> ASTNode:
+    """The tree encoded in ``data`` (``bytes``, ``memoryview``, ``mmap``...)."""
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError("not a binary TyC AST")
+    try:
+        return _decode(data)
+    except (IndexError, KeyError, TypeError, UnicodeDecodeError, struct.error) as e:
+        raise ValueError("truncated or malformed binary TyC AST") from e
+
+
+def load(path: str) -> ASTNode:
+    """The tree stored in the file at ``path``, read through a memory map."""
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return loads(data)
+
+
+def _decode(data) -> ASTNode:
+    pos = len(MAGIC)
+
+    def varint() -> int:
+        nonlocal pos
+        byte = data[pos]
+        pos += 1
+        value, shift = byte & 0x7F, 7
+        while byte & 0x80:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+        return value
+
+    def table() -> List[str]:
+        nonlocal pos
+        texts = []
+        for _ in range(varint()):
+            length = varint()
+            end = pos + length
+            if end > len(data):
+                raise IndexError(end)
+            texts.append(bytes(data[pos:end]).decode("utf-8", "surrogatepass"))
+            pos = end
+        return texts
+
+    version = varint()
+    if version != VERSION:
+        raise ValueError(f"binary TyC AST version {version} is not supported (expected {VERSION})")
+    names = [intern(name) for name in table()]
+    strings = table()
+    count = varint()
+
+    # Pass 1, front to back: the tag and scalar values of every record.
+    layouts = _LAYOUTS
+    records = []
+    append = records.append
+    for _ in range(count):
+        tag = data[pos]
+        pos += 1
+        if not tag:
+            append((None, None, None))
+            continue
+        cls, scalars, build = layouts[tag]
+        values = []
+        for kind in scalars:
+            if kind == _FLOAT:
+                values.append(_DOUBLE.unpack_from(data, pos)[0])
+                pos += 8
+                continue
+            # Inlined ``varint()``: most values fit in one byte.
+            byte = data[pos]
+            pos += 1
+            if byte & 0x80:
+                pos -= 1
+                byte = varint()
+            if kind == _NAME:
+                values.append(names[byte])
+            elif kind == _STRING:
+                values.append(strings[byte])
+            elif kind == _INT:
+                values.append(byte >> 1 if not byte & 1 else ~(byte >> 1))
+            else:
+                values.append(byte)
+        append((cls, values, build))
+    if pos != len(data):
+        raise ValueError("trailing bytes after the binary TyC AST")
+
+    # Pass 2, back to front: the children of each node are on top of the
+    # stack, first child last pushed.
+    stack = []
+    pop, push = stack.pop, stack.append
+    for cls, values, build in reversed(records):
+        if cls is None:
+            push(None)
+        elif build is None:
+            push(cls(*values))
+        else:
+            push(build(values, pop))
+    if len(stack) != 1 or stack[0] is None:
+        raise ValueError("malformed binary TyC AST")
+    return stack[0]
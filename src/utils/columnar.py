@@ -0,0 +1,195 @@
+"""
+Columnar (struct-of-arrays) form of TyC ASTs, for analytics over many programs.
+A ``ColumnarAST`` holds one or more trees as NumPy arrays indexed by node
+number, with the nodes of each tree numbered in pre-order:
+
+    kind            uint8   index of the node class in ``KINDS``
+    parent          int32   parent node, -1 for a root
+    depth           int32   0 for a root
+    child_offsets   int64   children of node i are children[child_offsets[i]:child_offsets[i + 1]]
+    children        int32   child nodes in constructor order, -1 for an absent optional child
+    list_length     int32   length of the node's child list (at most one per class), else 0
+    name            int32   index into ``names`` of the node's name or operator, else -1
+    int_value       int64   value of an ``IntLiteral``, else 0
+    float_value     float64 value of a ``FloatLiteral``, else 0.0
+    string          int32   index into ``strings`` of a ``StringLiteral`` value, else -1
+
+Questions about a whole corpus then become array expressions, e.g.
+``np.bincount(ast.kind)`` or ``ast.count(FuncCall, "printInt")``.
+``to_tree`` rebuilds the ``nodes.py`` objects. The kinds are numbered like
+the tags of ``binary_ast`` (minus one). NumPy is only needed by this module.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("src.utils.columnar needs NumPy (pip install numpy)") from e
+
+from .binary_ast import _CLASSES, _FLOAT, _INT, _NAME, _NODE, _NODES, _SCHEMA, _STRING
+from .nodes import ASTNode
+
+# Node classes by kind number.
+KINDS = _CLASSES
+_KIND_OF = {cls: kind for kind, cls in enumerate(KINDS)}
+
+_COLUMNS = {
+    "kind": np.uint8, "parent": np.int32, "depth": np.int32, "child_offsets": np.int64,
+    "children": np.int32, "list_length": np.int32, "name": np.int32,
+    "int_value": np.int64, "float_value": np.float64, "string": np.int32,
+}
+
+
+class ColumnarAST:
+    """A forest of ASTs stored column by column; see the module docstring."""
+
+    def __init__(self, names: List[str], strings: List[str], **columns: np.ndarray):
+        self.names = names
+        self.strings = strings
+        for column, dtype in _COLUMNS.items():
+            setattr(self, column, np.asarray(columns[column], dtype=dtype))
+        self._name_index = {name: index for index, name in enumerate(names)}
+
+    def __len__(self) -> int:
+        """Number of nodes."""
+        return len(self.kind)
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_tree(cls, tree: ASTNode) -> "ColumnarAST":
+        return cls.from_trees([tree])
+
+    @classmethod
+    def from_trees(cls, trees: Iterable[ASTNode]) -> "ColumnarAST":
+        """Columns of ``trees``, one after the other."""
+        names: Dict[str, int] = {}
+        strings: Dict[str, int] = {}
+        kind, parent, depth, offsets, children = [], [], [], [0], []
+        list_length, name, int_value, float_value, string = [], [], [], [], []
+        for tree in trees:
+            # (node, parent index, its slot in ``children``); the slot of
+            # a child is only known once the parent has been numbered.
+            stack = [(tree, -1, -1)]
+            while stack:
+                node, up, slot = stack.pop()
+                index = len(kind)
+                if slot >= 0:
+                    children[slot] = index
+                node_class = node.__class__
+                kind.append(_KIND_OF[node_class])
+                parent.append(up)
+                depth.append(depth[up] + 1 if up >= 0 else 0)
+                length, name_index, number, real, text = 0, -1, 0, 0.0, -1
+                pending = []
+                for field, field_kind in _SCHEMA[node_class]:
+                    value = getattr(node, field)
+                    if field_kind == _NODE:
+                        if value is not None:
+                            pending.append((value, len(children)))
+                        children.append(-1)
+                    elif field_kind == _NODES:
+                        length = len(value)
+                        for child in value:
+                            pending.append((child, len(children)))
+                            children.append(-1)
+                    elif field_kind == _NAME:
+                        name_index = names.setdefault(value, len(names))
+                    elif field_kind == _STRING:
+                        text = strings.setdefault(value, len(strings))
+                    elif field_kind == _INT:
+                        number = value
+                    elif field_kind == _FLOAT:
+                        real = value
+                offsets.append(len(children))
+                list_length.append(length)
+                name.append(name_index)
+                int_value.append(number)
+                float_value.append(real)
+                string.append(text)
+                stack.extend((child, index, child_slot) for child, child_slot in reversed(pending))
+        return cls(
+            list(names), list(strings), kind=kind, parent=parent, depth=depth, child_offsets=offsets,
+            children=children, list_length=list_length, name=name, int_value=int_value,
+            float_value=float_value, string=string,
+        )
+
+    @property
+    def roots(self) -> np.ndarray:
+        """Indices of the root of every tree."""
+        return np.flatnonzero(self.parent == -1)
+
+    def to_trees(self) -> List[ASTNode]:
+        """All trees as ``nodes.py`` objects."""
+        built = self._build(0, len(self))
+        return [built[root] for root in self.roots.tolist()]
+
+    def to_tree(self, tree: int = 0) -> ASTNode:
+        """The ``tree``-th tree as ``nodes.py`` objects."""
+        roots = self.roots.tolist()
+        start = roots[tree]
+        stop = roots[tree + 1] if tree + 1 < len(roots) else len(self)
+        return self._build(start, stop)[start]
+
+    def _build(self, start: int, stop: int) -> Dict[int, ASTNode]:
+        # In pre-order every child comes after its parent, so building
+        # back to front finds the children of each node already built.
+        kind, offsets, children = self.kind.tolist(), self.child_offsets.tolist(), self.children.tolist()
+        list_length, name = self.list_length.tolist(), self.name.tolist()
+        int_value, float_value, string = self.int_value.tolist(), self.float_value.tolist(), self.string.tolist()
+        names, strings = self.names, self.strings
+        built: Dict[int, Optional[ASTNode]] = {-1: None}
+        for index in range(stop - 1, start - 1, -1):
+            node_class = KINDS[kind[index]]
+            position = offsets[index]
+            args = []
+            for _, field_kind in _SCHEMA[node_class]:
+                if field_kind == _NODE:
+                    args.append(built[children[position]])
+                    position += 1
+                elif field_kind == _NODES:
+                    end = position + list_length[index]
+                    args.append([built[child] for child in children[position:end]])
+                    position = end
+                elif field_kind == _NAME:
+                    args.append(names[name[index]])
+                elif field_kind == _STRING:
+                    args.append(strings[string[index]])
+                elif field_kind == _INT:
+                    args.append(int_value[index])
+                else:
+                    args.append(float_value[index])
+            built[index] = node_class(*args)
+        return built
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def mask(self, node_class: type, name: Optional[str] = None) -> np.ndarray:
+        """Boolean column: which nodes are of ``node_class`` (with the given
+        name or operator)."""
+        mask = self.kind == _KIND_OF[node_class]
+        if name is not None:
+            mask &= self.name == self._name_index.get(name, -2)
+        return mask
+
+    def count(self, node_class: type, name: Optional[str] = None) -> int:
+        """Number of nodes of ``node_class`` (with the given name or operator)."""
+        return int(np.count_nonzero(self.mask(node_class, name)))
+
+    def tree_of(self, nodes: np.ndarray) -> np.ndarray:
+        """Index of the tree that holds each of ``nodes``."""
+        return np.searchsorted(self.roots, nodes, side="right") - 1
+
+    def kind_histogram(self) -> Dict[str, int]:
+        """Number of nodes of each class present, by class name."""
+        counts = np.bincount(self.kind, minlength=len(KINDS))
+        return {KINDS[kind].__name__: int(counts[kind]) for kind in np.flatnonzero(counts)}
+
+    def max_depth(self) -> int:
+        """Depth of the deepest node (a lone root has depth 0)."""
+        return int(self.depth.max()) if len(self) else 0
@@ -0,0 +1,150 @@
+"""
+Structural hashing, structural equality and hash-consing of TyC ASTs.
+Two trees are structurally equal when they have the same node classes in
+the same shape with equal field values; ``line`` and ``column`` are left
+out. ``structural_hash`` caches its result in every node it covers, so
+hashing a tree again, or any subtree of a hashed tree, is O(1), and
+``structurally_equal`` rejects trees with different cached hashes right
+away. Nodes are mutable: a tree that changes after it has been hashed
+keeps its old hash, so hash trees once they are built.
+
+``HashConser`` goes further and makes equal subtrees one object, after
+which comparing them is a plain ``is``.
+
+Everything here keeps an explicit stack, so trees of any depth work.
+"""
+
+import zlib
+from typing import Dict, List, Tuple
+
+from .nodes import ASTNode, Expr
+from .schema import _VALUES, child_nodes as _children, fields
+
+# Hashes of class names, field strings and ``None`` are computed with
+# crc32 rather than ``hash``, which is salted per process for strings,
+# so a cached hash stays valid in a pickle sent to another process.
+_NONE_HASH = 0x4E4F4E45
+_CLASS_HASHES: Dict[type, int] = {}
+
+
+def _own_hash(node: ASTNode) -> int:
+    """Hash of ``node`` from its values and the cached hashes of its children."""
+    cls = node.__class__
+    class_hash = _CLASS_HASHES.get(cls)
+    if class_hash is None:
+        class_hash = _CLASS_HASHES[cls] = zlib.crc32(cls.__qualname__.encode())
+    key = [class_hash]
+    for name in fields(cls):
+        value = getattr(node, name)
+        value_class = value.__class__
+        if value_class is str:
+            key.append(zlib.crc32(value.encode("utf-8", "surrogatepass")))
+        elif value_class is list:
+            key.append(hash(tuple(child._hash for child in value)))
+        elif value is None:
+            key.append(_NONE_HASH)
+        elif value_class in _VALUES:
+            key.append(hash(value))
+        else:
+            key.append(value._hash)
+    return hash(tuple(key))
+
+
+def structural_hash(node: ASTNode) -> int:
+    """Hash of the tree under ``node`` that agrees with ``structurally_equal``."""
+    if node._hash is not None:
+        return node._hash
+    order = [node]
+    for current in order:  # breadth-first: every node before its children
+        order.extend(child for child in _children(current) if child._hash is None)
+    for current in reversed(order):
+        if current._hash is None:  # not a shared subtree hashed already
+            current._hash = _own_hash(current)
+    return node._hash
+
+
+def structurally_equal(a: ASTNode, b: ASTNode) -> bool:
+    """Whether the trees under ``a`` and ``b`` have the same shape and values."""
+    stack = [(a, b)]
+    while stack:
+        a, b = stack.pop()
+        if a is b:
+            continue
+        cls = a.__class__
+        if b.__class__ is not cls:
+            return False
+        if a._hash is not None and b._hash is not None and a._hash != b._hash:
+            return False
+        for name in fields(cls):
+            x, y = getattr(a, name), getattr(b, name)
+            if x.__class__ is list:
+                if y.__class__ is not list or len(x) != len(y):
+                    return False
+                stack.extend(zip(x, y))
+            elif x.__class__ in _VALUES or y.__class__ in _VALUES:
+                if x != y:
+                    return False
+            else:
+                stack.append((x, y))
+    return True
+
+
+class HashConser:
+    """Hash-consing: builds trees in which structurally equal subtrees of
+    the given kinds (expressions by default) are one shared object.
+
+    A shared node stands for every place its subtree occurs, so it keeps
+    the position of the first occurrence and must not be changed in place.
+    One ``HashConser`` can be used for several trees, which then share
+    subtrees with each other.
+    """
+
+    def __init__(self, kinds: Tuple[type, ...] = (Expr,)):
+        self.kinds = kinds
+        # (class, field values with children by id) -> shared node
+        self._table: Dict[tuple, ASTNode] = {}
+
+    def __len__(self) -> int:
+        """Number of distinct shared nodes."""
+        return len(self._table)
+
+    def _key(self, node: ASTNode) -> tuple:
+        key: List = [node.__class__]
+        for name in fields(node.__class__):
+            value = getattr(node, name)
+            if value.__class__ is list:
+                key.append(tuple(map(id, value)))
+            elif value.__class__ in _VALUES:
+                key.append(value)
+            else:
+                key.append(id(value))
+        return tuple(key)
+
+    def make(self, cls: type, *args) -> ASTNode:
+        """``cls(*args)``, or the shared node equal to it. Node arguments
+        must come from this ``HashConser``."""
+        return self._share(cls(*args))
+
+    def _share(self, node: ASTNode) -> ASTNode:
+        if not isinstance(node, self.kinds):
+            return node
+        return self._table.setdefault(self._key(node), node)
+
+    def share(self, tree: ASTNode) -> ASTNode:
+        """Rewrite ``tree`` in place so that equal subtrees are shared and
+        return its root (a shared node if the root itself is of a shared kind)."""
+        order = [tree]
+        for node in order:  # breadth-first: every node before its children
+            order.extend(_children(node))
+        shared = {}
+        for node in reversed(order):
+            if id(node) in shared:
+                continue
+            for name in fields(node.__class__):
+                value = getattr(node, name)
+                if value.__class__ is list:
+                    value[:] = [shared[id(child)] for child in value]
+                elif value.__class__ not in _VALUES:
+                    setattr(node, name, shared[id(value)])
+            shared[id(node)] = self._share(node)
+        return shared[id(tree)]
@@ -2,9 +2,23 @@
 AST Node classes for TyC programming language.
 This module defines all the AST node types used to represent
 the abstract syntax tree for TyC programs.
+
+Every class declares ``__slots__``, so nodes carry no per-instance
+``__dict__``; a subclass that adds attributes has to list them in its own
+``__slots__`` to stay that way.
+
+Type nodes are flyweights (one shared object per distinct type) and the
+identifier names stored in nodes are interned with ``sys.intern``, so
+passes can compare both with ``is``.
+
+``_child_fields`` and ``_list_fields`` say which fields of each class are
+children; ``schema.py`` builds generic iteration, copying and replacing
+on them.
 """
 
 from abc import ABC, abstractmethod
+from sys import intern
+from weakref import WeakValueDictionary
 from typing import Any, List, Optional, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -14,9 +28,23 @@ if TYPE_CHECKING:
 class ASTNode(ABC):
     """Base class for all AST nodes."""
 
+    __slots__ = ("line", "column", "_hash")
+    # Which of the fields of a class (its ``__slots__`` below this class)
+    # hold a child node (or None) and which a list of child nodes; the rest
+    # are plain values. A subclass that adds fields declares them again.
+    _child_fields = ()
+    _list_fields = ()
+
     def __init__(self):
         self.line = None
         self.column = None
+        self._hash = None  # cached by ``structural_hash``
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        from .visitor import _node_class_added
+
+        _node_class_added(cls)  # keep the visitors' dispatch tables complete
 
     @abstractmethod
     def accept(self, visitor: "ASTVisitor", o: Any = None):
@@ -24,8 +52,32 @@ class ASTNode(ABC):
         pass
 
     def __str__(self):
-        """Default string representation."""
-        return f"{self.__class__.__name__}()"
+        """Text form of the tree, written by ``serializer.render`` in one pass."""
+        from .serializer import render
+
+        return render(self)
+
+    def structural_hash(self) -> int:
+        """Hash of the tree's shape and values (positions left out), cached
+        in every node it covers; see ``hashing.structural_hash``."""
+        from .hashing import structural_hash
+
+        return structural_hash(self)
+
+    def structurally_equal(self, other: "ASTNode") -> bool:
+        """Whether ``other`` is a tree of the same shape and values."""
+        from .hashing import structurally_equal
+
+        return structurally_equal(self, other)
+
+    def _parts(self) -> tuple:
+        """The text of ``str(self)`` as strings, child nodes and lists of
+        child nodes (printed comma-separated), in order.
+
+        The serializer expands children in place, so ``__str__`` does not
+        recurse; subclasses describe their format here.
+        """
+        return (f"{self.__class__.__name__}()",)
 
 
 # ============================================================================
@@ -36,6 +88,9 @@ class ASTNode(ABC):
 class Program(ASTNode):
     """Root node representing the entire TyC program."""
 
+    __slots__ = ("decls",)
+    _list_fields = ("decls",)
+
     def __init__(self, decls: List["Decl"]):
         super().__init__()
         self.decls = decls
@@ -43,50 +98,58 @@ class Program(ASTNode):
     def accept(self, visitor, o=None):
         return visitor.visit_program(self, o)
 
-    def __str__(self):
-        decls_str = ", ".join(str(d) for d in self.decls) if self.decls else ""
-        return f"Program([{decls_str}])"
+    def _parts(self):
+        return ("Program([", self.decls, "])")
 
 
 class Decl(ASTNode):
     """Base class for declarations (struct or function)."""
-    pass
+    __slots__ = ()
 
 
 class StructDecl(Decl):
     """Struct declaration node."""
 
+    __slots__ = ("name", "members")
+    _list_fields = ("members",)
+
     def __init__(self, name: str, members: List["MemberDecl"]):
         super().__init__()
-        self.name = name
+        self.name = intern(name)
         self.members = members
 
     def accept(self, visitor, o=None):
         return visitor.visit_struct_decl(self, o)
 
-    def __str__(self):
-        members_str = ", ".join(str(m) for m in self.members) if self.members else ""
-        return f"StructDecl({self.name}, [{members_str}])"
+    def _parts(self):
+        return (f"StructDecl({self.name}, [", self.members, "])")
 
 
 class MemberDecl(ASTNode):
     """Struct member declaration node."""
 
+    __slots__ = ("member_type", "name")
+    _child_fields = ("member_type",)
+
     def __init__(self, member_type: "Type", name: str):
         super().__init__()
         self.member_type = member_type
-        self.name = name
+        self.name = intern(name)
 
     def accept(self, visitor, o=None):
         return visitor.visit_member_decl(self, o)
 
-    def __str__(self):
-        return f"MemberDecl({self.member_type}, {self.name})"
+    def _parts(self):
+        return ("MemberDecl(", self.member_type, f", {self.name})")
 
 
 class FuncDecl(Decl):
     """Function declaration node."""
 
+    __slots__ = ("return_type", "name", "params", "body")
+    _child_fields = ("return_type", "body")
+    _list_fields = ("params",)
+
     def __init__(
         self,
         return_type: Optional["Type"],
@@ -96,32 +159,34 @@ class FuncDecl(Decl):
     ):
         super().__init__()
         self.return_type = return_type
-        self.name = name
+        self.name = intern(name)
         self.params = params
         self.body = body
 
     def accept(self, visitor, o=None):
         return visitor.visit_func_decl(self, o)
 
-    def __str__(self):
-        return_type_str = str(self.return_type) if self.return_type else "auto"
-        params_str = ", ".join(str(p) for p in self.params) if self.params else ""
-        return f"FuncDecl({return_type_str}, {self.name}, [{params_str}], {self.body})"
+    def _parts(self):
+        return_type = self.return_type if self.return_type else "auto"
+        return ("FuncDecl(", return_type, f", {self.name}, [", self.params, "], ", self.body, ")")
 
 
 class Param(ASTNode):
     """Function parameter node."""
 
+    __slots__ = ("param_type", "name")
+    _child_fields = ("param_type",)
+
     def __init__(self, param_type: "Type", name: str):
         super().__init__()
         self.param_type = param_type
-        self.name = name
+        self.name = intern(name)
 
     def accept(self, visitor, o=None):
         return visitor.visit_param(self, o)
 
-    def __str__(self):
-        return f"Param({self.param_type}, {self.name})"
+    def _parts(self):
+        return ("Param(", self.param_type, f", {self.name})")
 
 
 # ============================================================================
@@ -130,74 +195,118 @@ class Param(ASTNode):
 
 
 class Type(ASTNode):
-    """Base class for type annotations."""
-    pass
+    """Base class for type annotations.
+
+    Constructing a type returns the one node of that type built so far
+    (``IntType() is IntType()``, ``StructType("P") is StructType("P")``).
+    Shared nodes appear at many places in a tree, so they carry no position.
+    The table of shared nodes holds them weakly: a struct type no live tree
+    uses any more is dropped, so long runs over many programs do not keep
+    every struct name ever seen.
+    """
+    __slots__ = ("__weakref__",)
+
+    # (class, *constructor arguments) -> the shared node
+    _instances = WeakValueDictionary()
+    # Types without arguments (``IntType``...): a handful, kept for good
+    # in a plain dict, which is also quicker to look up.
+    _primitives = {}
+
+    def __new__(cls, *args):
+        if not args:
+            node = Type._primitives.get(cls)
+            if node is None:
+                node = Type._primitives[cls] = super().__new__(cls)
+            return node
+        key = (cls, *args)
+        node = Type._instances.get(key)
+        if node is None:
+            node = Type._instances[key] = super().__new__(cls)
+        return node
 
 
 class IntType(Type):
     """Integer type node."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_int_type(self, o)
 
-    def __str__(self):
-        return "IntType()"
+    def _parts(self):
+        return ("IntType()",)
 
 
 class FloatType(Type):
     """Float type node."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_float_type(self, o)
 
-    def __str__(self):
-        return "FloatType()"
+    def _parts(self):
+        return ("FloatType()",)
 
 
 class StringType(Type):
     """String type node."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_string_type(self, o)
 
-    def __str__(self):
-        return "StringType()"
+    def _parts(self):
+        return ("StringType()",)
 
 
 class VoidType(Type):
     """Void type node."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_void_type(self, o)
 
-    def __str__(self):
-        return "VoidType()"
+    def _parts(self):
+        return ("VoidType()",)
 
 
 class StructType(Type):
     """Struct type node."""
 
+    __slots__ = ("struct_name",)
+    _child_fields = ()
+
+    def __new__(cls, struct_name: str):
+        return super().__new__(cls, intern(struct_name))
+
     def __init__(self, struct_name: str):
         super().__init__()
-        self.struct_name = struct_name
+        self.struct_name = intern(struct_name)
+
+    def __getnewargs__(self):
+        # Unpickling and copying go through ``__new__`` and get the shared node.
+        return (self.struct_name,)
 
     def accept(self, visitor, o=None):
         return visitor.visit_struct_type(self, o)
 
-    def __str__(self):
-        return f"StructType({self.struct_name})"
+    def _parts(self):
+        return (f"StructType({self.struct_name})",)
 
 
 # ============================================================================
@@ -207,12 +316,15 @@ class StructType(Type):
 
 class Stmt(ASTNode):
     """Base class for all statement nodes."""
-    pass
+    __slots__ = ()
 
 
 class BlockStmt(Stmt):
     """Block statement containing statements."""
 
+    __slots__ = ("statements",)
+    _list_fields = ("statements",)
+
     def __init__(self, statements: List[Stmt]):
         super().__init__()
         self.statements = statements
@@ -220,9 +332,8 @@ class BlockStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_block_stmt(self, o)
 
-    def __str__(self):
-        stmts_str = ", ".join(str(s) for s in self.statements) if self.statements else ""
-        return f"BlockStmt([{stmts_str}])"
+    def _parts(self):
+        return ("BlockStmt([", self.statements, "])")
 
 
 class VarDecl(Stmt):
@@ -230,6 +341,9 @@ class VarDecl(Stmt):
     If var_type is None, it means 'auto' (type inference).
     """
 
+    __slots__ = ("var_type", "name", "init_value")
+    _child_fields = ("var_type", "init_value")
+
     def __init__(
         self,
         var_type: Optional["Type"],
@@ -238,21 +352,24 @@ class VarDecl(Stmt):
     ):
         super().__init__()
         self.var_type = var_type  # None means 'auto'
-        self.name = name
+        self.name = intern(name)
         self.init_value = init_value
 
     def accept(self, visitor, o=None):
         return visitor.visit_var_decl(self, o)
 
-    def __str__(self):
-        type_str = "auto" if self.var_type is None else str(self.var_type)
-        init_str = f" = {self.init_value}" if self.init_value else ""
-        return f"VarDecl({type_str}, {self.name}{init_str})"
+    def _parts(self):
+        var_type = "auto" if self.var_type is None else self.var_type
+        init = (" = ", self.init_value) if self.init_value else ()
+        return ("VarDecl(", var_type, f", {self.name}", *init, ")")
 
 
 class IfStmt(Stmt):
     """If statement."""
 
+    __slots__ = ("condition", "then_stmt", "else_stmt")
+    _child_fields = ("condition", "then_stmt", "else_stmt")
+
     def __init__(
         self, condition: "Expr", then_stmt: Stmt, else_stmt: Optional[Stmt] = None
     ):
@@ -264,14 +381,17 @@ class IfStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_if_stmt(self, o)
 
-    def __str__(self):
-        else_str = f", else {self.else_stmt}" if self.else_stmt else ""
-        return f"IfStmt(if {self.condition} then {self.then_stmt}{else_str})"
+    def _parts(self):
+        else_part = (", else ", self.else_stmt) if self.else_stmt else ()
+        return ("IfStmt(if ", self.condition, " then ", self.then_stmt, *else_part, ")")
 
 
 class WhileStmt(Stmt):
     """While statement."""
 
+    __slots__ = ("condition", "body")
+    _child_fields = ("condition", "body")
+
     def __init__(self, condition: "Expr", body: Stmt):
         super().__init__()
         self.condition = condition
@@ -280,13 +400,16 @@ class WhileStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_while_stmt(self, o)
 
-    def __str__(self):
-        return f"WhileStmt(while {self.condition} do {self.body})"
+    def _parts(self):
+        return ("WhileStmt(while ", self.condition, " do ", self.body, ")")
 
 
 class ForStmt(Stmt):
     """For statement."""
 
+    __slots__ = ("init", "condition", "update", "body")
+    _child_fields = ("init", "condition", "update", "body")
+
     def __init__(
         self,
         init: Optional[Union["VarDecl", "ExprStmt"]],
@@ -303,16 +426,20 @@ class ForStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_for_stmt(self, o)
 
-    def __str__(self):
-        init_str = str(self.init) if self.init else "None"
-        cond_str = str(self.condition) if self.condition else "None"
-        update_str = str(self.update) if self.update else "None"
-        return f"ForStmt(for {init_str}; {cond_str}; {update_str} do {self.body})"
+    def _parts(self):
+        init = self.init if self.init else "None"
+        condition = self.condition if self.condition else "None"
+        update = self.update if self.update else "None"
+        return ("ForStmt(for ", init, "; ", condition, "; ", update, " do ", self.body, ")")
 
 
 class SwitchStmt(Stmt):
     """Switch statement."""
 
+    __slots__ = ("expr", "cases", "default_case")
+    _child_fields = ("expr", "default_case")
+    _list_fields = ("cases",)
+
     def __init__(
         self,
         expr: "Expr",
@@ -327,15 +454,18 @@ class SwitchStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_switch_stmt(self, o)
 
-    def __str__(self):
-        cases_str = ", ".join(str(c) for c in self.cases) if self.cases else ""
-        default_str = f", default {self.default_case}" if self.default_case else ""
-        return f"SwitchStmt(switch {self.expr} cases [{cases_str}]{default_str})"
+    def _parts(self):
+        default = (", default ", self.default_case) if self.default_case else ()
+        return ("SwitchStmt(switch ", self.expr, " cases [", self.cases, "]", *default, ")")
 
 
 class CaseStmt(ASTNode):
     """Case statement in switch."""
 
+    __slots__ = ("expr", "statements")
+    _child_fields = ("expr",)
+    _list_fields = ("statements",)
+
     def __init__(self, expr: "Expr", statements: List[Stmt]):
         super().__init__()
         self.expr = expr
@@ -344,14 +474,16 @@ class CaseStmt(ASTNode):
     def accept(self, visitor, o=None):
         return visitor.visit_case_stmt(self, o)
 
-    def __str__(self):
-        stmts_str = ", ".join(str(s) for s in self.statements) if self.statements else ""
-        return f"CaseStmt(case {self.expr}: [{stmts_str}])"
+    def _parts(self):
+        return ("CaseStmt(case ", self.expr, ": [", self.statements, "])")
 
 
 class DefaultStmt(ASTNode):
     """Default statement in switch."""
 
+    __slots__ = ("statements",)
+    _list_fields = ("statements",)
+
     def __init__(self, statements: List[Stmt]):
         super().__init__()
         self.statements = statements
@@ -359,40 +491,46 @@ class DefaultStmt(ASTNode):
     def accept(self, visitor, o=None):
         return visitor.visit_default_stmt(self, o)
 
-    def __str__(self):
-        stmts_str = ", ".join(str(s) for s in self.statements) if self.statements else ""
-        return f"DefaultStmt(default: [{stmts_str}])"
+    def _parts(self):
+        return ("DefaultStmt(default: [", self.statements, "])")
 
 
 class BreakStmt(Stmt):
     """Break statement."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_break_stmt(self, o)
 
-    def __str__(self):
-        return "BreakStmt()"
+    def _parts(self):
+        return ("BreakStmt()",)
 
 
 class ContinueStmt(Stmt):
     """Continue statement."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_continue_stmt(self, o)
 
-    def __str__(self):
-        return "ContinueStmt()"
+    def _parts(self):
+        return ("ContinueStmt()",)
 
 
 class ReturnStmt(Stmt):
     """Return statement."""
 
+    __slots__ = ("expr",)
+    _child_fields = ("expr",)
+
     def __init__(self, expr: Optional["Expr"] = None):
         super().__init__()
         self.expr = expr
@@ -400,14 +538,17 @@ class ReturnStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_return_stmt(self, o)
 
-    def __str__(self):
-        expr_str = f" {self.expr}" if self.expr else ""
-        return f"ReturnStmt(return{expr_str})"
+    def _parts(self):
+        expr = (" ", self.expr) if self.expr else ()
+        return ("ReturnStmt(return", *expr, ")")
 
 
 class ExprStmt(Stmt):
     """Expression statement."""
 
+    __slots__ = ("expr",)
+    _child_fields = ("expr",)
+
     def __init__(self, expr: "Expr"):
         super().__init__()
         self.expr = expr
@@ -415,8 +556,8 @@ class ExprStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_expr_stmt(self, o)
 
-    def __str__(self):
-        return f"ExprStmt({self.expr})"
+    def _parts(self):
+        return ("ExprStmt(", self.expr, ")")
 
 
 # ============================================================================
@@ -426,12 +567,15 @@ class ExprStmt(Stmt):
 
 class Expr(ASTNode):
     """Base class for all expression nodes."""
-    pass
+    __slots__ = ()
 
 
 class BinaryOp(Expr):
     """Binary operation expression."""
 
+    __slots__ = ("left", "operator", "right")
+    _child_fields = ("left", "right")
+
     def __init__(self, left: Expr, operator: str, right: Expr):
         super().__init__()
         self.left = left
@@ -441,13 +585,16 @@ class BinaryOp(Expr):
     def accept(self, visitor, o=None):
         return visitor.visit_binary_op(self, o)
 
-    def __str__(self):
-        return f"BinaryOp({self.left}, {self.operator}, {self.right})"
+    def _parts(self):
+        return ("BinaryOp(", self.left, f", {self.operator}, ", self.right, ")")
 
 
 class PrefixOp(Expr):
     """Prefix unary operation expression (++x, --x, +x, -x, !x)."""
 
+    __slots__ = ("operator", "operand")
+    _child_fields = ("operand",)
+
     def __init__(self, operator: str, operand: Expr):
         super().__init__()
         self.operator = operator  # '++', '--', '+', '-', '!'
@@ -456,13 +603,16 @@ class PrefixOp(Expr):
     def accept(self, visitor, o=None):
         return visitor.visit_prefix_op(self, o)
 
-    def __str__(self):
-        return f"PrefixOp({self.operator}{self.operand})"
+    def _parts(self):
+        return (f"PrefixOp({self.operator}", self.operand, ")")
 
 
 class PostfixOp(Expr):
     """Postfix unary operation expression (x++, x--)."""
 
+    __slots__ = ("operator", "operand")
+    _child_fields = ("operand",)
+
     def __init__(self, operator: str, operand: Expr):
         super().__init__()
         self.operator = operator  # '++', '--'
@@ -471,8 +621,8 @@ class PostfixOp(Expr):
     def accept(self, visitor, o=None):
         return visitor.visit_postfix_op(self, o)
 
-    def __str__(self):
-        return f"PostfixOp({self.operand}{self.operator})"
+    def _parts(self):
+        return ("PostfixOp(", self.operand, f"{self.operator})")
 
 
 class AssignExpr(Expr):
@@ -480,6 +630,9 @@ class AssignExpr(Expr):
     lhs can be Identifier or MemberAccess.
     """
 
+    __slots__ = ("lhs", "rhs")
+    _child_fields = ("lhs", "rhs")
+
     def __init__(self, lhs: "Expr", rhs: "Expr"):
         super().__init__()
         self.lhs = lhs  # Identifier or MemberAccess
@@ -488,8 +641,8 @@ class AssignExpr(Expr):
     def accept(self, visitor, o=None):
         return visitor.visit_assign_expr(self, o)
 
-    def __str__(self):
-        return f"AssignExpr({self.lhs} = {self.rhs})"
+    def _parts(self):
+        return ("AssignExpr(", self.lhs, " = ", self.rhs, ")")
 
 
 class MemberAccess(Expr):
@@ -498,51 +651,62 @@ class MemberAccess(Expr):
     Can be nested: MemberAccess(MemberAccess(obj, "member1"), "member2")
     """
 
+    __slots__ = ("obj", "member")
+    _child_fields = ("obj",)
+
     def __init__(self, obj: Expr, member: str):
         super().__init__()
         self.obj = obj
-        self.member = member
+        self.member = intern(member)
 
     def accept(self, visitor, o=None):
         return visitor.visit_member_access(self, o)
 
-    def __str__(self):
-        return f"MemberAccess({self.obj}.{self.member})"
+    def _parts(self):
+        return ("MemberAccess(", self.obj, f".{self.member})")
 
 
 class FuncCall(Expr):
     """Function call expression."""
 
+    __slots__ = ("name", "args")
+    _list_fields = ("args",)
+
     def __init__(self, name: str, args: List[Expr]):
         super().__init__()
-        self.name = name
+        self.name = intern(name)
         self.args = args
 
     def accept(self, visitor, o=None):
         return visitor.visit_func_call(self, o)
 
-    def __str__(self):
-        args_str = ", ".join(str(arg) for arg in self.args) if self.args else ""
-        return f"FuncCall({self.name}, [{args_str}])"
+    def _parts(self):
+        return (f"FuncCall({self.name}, [", self.args, "])")
 
 
 class Identifier(Expr):
     """Identifier expression."""
 
+    __slots__ = ("name",)
+    _child_fields = ()
+
     def __init__(self, name: str):
         super().__init__()
-        self.name = name
+        self.name = intern(name)
 
     def accept(self, visitor, o=None):
         return visitor.visit_identifier(self, o)
 
-    def __str__(self):
-        return f"Identifier({self.name})"
+    def _parts(self):
+        return (f"Identifier({self.name})",)
 
 
 class StructLiteral(Expr):
     """Struct literal expression (initialization with {})."""
 
+    __slots__ = ("values",)
+    _list_fields = ("values",)
+
     def __init__(self, values: List[Expr]):
         super().__init__()
         self.values = values
@@ -550,9 +714,8 @@ class StructLiteral(Expr):
     def accept(self, visitor, o=None):
         return visitor.visit_struct_literal(self, o)
 
-    def __str__(self):
-        values_str = ", ".join(str(v) for v in self.values) if self.values else ""
-        return f"StructLiteral({{{values_str}}})"
+    def _parts(self):
+        return ("StructLiteral({", self.values, "})")
 
 
 # ============================================================================
@@ -563,6 +726,9 @@ class StructLiteral(Expr):
 class Literal(Expr):
     """Base class for literal expressions."""
 
+    __slots__ = ("value",)
+    _child_fields = ()
+
     def __init__(self, value: Any):
         super().__init__()
         self.value = value
@@ -571,37 +737,43 @@ class Literal(Expr):
 class IntLiteral(Literal):
     """Integer literal expression."""
 
+    __slots__ = ()
+
     def __init__(self, value: int):
         super().__init__(value)
 
     def accept(self, visitor, o=None):
         return visitor.visit_int_literal(self, o)
 
-    def __str__(self):
-        return f"IntLiteral({self.value})"
+    def _parts(self):
+        return (f"IntLiteral({self.value})",)
 
 
 class FloatLiteral(Literal):
     """Float literal expression."""
 
+    __slots__ = ()
+
     def __init__(self, value: float):
         super().__init__(value)
 
     def accept(self, visitor, o=None):
         return visitor.visit_float_literal(self, o)
 
-    def __str__(self):
-        return f"FloatLiteral({self.value})"
+    def _parts(self):
+        return (f"FloatLiteral({self.value})",)
 
 
 class StringLiteral(Literal):
     """String literal expression."""
 
+    __slots__ = ()
+
     def __init__(self, value: str):
         super().__init__(value)
 
     def accept(self, visitor, o=None):
         return visitor.visit_string_literal(self, o)
 
-    def __str__(self):
-        return f"StringLiteral({self.value!r})"
+    def _parts(self):
+        return (f"StringLiteral({self.value!r})",)
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""
+Field schema of TyC AST node classes.
+The fields of a node class are its ``__slots__`` below ``ASTNode``, in
+constructor order. Each class says which of them are children:
+``_child_fields`` hold a node (or None for an absent optional child),
+``_list_fields`` a list of nodes, and every other field is a plain value
+(a name, an operator, a literal's value). Generic code reads that once per
+class here instead of spelling out every class by hand:
+
+    child_fields(BinaryOp)      ('left', 'right')
+    value_fields(BinaryOp)      ('operator',)
+    child_nodes(node)           the children of ``node`` in order
+    replace(node, right=other)  a new ``BinaryOp`` with one field changed
+
+Node classes from elsewhere that add fields without declaring them still
+work: their fields are then told apart by looking at the values.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from .nodes import ASTNode, Type
+
+# Slots that are not part of a node's structure.
+_NOT_FIELDS = frozenset((*ASTNode.__slots__, "__weakref__"))
+_FIELDS: Dict[type, Tuple[str, ...]] = {}
+# class -> (child fields, list fields, value fields), each in constructor order
+_KINDS: Dict[type, Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]] = {}
+_GETTERS: Dict[type, Callable[[ASTNode], List[ASTNode]]] = {}
+_DECLARED: Dict[type, bool] = {}
+# Classes of the plain field values. A field holds one of these, a list
+# of nodes or a node; testing ``isinstance(value, ASTNode)`` instead goes
+# through ``ABCMeta.__instancecheck__`` and is several times slower.
+_VALUES = frozenset((str, int, float, bool, type(None)))
+
+
+def fields(cls: type) -> Tuple[str, ...]:
+    """Names of the structural fields of a node class, in constructor order."""
+    names = _FIELDS.get(cls)
+    if names is None:
+        names = _FIELDS[cls] = tuple(
+            name for klass in reversed(cls.__mro__)
+            for name in vars(klass).get("__slots__", ()) if name not in _NOT_FIELDS
+        )
+    return names
+
+
+def declares_fields(cls: type) -> bool:
+    """Whether the kinds of all fields of ``cls`` are declared: some class
+    at or above it declares them and no class in between adds fields."""
+    declared = _DECLARED.get(cls)
+    if declared is None:
+        declared = False
+        for klass in cls.__mro__:
+            names = vars(klass)
+            if "_child_fields" in names or "_list_fields" in names:
+                declared = True
+                break
+            if any(name not in _NOT_FIELDS for name in names.get("__slots__", ())):
+                break
+        _DECLARED[cls] = declared
+    return declared
+
+
+def _kinds(cls: type) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    kinds = _KINDS.get(cls)
+    if kinds is None:
+        if not declares_fields(cls):
+            raise TypeError(f"{cls.__name__} does not declare its child fields")
+        names = fields(cls)
+        children, lists = set(cls._child_fields), set(cls._list_fields)
+        kinds = _KINDS[cls] = (
+            tuple(name for name in names if name in children),
+            tuple(name for name in names if name in lists),
+            tuple(name for name in names if name not in children and name not in lists),
+        )
+    return kinds
+
+
+def child_fields(cls: type) -> Tuple[str, ...]:
+    """Fields of ``cls`` that hold one child node or None."""
+    return _kinds(cls)[0]
+
+
+def list_fields(cls: type) -> Tuple[str, ...]:
+    """Fields of ``cls`` that hold a list of child nodes."""
+    return _kinds(cls)[1]
+
+
+def value_fields(cls: type) -> Tuple[str, ...]:
+    """Fields of ``cls`` that hold a plain value."""
+    return _kinds(cls)[2]
+
+
+def iter_fields(node: ASTNode) -> Iterator[Tuple[str, Any]]:
+    """``(name, value)`` of every field of ``node``, in constructor order."""
+    for name in fields(node.__class__):
+        yield name, getattr(node, name)
+
+
+# ----------------------------------------------------------------------
+# Children
+# ----------------------------------------------------------------------
+
+def _no_children(node: ASTNode) -> List[ASTNode]:
+    return []
+
+
+def _inspected_children(node: ASTNode) -> List[ASTNode]:
+    # For classes that do not declare their child fields.
+    children = []
+    for name in fields(node.__class__):
+        value = getattr(node, name)
+        if value.__class__ is list:
+            children.extend(value)
+        elif value.__class__ not in _VALUES:
+            children.append(value)
+    return children
+
+
+def _children_getter(cls: type) -> Callable[[ASTNode], List[ASTNode]]:
+    if not declares_fields(cls):
+        get = _inspected_children
+    else:
+        singles, lists, _ = _kinds(cls)
+        layout = [(name, name in lists) for name in fields(cls) if name in singles or name in lists]
+        if not layout:
+            get = _no_children
+        elif len(layout) == 1:
+            value = attrgetter(layout[0][0])
+            if layout[0][1]:
+                def get(node):
+                    return list(value(node))
+            else:
+                def get(node):
+                    child = value(node)
+                    return [] if child is None else [child]
+        elif not lists:
+            values = attrgetter(*singles)
+
+            def get(node):
+                return [child for child in values(node) if child is not None]
+        else:
+            def get(node):
+                children = []
+                for name, is_list in layout:
+                    value = getattr(node, name)
+                    if is_list:
+                        children.extend(value)
+                    elif value is not None:
+                        children.append(value)
+                return children
+    _GETTERS[cls] = get
+    return get
+
+
+def child_nodes(node: ASTNode) -> List[ASTNode]:
+    """The children of ``node`` in constructor order, lists flattened and
+    absent optional children left out (a new list)."""
+    try:
+        get = _GETTERS[node.__class__]
+    except KeyError:
+        get = _children_getter(node.__class__)
+    return get(node)
+
+
+# ----------------------------------------------------------------------
+# Copying
+# ----------------------------------------------------------------------
+
+def replace(node: ASTNode, **changes: Any) -> ASTNode:
+    """A new node of the class of ``node`` with the given fields changed and
+    the others as in ``node``; child lists are copied, the children
+    themselves are shared. The position is kept. Type nodes are shared, so
+    for them this returns the type with the changed fields."""
+    cls = node.__class__
+    names = fields(cls)
+    for name in changes:
+        if name not in names:
+            raise TypeError(f"{cls.__name__} has no field {name!r}")
+    values = []
+    for name in names:
+        if name in changes:
+            values.append(changes[name])
+        else:
+            value = getattr(node, name)
+            values.append(value[:] if value.__class__ is list else value)
+    if isinstance(node, Type):
+        return cls(*values)
+    if declares_fields(cls):
+        new = cls(*values)  # constructors take the fields in order
+    else:
+        new = object.__new__(cls)
+        new._hash = None
+        for name, value in zip(names, values):
+            setattr(new, name, value)
+    new.line, new.column = node.line, node.column
+    return new
+
+
+def copy(node: ASTNode) -> ASTNode:
+    """A shallow copy of ``node``: ``replace`` without changes."""
+    return replace(node)
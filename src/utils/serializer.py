@@ -0,0 +1,65 @@
+"""
+Streaming serializer for TyC ASTs.
+Writes the text form of a tree (what ``str(node)`` returns) in one
+pre-order pass with an explicit stack: each node contributes the pieces
+listed by its ``_parts`` method and every piece is copied exactly once.
+The old ``__str__`` methods formatted each subtree into a fresh string
+and pasted it into their parent's, so a node's text was copied once per
+ancestor, which is quadratic on deep trees, and they recursed once per
+nesting level. ``ASTNode.__str__`` now delegates to ``render``.
+"""
+
+import sys
+from typing import List, TextIO
+
+from .nodes import ASTNode
+
+# Pieces gathered before each ``out.write`` in ``write``.
+CHUNK_SIZE = 4096
+
+
+def _fill(stack: list, pieces: List[str], limit: int) -> None:
+    """Move text from ``stack`` (items still to print, last one first) into
+    ``pieces`` until the stack is empty or ``pieces`` holds ``limit`` strings.
+    """
+    node_str = ASTNode.__str__
+    expands = {}  # class -> whether it prints through ``_parts``
+    pop, extend, append = stack.pop, stack.extend, pieces.append
+    while stack:
+        item = pop()
+        cls = item.__class__
+        if cls is str:
+            append(item)
+        elif cls is list:
+            if item:
+                parts = [", "] * (2 * len(item) - 1)
+                parts[::2] = item
+                extend(parts[::-1])
+        else:
+            expand = expands.get(cls)
+            if expand is None:
+                expand = expands[cls] = cls.__str__ is node_str
+            if expand:
+                extend(item._parts()[::-1])
+                if len(pieces) >= limit:
+                    return
+            else:
+                # A subclass with its own ``__str__`` (or a plain value)
+                # formats itself.
+                append(str(item))
+
+
+def write(node: ASTNode, out: TextIO) -> None:
+    """Write ``str(node)`` to the text stream ``out`` in chunks."""
+    stack = [node]
+    while stack:
+        pieces = []
+        _fill(stack, pieces, CHUNK_SIZE)
+        out.write("".join(pieces))
+
+
+def render(node: ASTNode) -> str:
+    """``str(node)``, joined once from the pieces of the whole tree."""
+    pieces = []
+    _fill([node], pieces, sys.maxsize)
+    return "".join(pieces)
@@ -0,0 +1,127 @@
+"""
+Copy-on-write transformation of TyC ASTs.
+A ``NodeTransformer`` subclass defines ``transform_<kind>`` methods
+(``transform_binary_op``...) that return the node to put in place of the
+one given. ``generic_transform`` transforms the children of a node and
+copies the node only if one of them came back different, so the result
+shares every untouched subtree with the input, which is never modified:
+
+    class FoldAdd(NodeTransformer):
+        def transform_binary_op(self, node):
+            node = self.generic_transform(node)  # children first
+            if node.operator == "+" and isinstance(node.left, IntLiteral) ...
+                return IntLiteral(node.left.value + node.right.value)
+            return node
+
+Inside a list (statements, arguments...) a method may also return None
+to drop the node or a list of nodes to put in its place. The transformer
+remembers the nodes its last ``transform`` call put in place of others,
+so ``changed(decl)`` tells a later pass whether a declaration of that
+result differs from the input. Shared type nodes (``IntType()``...) and
+nodes of the input tree moved elsewhere are never counted as changed.
+Like ``BaseVisitor``, a transformer recurses once per nesting level.
+"""
+
+from typing import Callable, Dict, List, Optional, Set
+
+from .nodes import ASTNode, Type
+from .schema import _VALUES, _kinds, declares_fields, fields, replace
+from .traversal import walk
+from .visitor import _visit_name
+
+
+class NodeTransformer:
+    """Base class for copy-on-write transformations; see the module docstring."""
+
+    # Node class -> ``transform_*`` function of this class, or ``generic_transform``.
+    _transforms: Dict[type, Callable] = {}
+    # id -> node put in place of another by the last ``transform`` call
+    _replaced: Dict[int, ASTNode] = {}
+    # Input of the ``transform`` call in progress, and the ids of its
+    # nodes once a method has returned a node it did not create.
+    _root: Optional[ASTNode] = None
+    _input: Optional[Set[int]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._transforms = {}
+
+    @classmethod
+    def _hook(cls, node_class: type) -> Callable:
+        name = _visit_name(node_class)
+        hook = getattr(cls, "transform_" + name[len("visit_"):], None) if name else None
+        hook = cls._transforms[node_class] = hook or cls.generic_transform
+        return hook
+
+    def transform(self, node: ASTNode):
+        """The node to put in place of ``node`` (``node`` itself if nothing
+        in its subtree changed)."""
+        if self._root is not None:
+            return self._transform(node)
+        self._root, self._replaced = node, {}
+        try:
+            return self._transform(node)
+        finally:
+            self._root = self._input = None
+
+    def _transform(self, node: ASTNode):
+        try:
+            hook = self._transforms[node.__class__]
+        except KeyError:
+            hook = self._hook(node.__class__)
+        result = hook(self, node)
+        if result is not node and result is not None:
+            if hook is NodeTransformer.generic_transform:
+                self._replaced[id(result)] = result  # always a new copy
+            else:
+                for item in result if result.__class__ is list else (result,):
+                    if not isinstance(item, Type) and not self._in_input(item):
+                        self._replaced[id(item)] = item
+        return result
+
+    def _in_input(self, node: ASTNode) -> bool:
+        if self._input is None:
+            self._input = {id(item) for item in walk(self._root)}
+        return id(node) in self._input
+
+    def generic_transform(self, node: ASTNode) -> ASTNode:
+        """``node`` with its children transformed: ``node`` itself if none of
+        them changed, else a copy of it holding the new children."""
+        cls = node.__class__
+        if declares_fields(cls):
+            singles, lists = _kinds(cls)[:2]
+        else:
+            values = [(name, getattr(node, name)) for name in fields(cls)]
+            singles = [name for name, value in values if value.__class__ not in _VALUES and value.__class__ is not list]
+            lists = [name for name, value in values if value.__class__ is list]
+        changes = {}
+        for name in singles:
+            child = getattr(node, name)
+            if child is not None:
+                new = self.transform(child)
+                if new is not child:
+                    changes[name] = new
+        for name in lists:
+            items = getattr(node, name)
+            new_items: Optional[List[ASTNode]] = None
+            for index, item in enumerate(items):
+                new = self.transform(item)
+                if new_items is None:
+                    if new is item:
+                        continue
+                    new_items = items[:index]
+                if new is None:
+                    continue
+                if new.__class__ is list:
+                    new_items.extend(new)
+                else:
+                    new_items.append(new)
+            if new_items is not None:
+                changes[name] = new_items
+        return replace(node, **changes) if changes else node
+
+    def changed(self, node: ASTNode) -> bool:
+        """Whether ``node``, from the tree the last ``transform`` call
+        returned, was put there in place of another node (so something
+        under it changed)."""
+        return id(node) in self._replaced
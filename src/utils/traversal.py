@@ -0,0 +1,229 @@
+"""
+Explicit-stack traversal and rendering of TyC ASTs.
+The ``BaseVisitor`` methods recurse once per nesting level, so a
+machine-generated expression with thousands of chained operators hits
+the recursion limit. The functions here keep their own stack instead:
+``walk`` yields every node of a tree in time linear in its size whatever
+its depth. Children come from the field schema of each class
+(``schema.child_nodes``). ``render`` is re-exported from ``serializer``.
+
+``traverse`` is the engine for analyses: it calls ``pre(node)`` before
+the children of each node and ``post(node)`` after them, and ``pre`` can
+return ``SKIP`` to leave the children of a node out. ``Walker`` is a base
+class on top of it with ``enter_*`` and ``leave_*`` methods per node
+class, and ``Fused`` runs several walkers in a single traversal. None of
+them recurses, so they work on trees of any depth. Python calls are cheap
+enough that on ordinary trees a recursive ``BaseVisitor`` is still about
+twice as fast; prefer it where depth is bounded.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .nodes import ASTNode
+from .schema import child_fields, child_nodes, declares_fields, fields, list_fields
+from .serializer import render
+from .visitor import _visit_name
+
+# Returned by a ``pre`` callback to skip the children of the node.
+SKIP = object()
+# Stands on the stack of ``traverse`` above a node waiting for ``post``.
+_LEAVE = object()
+
+# How ``traverse`` pushes the children of each class: (how, getter), where
+# getter returns the child fields in reverse order.
+_NO_CHILDREN, _ONE, _SEVERAL, _ONE_LIST, _MIXED, _INSPECT = range(6)
+_PUSHES: Dict[type, Tuple[int, Any]] = {}
+
+
+def _push_plan(cls: type) -> Tuple[int, Any]:
+    if not declares_fields(cls):
+        plan = (_INSPECT, None)
+    else:
+        singles, lists = child_fields(cls), list_fields(cls)
+        names = [name for name in reversed(fields(cls)) if name in singles or name in lists]
+        if not names:
+            plan = (_NO_CHILDREN, None)
+        elif lists:
+            plan = ((_ONE_LIST, attrgetter(names[0])) if len(names) == 1
+                    else (_MIXED, [(name, name in lists) for name in names]))
+        else:
+            plan = (_ONE, attrgetter(names[0])) if len(names) == 1 else (_SEVERAL, attrgetter(*names))
+    _PUSHES[cls] = plan
+    return plan
+
+
+def iter_child_nodes(node: ASTNode) -> Iterator[ASTNode]:
+    """Direct children of ``node``, in the order ``BaseVisitor`` visits them."""
+    return iter(child_nodes(node))
+
+
+def walk(node: ASTNode) -> Iterator[ASTNode]:
+    """Every node of the tree under ``node`` (itself included), in pre-order."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(child_nodes(node)))
+
+
+def traverse(tree: ASTNode, pre: Optional[Callable[[ASTNode], Any]] = None,
+             post: Optional[Callable[[ASTNode], Any]] = None) -> None:
+    """Visit the tree under ``tree`` in the order of ``walk``, calling
+    ``pre(node)`` before the children of each node and ``post(node)`` after
+    them. If ``pre`` returns ``SKIP`` the children are left out (``post``
+    is still called for the node itself)."""
+    stack = [tree]
+    pop, push, extend = stack.pop, stack.append, stack.extend
+    pushes = _PUSHES
+    while stack:
+        node = pop()
+        if node is None:  # an absent optional child
+            continue
+        if node is _LEAVE:
+            post(pop())
+            continue
+        if pre is not None and pre(node) is SKIP:
+            if post is not None:
+                post(node)
+            continue
+        if post is not None:
+            push(node)
+            push(_LEAVE)
+        cls = node.__class__
+        how, get = pushes.get(cls) or _push_plan(cls)
+        if how == _NO_CHILDREN:
+            continue
+        if how == _ONE:
+            push(get(node))
+        elif how == _SEVERAL:
+            extend(get(node))
+        elif how == _ONE_LIST:
+            extend(reversed(get(node)))
+        elif how == _MIXED:
+            for name, is_list in get:
+                value = getattr(node, name)
+                if is_list:
+                    extend(reversed(value))
+                else:
+                    push(value)
+        else:
+            extend(reversed(child_nodes(node)))
+
+
+class Walker:
+    """Base class for analyses run with ``traverse``.
+
+    ``run(tree)`` calls ``enter_<kind>(node)`` before the children of each
+    node and ``leave_<kind>(node)`` after them, for the kinds a subclass
+    defines (``enter_func_decl``, ``leave_block_stmt``...). An ``enter_*``
+    method returns ``SKIP`` to leave out the children. Results are kept on
+    the walker.
+    """
+
+    # Node class -> ``enter_*`` / ``leave_*`` function of this class, or None.
+    _enter: Dict[type, Optional[Callable]] = {}
+    _leave: Dict[type, Optional[Callable]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._enter = {}
+        cls._leave = {}
+
+    @classmethod
+    def _hook(cls, prefix: str, node_class: type) -> Optional[Callable]:
+        """The ``enter_*`` or ``leave_*`` function (``prefix``) of this class
+        for ``node_class``, or None."""
+        table = cls._enter if prefix == "enter_" else cls._leave
+        try:
+            return table[node_class]
+        except KeyError:
+            name = _visit_name(node_class)
+            hook = table[node_class] = getattr(cls, prefix + name[len("visit_"):], None) if name else None
+            return hook
+
+    def run(self, tree: ASTNode) -> "Walker":
+        """Walk the tree under ``tree``; returns the walker."""
+        enter, leave = self._enter, self._leave
+
+        def pre(node):
+            try:
+                hook = enter[node.__class__]
+            except KeyError:
+                hook = self._hook("enter_", node.__class__)
+            if hook is not None:
+                return hook(self, node)
+
+        def post(node):
+            try:
+                hook = leave[node.__class__]
+            except KeyError:
+                hook = self._hook("leave_", node.__class__)
+            if hook is not None:
+                hook(self, node)
+
+        names = dir(self.__class__)
+        traverse(tree, pre if any(name.startswith("enter_") for name in names) else None,
+                 post if any(name.startswith("leave_") for name in names) else None)
+        return self
+
+
+class Fused:
+    """Several walkers run in one traversal of a tree.
+
+    Each node is reached once; the ``enter_*`` methods of the walkers are
+    called in the order the walkers were given, and their ``leave_*``
+    methods in the same order. A walker that returns ``SKIP`` only prunes
+    the subtree for itself: the others still walk it, and the children are
+    left out altogether once every walker has pruned them. Each walker
+    keeps its own state, as with ``Walker.run``.
+    """
+
+    def __init__(self, *walkers: Walker):
+        self.walkers = walkers
+
+    def run(self, tree: ASTNode) -> "Fused":
+        """Walk the tree under ``tree`` with every walker; returns ``self``."""
+        walkers = self.walkers
+        # Per walker, the node whose subtree it pruned (or None).
+        pruned_at: List[Optional[ASTNode]] = [None] * len(walkers)
+        pruned = 0
+        # Node class -> [(walker index, walker, hook)] of the walkers with a hook.
+        enters: Dict[type, list] = {}
+        leaves: Dict[type, list] = {}
+
+        def hooks(prefix, node_class):
+            return [(index, walker, hook) for index, walker in enumerate(walkers)
+                    if (hook := walker._hook(prefix, node_class)) is not None]
+
+        def pre(node):
+            nonlocal pruned
+            try:
+                calls = enters[node.__class__]
+            except KeyError:
+                calls = enters[node.__class__] = hooks("enter_", node.__class__)
+            for index, walker, hook in calls:
+                if pruned_at[index] is None and hook(walker, node) is SKIP:
+                    pruned_at[index] = node
+                    pruned += 1
+            if pruned == len(walkers):
+                return SKIP
+
+        def post(node):
+            nonlocal pruned
+            if pruned:
+                for index, at in enumerate(pruned_at):
+                    if at is node:
+                        pruned_at[index] = None
+                        pruned -= 1
+            try:
+                calls = leaves[node.__class__]
+            except KeyError:
+                calls = leaves[node.__class__] = hooks("leave_", node.__class__)
+            for index, walker, hook in calls:
+                if pruned_at[index] is None:
+                    hook(walker, node)
+
+        if walkers:
+            traverse(tree, pre, post)
+        return self
@@ -2,21 +2,97 @@
 Visitor interface for AST traversal in TyC programming language.
 This module defines the abstract visitor pattern interface for traversing
 and processing AST nodes.
+
+``visit`` dispatches through a table, kept per visitor class, from node
+class to ``visit_*`` function: one dict lookup and one call per node
+instead of ``node.accept(self, o)`` and the method lookup it does. The
+default methods of ``BaseVisitor`` use the table for the children too,
+which also saves the call to ``visit``, unless the visitor class
+overrides ``visit``: then every child still goes through it.
+
+The tables are built when a visitor class is created, from its
+``visit_*`` methods, so overriding them works as before (replacing them
+on the class afterwards does not). Nodes of classes
+outside ``nodes.py``, which define their own ``accept``, go through it.
 """
 
+import re
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from weakref import WeakSet
 
 if TYPE_CHECKING:
     from .nodes import *
 
+_NODES_MODULE = __name__.rpartition(".")[0] + ".nodes"
+
+
+def _visit_name(node_class: type) -> Optional[str]:
+    """Name of the method ``accept`` of ``node_class`` calls, if it is a
+    class from ``nodes.py`` (``BinaryOp`` -> ``visit_binary_op``)."""
+    if node_class.__module__ != _NODES_MODULE:
+        return None
+    return "visit_" + re.sub(r"(?<!^)(?=[A-Z])", "_", node_class.__name__).lower()
+
+
+def _accept(visitor: "ASTVisitor", node: "ASTNode", o: Any):
+    return node.accept(visitor, o)
+
+
+def _node_classes() -> List[type]:
+    from .nodes import ASTNode
+
+    classes, found = [], ASTNode.__subclasses__()
+    while found:
+        cls = found.pop()
+        classes.append(cls)
+        found.extend(cls.__subclasses__())
+    return classes
+
+
+_visitor_classes: "WeakSet[type]" = WeakSet()
+
+
+def _node_class_added(node_class: type) -> None:
+    """Called by ``ASTNode.__init_subclass__``: add the new node class to
+    the table of every visitor class."""
+    for visitor_class in list(_visitor_classes):
+        visitor_class._add(node_class)
+
 
 class ASTVisitor(ABC):
     """Abstract base class for AST visitors."""
 
+    # Node class -> function called as ``function(visitor, node, o)``.
+    # ``_dispatch`` is the table of ``visit``; ``_descend`` is the one the
+    # methods of ``BaseVisitor`` visit children through, the same but for
+    # classes that override ``visit``, where it leads to that ``visit``.
+    _dispatch: Dict[type, Callable] = {}
+    _descend: Dict[type, Callable] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+        cls._descend = {}
+        _visitor_classes.add(cls)
+        for node_class in _node_classes():
+            cls._add(node_class)
+
     def visit(self, node: "ASTNode", o: Any = None):
         """Visit a node using the visitor pattern."""
-        return node.accept(self, o)
+        try:
+            handler = self._dispatch[node.__class__]
+        except KeyError:  # not an ``ASTNode``
+            self._add(node.__class__)
+            handler = self._dispatch[node.__class__]
+        return handler(self, node, o)
+
+    @classmethod
+    def _add(cls, node_class: type) -> None:
+        name = _visit_name(node_class)
+        handler = getattr(cls, name, _accept) if name else _accept
+        cls._dispatch[node_class] = handler
+        cls._descend[node_class] = handler if cls.visit is ASTVisitor.visit else cls.visit
 
     # Program and declarations
     @abstractmethod
@@ -166,24 +242,24 @@ class BaseVisitor(ASTVisitor):
 
     def visit_program(self, node: "Program", o: Any = None):
         for decl in node.decls:
-            self.visit(decl, o)
+            self._descend[decl.__class__](self, decl, o)
 
     def visit_struct_decl(self, node: "StructDecl", o: Any = None):
         for member in node.members:
-            self.visit(member, o)
+            self._descend[member.__class__](self, member, o)
 
     def visit_member_decl(self, node: "MemberDecl", o: Any = None):
-        self.visit(node.member_type, o)
+        self._descend[node.member_type.__class__](self, node.member_type, o)
 
     def visit_func_decl(self, node: "FuncDecl", o: Any = None):
         if node.return_type:
-            self.visit(node.return_type, o)
+            self._descend[node.return_type.__class__](self, node.return_type, o)
         for param in node.params:
-            self.visit(param, o)
-        self.visit(node.body, o)
+            self._descend[param.__class__](self, param, o)
+        self._descend[node.body.__class__](self, node.body, o)
 
     def visit_param(self, node: "Param", o: Any = None):
-        self.visit(node.param_type, o)
+        self._descend[node.param_type.__class__](self, node.param_type, o)
 
     def visit_int_type(self, node: "IntType", o: Any = None):
         pass
@@ -202,51 +278,51 @@ class BaseVisitor(ASTVisitor):
 
     def visit_block_stmt(self, node: "BlockStmt", o: Any = None):
         for stmt in node.statements:
-            self.visit(stmt, o)
+            self._descend[stmt.__class__](self, stmt, o)
 
     def visit_var_decl(self, node: "VarDecl", o: Any = None):
         if node.var_type:
-            self.visit(node.var_type, o)
+            self._descend[node.var_type.__class__](self, node.var_type, o)
         if node.init_value:
-            self.visit(node.init_value, o)
+            self._descend[node.init_value.__class__](self, node.init_value, o)
 
     def visit_assign_stmt(self, node: "AssignStmt", o: Any = None):
-        self.visit(node.assign_expr, o)
+        self._descend[node.assign_expr.__class__](self, node.assign_expr, o)
 
     def visit_if_stmt(self, node: "IfStmt", o: Any = None):
-        self.visit(node.condition, o)
-        self.visit(node.then_stmt, o)
+        self._descend[node.condition.__class__](self, node.condition, o)
+        self._descend[node.then_stmt.__class__](self, node.then_stmt, o)
         if node.else_stmt:
-            self.visit(node.else_stmt, o)
+            self._descend[node.else_stmt.__class__](self, node.else_stmt, o)
 
     def visit_while_stmt(self, node: "WhileStmt", o: Any = None):
-        self.visit(node.condition, o)
-        self.visit(node.body, o)
+        self._descend[node.condition.__class__](self, node.condition, o)
+        self._descend[node.body.__class__](self, node.body, o)
 
     def visit_for_stmt(self, node: "ForStmt", o: Any = None):
         if node.init:
-            self.visit(node.init, o)  # init is VarDecl
+            self._descend[node.init.__class__](self, node.init, o)  # init is VarDecl
         if node.condition:
-            self.visit(node.condition, o)
+            self._descend[node.condition.__class__](self, node.condition, o)
         if node.update:
-            self.visit(node.update, o)  # update is Expr
-        self.visit(node.body, o)
+            self._descend[node.update.__class__](self, node.update, o)  # update is Expr
+        self._descend[node.body.__class__](self, node.body, o)
 
     def visit_switch_stmt(self, node: "SwitchStmt", o: Any = None):
-        self.visit(node.expr, o)
+        self._descend[node.expr.__class__](self, node.expr, o)
         for case in node.cases:
-            self.visit(case, o)
+            self._descend[case.__class__](self, case, o)
         if node.default_case:
-            self.visit(node.default_case, o)
+            self._descend[node.default_case.__class__](self, node.default_case, o)
 
     def visit_case_stmt(self, node: "CaseStmt", o: Any = None):
-        self.visit(node.expr, o)
+        self._descend[node.expr.__class__](self, node.expr, o)
         for stmt in node.statements:
-            self.visit(stmt, o)
+            self._descend[stmt.__class__](self, stmt, o)
 
     def visit_default_stmt(self, node: "DefaultStmt", o: Any = None):
         for stmt in node.statements:
-            self.visit(stmt, o)
+            self._descend[stmt.__class__](self, stmt, o)
 
     def visit_break_stmt(self, node: "BreakStmt", o: Any = None):
         pass
@@ -256,38 +332,38 @@ class BaseVisitor(ASTVisitor):
 
     def visit_return_stmt(self, node: "ReturnStmt", o: Any = None):
         if node.expr:
-            self.visit(node.expr, o)
+            self._descend[node.expr.__class__](self, node.expr, o)
 
     def visit_expr_stmt(self, node: "ExprStmt", o: Any = None):
-        self.visit(node.expr, o)
+        self._descend[node.expr.__class__](self, node.expr, o)
 
     def visit_binary_op(self, node: "BinaryOp", o: Any = None):
-        self.visit(node.left, o)
-        self.visit(node.right, o)
+        self._descend[node.left.__class__](self, node.left, o)
+        self._descend[node.right.__class__](self, node.right, o)
 
     def visit_prefix_op(self, node: "PrefixOp", o: Any = None):
-        self.visit(node.operand, o)
+        self._descend[node.operand.__class__](self, node.operand, o)
 
     def visit_postfix_op(self, node: "PostfixOp", o: Any = None):
-        self.visit(node.operand, o)
+        self._descend[node.operand.__class__](self, node.operand, o)
 
     def visit_assign_expr(self, node: "AssignExpr", o: Any = None):
-        self.visit(node.lhs, o)
-        self.visit(node.rhs, o)
+        self._descend[node.lhs.__class__](self, node.lhs, o)
+        self._descend[node.rhs.__class__](self, node.rhs, o)
 
     def visit_member_access(self, node: "MemberAccess", o: Any = None):
-        self.visit(node.obj, o)
+        self._descend[node.obj.__class__](self, node.obj, o)
 
     def visit_func_call(self, node: "FuncCall", o: Any = None):
         for arg in node.args:
-            self.visit(arg, o)
+            self._descend[arg.__class__](self, arg, o)
 
     def visit_identifier(self, node: "Identifier", o: Any = None):
         pass
 
     def visit_struct_literal(self, node: "StructLiteral", o: Any = None):
         for value in node.values:
-            self.visit(value, o)
+            self._descend[value.__class__](self, value, o)
 
     def visit_int_literal(self, node: "IntLiteral", o: Any = None):
         pass
@@ -1,18 +1,130 @@
 """
 AST Generation test cases for TyC compiler.
-TODO: Implement 100 test cases for AST generation
 """
 
 import pytest
 from tests.utils import ASTGenerator
 
 
-def test_ast_gen_placeholder():
-    """Placeholder test - replace with actual test cases"""
-    source = """void main() {
-}"""
-    # TODO: Add actual test assertions
-    # Example:
-    # expected = "Program([FuncDecl(VoidType(), main, [], BlockStmt([]))])"
-    # assert str(ASTGenerator(source).generate()) == expected
-    assert True
+def ast_of(body):
+    """AST string of ``body`` wrapped in ``void main() { ... }``."""
+    return str(ASTGenerator("void main() { " + body + " }").generate())
+
+
+def main_with(*stmts):
+    return f"Program([FuncDecl(VoidType(), main, [], BlockStmt([{', '.join(stmts)}]))])"
+
+
+# --- 1. Declarations ---
+
+def test_empty_main():
+    assert str(ASTGenerator("void main() {\n}").generate()) == main_with()
+
+
+def test_empty_program():
+    assert str(ASTGenerator("").generate()) == "Program([])"
+
+
+def test_struct_decl():
+    src = "struct Point { int x; float y; string name; Point next; };"
+    assert str(ASTGenerator(src).generate()) == (
+        "Program([StructDecl(Point, [MemberDecl(IntType(), x), MemberDecl(FloatType(), y), "
+        "MemberDecl(StringType(), name), MemberDecl(StructType(Point), next)])])"
+    )
+
+
+def test_empty_struct():
+    assert str(ASTGenerator("struct E {};").generate()) == "Program([StructDecl(E, [])])"
+
+
+@pytest.mark.parametrize("src, expected", [
+    ("int f(int a, float b) {}", "FuncDecl(IntType(), f, [Param(IntType(), a), Param(FloatType(), b)], BlockStmt([]))"),
+    ("string f(Point p) {}", "FuncDecl(StringType(), f, [Param(StructType(Point), p)], BlockStmt([]))"),
+    ("Point f() {}", "FuncDecl(StructType(Point), f, [], BlockStmt([]))"),
+    ("f(int n) {}", "FuncDecl(auto, f, [Param(IntType(), n)], BlockStmt([]))"),
+])
+def test_func_decl(src, expected):
+    assert str(ASTGenerator(src).generate()) == f"Program([{expected}])"
+
+
+# --- 2. Statements ---
+
+@pytest.mark.parametrize("body, expected", [
+    ("auto x = 1;", "VarDecl(auto, x = IntLiteral(1))"),
+    ("int x;", "VarDecl(IntType(), x)"),
+    ("Point p = {1, 2};", "VarDecl(StructType(Point), p = StructLiteral({IntLiteral(1), IntLiteral(2)}))"),
+    ("break;", "BreakStmt()"),
+    ("continue;", "ContinueStmt()"),
+    ("return;", "ReturnStmt(return)"),
+    ("return x;", "ReturnStmt(return Identifier(x))"),
+    ("{ }", "BlockStmt([])"),
+    ("{ x; }", "BlockStmt([ExprStmt(Identifier(x))])"),
+    ("{1, 2};", "ExprStmt(StructLiteral({IntLiteral(1), IntLiteral(2)}))"),
+    ("while (x) x--;", "WhileStmt(while Identifier(x) do ExprStmt(PostfixOp(Identifier(x)--)))"),
+])
+def test_simple_statements(body, expected):
+    assert ast_of(body) == main_with(expected)
+
+
+def test_if_else_binds_to_nearest_if():
+    assert ast_of("if (a) if (b) x; else y;") == main_with(
+        "IfStmt(if Identifier(a) then IfStmt(if Identifier(b) then ExprStmt(Identifier(x)), "
+        "else ExprStmt(Identifier(y))))"
+    )
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("auto i = 0; i < n; ++i",
+     "for VarDecl(auto, i = IntLiteral(0)); BinaryOp(Identifier(i), <, Identifier(n)); PrefixOp(++Identifier(i))"),
+    ("i = 0; ; i++", "for ExprStmt(AssignExpr(Identifier(i) = IntLiteral(0))); None; PostfixOp(Identifier(i)++)"),
+    ("; i; ", "for None; Identifier(i); None"),
+    ("; ; i = i + 1", "for None; None; AssignExpr(Identifier(i) = BinaryOp(Identifier(i), +, IntLiteral(1)))"),
+])
+def test_for_stmt(header, expected):
+    assert ast_of(f"for ({header}) {{}}") == main_with(f"ForStmt({expected} do BlockStmt([]))")
+
+
+def test_switch_stmt():
+    body = "switch (d) { case 1: case 2: a; break; default: b; case 3: c; }"
+    assert ast_of(body) == main_with(
+        "SwitchStmt(switch Identifier(d) cases [CaseStmt(case IntLiteral(1): []), "
+        "CaseStmt(case IntLiteral(2): [ExprStmt(Identifier(a)), BreakStmt()]), "
+        "CaseStmt(case IntLiteral(3): [ExprStmt(Identifier(c))])], "
+        "default DefaultStmt(default: [ExprStmt(Identifier(b))]))"
+    )
+
+
+def test_empty_switch():
+    assert ast_of("switch (x) { }") == main_with("SwitchStmt(switch Identifier(x) cases [])")
+
+
+# --- 3. Expressions ---
+
+@pytest.mark.parametrize("expr, expected", [
+    ("a + b * c", "BinaryOp(Identifier(a), +, BinaryOp(Identifier(b), *, Identifier(c)))"),
+    ("a - b - c", "BinaryOp(BinaryOp(Identifier(a), -, Identifier(b)), -, Identifier(c))"),
+    ("a = b = c", "AssignExpr(Identifier(a) = AssignExpr(Identifier(b) = Identifier(c)))"),
+    ("(a = 5) + 7", "BinaryOp(AssignExpr(Identifier(a) = IntLiteral(5)), +, IntLiteral(7))"),
+    ("a || b && c == d < e", "BinaryOp(Identifier(a), ||, BinaryOp(Identifier(b), &&, "
+                             "BinaryOp(Identifier(c), ==, BinaryOp(Identifier(d), <, Identifier(e)))))"),
+    ("-a * b", "BinaryOp(PrefixOp(-Identifier(a)), *, Identifier(b))"),
+    ("!a++", "PrefixOp(!PostfixOp(Identifier(a)++))"),
+    ("++p.x", "PrefixOp(++MemberAccess(Identifier(p).x))"),
+    ("a.b.c", "MemberAccess(MemberAccess(Identifier(a).b).c)"),
+    ("f(1, 2.5, \"s\")", "FuncCall(f, [IntLiteral(1), FloatLiteral(2.5), StringLiteral('s')])"),
+    ("g()", "FuncCall(g, [])"),
+    ("{}", "StructLiteral({})"),
+    ("1e3 % 7", "BinaryOp(FloatLiteral(1000.0), %, IntLiteral(7))"),
+])
+def test_expressions(expr, expected):
+    assert ast_of(f"x = {expr};") == main_with(f"ExprStmt(AssignExpr(Identifier(x) = {expected}))")
+
+
+# --- 4. Errors ---
+
+@pytest.mark.parametrize("src, expected", [
+    ("void main() { x = ; }", "AST Generation Error: Error on line 1 col 18: ;"),
+    ("void main() { @ }", "AST Generation Error: Error Token @"),
+])
+def test_errors(src, expected):
+    assert ASTGenerator(src).generate() == expected
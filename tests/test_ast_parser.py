@@ -0,0 +1,103 @@
+import random
+
+import pytest
+from tests.utils import ASTGenerator
+from src.frontend.ast_parser import ASTParser
+from src.frontend.session import FrontEndSession
+
+direct = ASTParser()
+direct_antlr_lexer = ASTParser(fast_lexer=False)
+
+
+def direct_ast(parser, source):
+    """Same output format as ``ASTGenerator.generate``."""
+    try:
+        return str(parser.parse(source))
+    except Exception as e:
+        return f"AST Generation Error: {str(e)}"
+
+
+def check_same(source):
+    expected = str(ASTGenerator(source).generate())
+    assert direct_ast(direct, source) == expected
+    assert direct_ast(direct_antlr_lexer, source) == expected
+
+
+CORPUS = [
+    """struct Point { int x; int y; };
+    Point make(int x, int y) { Point p = {x, y}; return p; }
+    add(int a, int b) { return a + b; }
+    void main() {
+        auto n = readInt(); int i; float f = 1.5e2; string s = "a\\tb";
+        for (i = 0; i < n; ++i) { if (i % 2 == 0) printInt(i); else continue; }
+        for (auto j = 0; ; j--) break;
+        for (;;) {}
+        while (n > 0 && !(n == 3) || n != 7) n = n - 1;
+        switch (n) { case 1: case 2: n++; break; default: case 3 + 4: { n--; } }
+        make(1, 2).x = -make(3, 4).y * +2 / 3;
+        p.a.b = q = {1, {2.5, "s"}};
+    }""",
+    "void main() { {} {1}; {} + x; {}; { {} } ; {} ++ x; {} = {}; while (1) { {x}; } }",
+    "void main() { a = b = c + d * e - -f++ . g; x.y.z++; ++x.y; --x; !a <= b >= c < d > e; }",
+    "void main() { x = (1 + 2) * (3 - (4 / 5)) % 6; }",
+]
+
+# Pieces spliced into the corpus: every token kind plus lexer errors.
+PIECES = (
+    "struct int float string void auto if else while for switch case default break continue return "
+    "x P f 0 2.5 \"s\" { } ( ) ; , : . = == != < <= > >= && || + - * / % ! ++ -- @ \"open"
+).split(" ")
+
+
+# --- 1. Same ASTs and errors as TyCParser + ASTGeneration ---
+
+@pytest.mark.parametrize("src", CORPUS + [
+    "",
+    "void main() { x = ; }",
+    "void main() { int x = 1 2; }",
+    "void main() { @ }",
+    "void main() { x; ) @ }",
+    "void main() { if (a) ) @ }",
+    "void main() { f(1 ) @ }",
+    "void main() { {} - 2.5 x @ }",
+    "void main() { { 1, ) @ }",
+    "P switch g() { \"open",
+    "void main() {",
+    "int",
+])
+def test_direct_parser_matches_antlr(src):
+    check_same(src)
+
+
+def test_direct_parser_matches_antlr_random():
+    rng = random.Random(5)
+    for _ in range(300):
+        tokens = rng.choice(CORPUS).replace("(", " ( ").replace(")", " ) ").replace(";", " ; ").split()
+        for _ in range(rng.randint(1, 3)):
+            k = rng.randrange(len(tokens))
+            roll = rng.random()
+            if roll < 0.4:
+                del tokens[k]
+            elif roll < 0.7:
+                tokens.insert(k, rng.choice(PIECES))
+            else:
+                tokens[k] = rng.choice(PIECES)
+        check_same(" ".join(tokens))
+
+
+def test_direct_parser_matches_antlr_on_statement_soup():
+    # Short random token runs stress the block vs. struct literal decision
+    # and the error positions inside statements.
+    rng = random.Random(11)
+    pieces = "{ } { } ; ; x y 1 + - ++ -- = . , ( ) * if else while for return case default : int auto @".split()
+    for _ in range(500):
+        body = " ".join(rng.choice(pieces) for _ in range(rng.randint(1, 10)))
+        check_same(f"void main() {{ {body} }}")
+
+
+# --- 2. Session integration ---
+
+def test_direct_session_builds_same_ast():
+    session = FrontEndSession(fast_lexer=True, direct_ast=True)
+    for src in CORPUS:
+        assert str(session.build_ast(src)) == str(ASTGenerator(src).generate())
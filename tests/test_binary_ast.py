@@ -0,0 +1,107 @@
+import io
+import pickle
+import sys
+
+import pytest
+from tests.test_ast_parser import CORPUS
+from src.frontend.ast_parser import ASTParser
+from src.utils import binary_ast
+from src.utils.binary_ast import dump, dumps, load, loads
+from src.utils.hashing import structurally_equal
+from src.utils.nodes import *
+from src.utils.traversal import walk
+
+SOURCE = "\n".join(CORPUS)
+
+
+# --- 1. Round trips ---
+
+@pytest.mark.parametrize("source", CORPUS)
+def test_round_trip(source):
+    program = ASTParser().parse(source)
+    loaded = loads(dumps(program))
+    assert str(loaded) == str(program)
+    assert structurally_equal(loaded, program)
+
+
+def test_every_node_class_is_encoded():
+    program = ASTParser().parse(SOURCE)
+    assert {type(node) for node in walk(program)} == set(binary_ast._CLASSES)
+    assert set(binary_ast._SCHEMA) == set(binary_ast._CLASSES)
+    for cls, schema in binary_ast._SCHEMA.items():
+        assert tuple(field for field, _ in schema) == tuple(
+            name for klass in reversed(cls.__mro__) for name in vars(klass).get("__slots__", ())
+            if name != "__weakref__"
+        )[3:]
+
+
+def test_values_and_names():
+    tree = Program([FuncDecl(None, "f", [], BlockStmt([
+        ExprStmt(FuncCall("g", [IntLiteral(0), IntLiteral(-5), IntLiteral(2 ** 70), FloatLiteral(0.1),
+                                FloatLiteral(1e308), StringLiteral("héllo \U0001f600"), StringLiteral(""),
+                                StringLiteral("\\n\\\"")])),
+        ContinueStmt(),
+    ]))])
+    loaded = loads(dumps(tree))
+    assert str(loaded) == str(tree)
+    values = [arg.value for arg in loaded.decls[0].body.statements[0].expr.args]
+    assert values == [0, -5, 2 ** 70, 0.1, 1e308, "héllo \U0001f600", "", "\\n\\\""]
+    assert loaded.decls[0].name is sys.intern("f")
+
+
+def test_loaded_types_are_shared():
+    loaded = loads(dumps(ASTParser().parse("struct P { int x; }; P f(int a) { P p; }")))
+    struct, func = loaded.decls
+    assert struct.members[0].member_type is func.params[0].param_type is IntType()
+    assert func.return_type is func.body.statements[0].var_type is StructType("P")
+
+
+def test_deep_tree():
+    tree = IntLiteral(1)
+    for _ in range(100000):
+        tree = BinaryOp(Identifier("a"), "+", tree)
+    assert str(loads(dumps(tree))) == str(tree)
+
+
+# --- 2. Files, buffers and memory maps ---
+
+def test_dump_and_load_through_mmap(tmp_path):
+    program = ASTParser().parse(SOURCE)
+    path = tmp_path / "program.tycast"
+    with open(path, "wb") as file:
+        dump(program, file)
+    assert str(load(str(path))) == str(program)
+    assert str(loads(memoryview(path.read_bytes()))) == str(program)
+
+
+def test_smaller_than_pickle():
+    program = ASTParser().parse(SOURCE * 3)
+    data = dumps(program)
+    assert data.startswith(binary_ast.MAGIC)
+    assert len(data) * 4 < len(pickle.dumps(program))
+    out = io.BytesIO()
+    dump(program, out)
+    assert out.getvalue() == data
+
+
+# --- 3. Bad input ---
+
+def test_rejects_bad_input():
+    data = dumps(ASTParser().parse(SOURCE))
+    with pytest.raises(ValueError, match="not a binary TyC AST"):
+        loads(b"PK\x03\x04" + data[4:])
+    with pytest.raises(ValueError, match="version 2"):
+        loads(binary_ast.MAGIC + b"\x02" + data[5:])
+    for cut in (5, len(data) // 2, len(data) - 1):
+        with pytest.raises(ValueError):
+            loads(data[:cut])
+    with pytest.raises(ValueError, match="trailing"):
+        loads(data + b"\x00")
+    with pytest.raises(TypeError):
+        class Hole(Expr):
+            __slots__ = ()
+
+            def accept(self, visitor, o=None):
+                return None
+
+        dumps(ExprStmt(Hole()))
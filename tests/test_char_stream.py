@@ -0,0 +1,113 @@
+import sys
+
+import pytest
+from tests.utils import Tokenizer
+from antlr4 import InputStream
+from build.TyCLexer import TyCLexer
+from src.frontend.char_stream import CompactInputStream
+
+TEXTS = [
+    "",
+    "int x = 10;\n\tfloat y = 2.5;\r\n",
+    "café = \"naïve\";",
+    "x = \"€\"; // euro",
+    "a \U0001F600 b",
+    "@ # $",
+]
+
+
+def tokens(stream):
+    """Every token of ``stream`` as (type, text, line, column), then the error if any."""
+    lexer = TyCLexer(stream)
+    out = []
+    try:
+        while True:
+            t = lexer.nextToken()
+            out.append((t.type, t.text, t.line, t.column, t.start, t.stop))
+            if t.type == -1:
+                return out
+    except Exception as e:
+        out.append(str(e))
+        return out
+
+
+# --- 1. Same contract as InputStream ---
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_compact_stream_matches_input_stream(text):
+    expected, actual = InputStream(text), CompactInputStream(text)
+    assert actual.size == expected.size
+    assert str(actual) == str(expected)
+    for offset in range(-1, len(text) + 3):
+        assert actual.LA(offset) == expected.LA(offset)
+    for start in range(len(text) + 2):
+        for stop in range(-1, len(text) + 2):
+            assert actual.getText(start, stop) == expected.getText(start, stop)
+
+
+def test_compact_stream_consume_and_seek():
+    stream = CompactInputStream("ab€d")
+    stream.consume()
+    stream.consume()
+    assert (stream.index, stream.LA(1), stream.LA(-1)) == (2, 0x20AC, ord("b"))
+    stream.seek(10)
+    assert stream.index == 4
+    stream.seek(1)
+    assert stream.LA(1) == ord("b")
+
+
+@pytest.mark.parametrize("text", TEXTS + ['"unclosed', 'x = "bad \\q";'])
+def test_lexer_on_compact_stream(text):
+    assert tokens(CompactInputStream(text)) == tokens(InputStream(text))
+
+
+def test_session_tokenizer_uses_compact_stream():
+    assert Tokenizer("int café;").get_tokens_as_string() == "int,caf,Error Token é"
+
+
+# --- 2. Storage ---
+
+@pytest.mark.parametrize("text, buffer_type", [
+    ("plain ascii", bytes),
+    ("latin-1 é", bytes),
+    ("bmp €", "H"),
+    ("astral \U0001F600", "I"),
+])
+def test_compact_stream_buffer(text, buffer_type):
+    data = CompactInputStream(text).data
+    if buffer_type is bytes:
+        assert isinstance(data, bytes)
+    else:
+        assert data.typecode == buffer_type
+
+
+def test_compact_stream_is_smaller():
+    text = "int x = 1;\n" * 10000
+    expected, actual = InputStream(text), CompactInputStream(text)
+    assert sys.getsizeof(actual.data) * 5 < sys.getsizeof(expected.data)
+
+
+# --- 3. Files ---
+
+def test_from_file_maps_ascii(tmp_path):
+    path = tmp_path / "prog.tyc"
+    path.write_bytes(b"void main() {\r\n  x = 1;\r\n}\n")
+    with CompactInputStream.from_file(str(path)) as stream:
+        assert stream.name == str(path)
+        assert stream.getText(0, 3) == "void"
+        assert tokens(stream) == tokens(InputStream(path.read_bytes().decode()))
+    assert stream.size == 0
+
+
+def test_from_file_decodes_other_text(tmp_path):
+    path = tmp_path / "prog.tyc"
+    path.write_text("string s = \"€\";", encoding="utf-8")
+    stream = CompactInputStream.from_file(str(path))
+    assert stream.data.typecode == "H"
+    assert str(stream) == "string s = \"€\";"
+
+
+def test_from_file_empty(tmp_path):
+    path = tmp_path / "empty.tyc"
+    path.write_bytes(b"")
+    assert tokens(CompactInputStream.from_file(str(path))) == [(-1, "<EOF>", 1, 0, 0, -1)]
@@ -0,0 +1,74 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from tests.test_ast_parser import CORPUS
+from src.frontend.ast_parser import ASTParser
+from src.utils.columnar import KINDS, ColumnarAST
+from src.utils.nodes import *
+from src.utils.traversal import iter_child_nodes, walk
+
+PROGRAMS = [ASTParser().parse(source) for source in CORPUS]
+
+
+# --- 1. Conversion ---
+
+def test_round_trip():
+    columns = ColumnarAST.from_trees(PROGRAMS)
+    assert [str(tree) for tree in columns.to_trees()] == [str(tree) for tree in PROGRAMS]
+    for index, program in enumerate(PROGRAMS):
+        assert str(columns.to_tree(index)) == str(program)
+        assert str(ColumnarAST.from_tree(program).to_tree()) == str(program)
+
+
+def test_columns_follow_preorder():
+    program = PROGRAMS[0]
+    columns = ColumnarAST.from_tree(program)
+    nodes = list(walk(program))
+    assert len(columns) == len(nodes)
+    assert [KINDS[kind] for kind in columns.kind.tolist()] == [type(node) for node in nodes]
+    for index, node in enumerate(nodes):
+        start, stop = columns.child_offsets[index], columns.child_offsets[index + 1]
+        children = [child for child in columns.children[start:stop].tolist() if child >= 0]
+        # Shared type nodes occur more than once, so compare by kind.
+        assert [KINDS[columns.kind[child]] for child in children] == [type(child) for child in iter_child_nodes(node)]
+        assert all(columns.parent[child] == index for child in children)
+        assert all(columns.depth[child] == columns.depth[index] + 1 for child in children)
+
+
+def test_literal_payloads():
+    tree = ExprStmt(FuncCall("f", [IntLiteral(-7), FloatLiteral(2.5), StringLiteral("a\\tb"), Identifier("x")]))
+    columns = ColumnarAST.from_tree(tree)
+    assert columns.int_value[columns.mask(IntLiteral)].tolist() == [-7]
+    assert columns.float_value[columns.mask(FloatLiteral)].tolist() == [2.5]
+    assert [columns.strings[i] for i in columns.string[columns.mask(StringLiteral)]] == ["a\\tb"]
+    assert [columns.names[i] for i in columns.name[columns.name >= 0]] == ["f", "x"]
+    assert str(columns.to_tree()) == str(tree)
+
+
+# --- 2. Queries ---
+
+def test_queries_match_tree_walks():
+    columns = ColumnarAST.from_trees(PROGRAMS)
+    nodes = [node for program in PROGRAMS for node in walk(program)]
+    histogram = {}
+    for node in nodes:
+        histogram[type(node).__name__] = histogram.get(type(node).__name__, 0) + 1
+    assert columns.kind_histogram() == histogram
+    assert columns.count(FuncCall, "make") == sum(
+        isinstance(node, FuncCall) and node.name == "make" for node in nodes
+    ) == 2
+    assert columns.count(BinaryOp, "*") == sum(isinstance(node, BinaryOp) and node.operator == "*" for node in nodes)
+    assert columns.count(FuncCall, "missing") == 0
+    assert columns.tree_of(columns.roots).tolist() == list(range(len(PROGRAMS)))
+    assert columns.tree_of(np.flatnonzero(columns.mask(StructDecl))).tolist() == [0]
+
+
+def test_max_depth():
+    tree = IntLiteral(1)
+    for _ in range(1000):
+        tree = PrefixOp("-", tree)
+    columns = ColumnarAST.from_trees([tree, Program([])])
+    assert columns.max_depth() == 1000
+    assert columns.roots.tolist() == [0, 1001]
+    assert str(columns.to_tree(0)) == str(tree)
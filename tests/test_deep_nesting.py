@@ -0,0 +1,83 @@
+import pytest
+from tests.test_ast_parser import CORPUS, check_same
+from src.frontend.ast_parser import ASTParser
+from src.frontend.session import FrontEndSession
+from src.utils.nodes import BinaryOp, Identifier, IntLiteral, Program
+from src.utils.traversal import iter_child_nodes, render, walk
+
+DEPTH = 5000
+
+
+def shapes(n):
+    """Programs nesting ``n`` levels deep in every way the grammar allows."""
+    return {
+        "chain": "void f() { x = " + " + ".join(["a"] * n) + "; }",
+        "parens": "void f() { x = " + "(1 + " * n + "1" + ")" * n + "; }",
+        "unary": "void f() { x = " + "- ! " * (n // 2) + "1; }",
+        "assign": "void f() { " + "x = " * n + "1; }",
+        "calls": "void f() { x = " + "f(1, " * n + "1" + ")" * n + "; }",
+        "struct literals": "void f() { P p = " + "{" * n + "1" + "}" * n + "; }",
+        "members": "void f() { x = (a" + ".b" * n + ")++; }",
+        "blocks": "void f() " + "{" * n + "x;" + "}" * n,
+        "else if": "void f() { " + "if (a) x; else " * n + "y; }",
+        "loops": "void f() { " + "while (a) for (;;) " * (n // 2) + "{} }",
+        "switches": "void f() { " + "switch (a) { case 1: " * n + "x;" + " }" * n + " }",
+    }
+
+
+# --- 1. Deep programs parse and print without recursion ---
+
+@pytest.mark.parametrize("shape", sorted(shapes(1)))
+def test_deep_program_parses_and_renders(shape):
+    source = shapes(DEPTH)[shape]
+    program = ASTParser().parse(source)
+    text = render(program)
+    assert text.startswith("Program([FuncDecl(VoidType(), f, [], BlockStmt([")
+    assert len(text) > DEPTH
+    assert sum(1 for _ in walk(program)) > DEPTH
+
+
+@pytest.mark.parametrize("shape", sorted(shapes(1)))
+def test_moderate_depth_matches_antlr(shape):
+    # Shallow enough for TyCParser.
+    check_same(shapes(40)[shape])
+
+
+@pytest.mark.parametrize("source", [
+    "void f() { x = " + "(" * DEPTH + "1" + ")" * (DEPTH - 1) + "; }",
+    "void f() { x = " + "f(" * DEPTH + "1" + ")" * DEPTH + " }",
+    "void f() " + "{" * DEPTH + "x;" + "}" * (DEPTH - 1),
+])
+def test_deep_syntax_errors(source):
+    with pytest.raises(Exception) as e:
+        ASTParser().parse(source)
+    assert str(e.value).startswith("Error on line 1 col ")
+
+
+# --- 2. Rendering and walking ---
+
+def test_render_matches_str():
+    for source in CORPUS:
+        program = ASTParser().parse(source)
+        assert render(program) == str(program)
+    assert render(IntLiteral(3)) == str(IntLiteral(3))
+
+
+def test_walk_is_preorder():
+    left = BinaryOp(Identifier("a"), "*", Identifier("b"))
+    tree = BinaryOp(left, "+", IntLiteral(1))
+    assert [str(node) for node in walk(tree)][1:] == ["BinaryOp(Identifier(a), *, Identifier(b))",
+                                                      "Identifier(a)", "Identifier(b)", "IntLiteral(1)"]
+    assert list(iter_child_nodes(tree)) == [left, tree.right]
+    assert [type(node) for node in walk(Program([]))] == [Program]
+    assert list(iter_child_nodes(IntLiteral(1))) == []
+
+
+# --- 3. ASTGeneration in explicit-stack mode ---
+
+def test_explicit_stack_ast_generation():
+    session = FrontEndSession(fast_lexer=True, explicit_stack=True)
+    source = shapes(DEPTH)["chain"]
+    assert render(session.build_ast(source)) == render(ASTParser().parse(source))
+    for source in CORPUS:
+        assert str(session.build_ast(source)) == str(ASTParser().parse(source))
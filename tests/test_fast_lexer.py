@@ -0,0 +1,118 @@
+import random
+
+import pytest
+from tests.utils import Tokenizer
+from build.TyCLexer import TyCLexer
+from antlr4 import InputStream, CommonTokenStream
+from build.TyCParser import TyCParser
+from src.frontend.fast_lexer import FastLexer
+from src.frontend.parsing import parse_program
+
+
+def lex_all(lexer):
+    """Every token as (type, text, line, column, start, stop), then the error if any."""
+    out = []
+    try:
+        while True:
+            t = lexer.nextToken()
+            out.append((t.type, t.text, t.line, t.column, t.start, t.stop))
+            if t.type == -1:
+                return out
+    except Exception as e:
+        out.append((type(e).__name__, str(e)))
+        return out
+
+
+def check_same(source):
+    assert lex_all(FastLexer(source)) == lex_all(TyCLexer(InputStream(source)))
+
+
+# --- 1. Differential corpus ---
+
+@pytest.mark.parametrize("src", [
+    "auto break case continue default else float for if int return string struct switch void while",
+    "autox _if if_ Int VOID w2 __ a1_b2",
+    "== != <= >= && || ++ -- + - * / % < > ! = . { } ( ) ; , :",
+    "===!==<<=>>=&&&|||+++---",
+    "0 007 42 1.5 1. .5 1e5 1E+5 1.2e-3 .5e2 1e 1e+ 1.e5 1..2 1.2.3 12abc 9e9x",
+    '"" "abc" "a\\tb" "\\b\\f\\r\\n\\t\\"\\\\" "x" "y"',
+    '"hello\\q world"',
+    '"ok" "bad \\a"',
+    '"unclosed',
+    '"unclosed\nnext',
+    '"trailing backslash\\',
+    '"trailing backslash\\\nx',
+    '"esc\\\\\\q"',
+    "a @ b",
+    "x = 1 # 2",
+    "int x = 10;\n\tfloat y = 2.5;\r\n  string s = \"s\";\n",
+    "/* block */ a /* multi\nline\ncomment */ b // line comment\nc",
+    "/* unclosed block comment\n a b",
+    "a /*/ b */ c",
+    "a //* c\nd",
+    "a/b/*c*/d//e",
+    "x\fy\vz",
+    "naïve",
+    "",
+    "   \n\n  ",
+    "struct P { int x; }; void main() { P p = {1, 2}; p.x++; --p.x; }",
+])
+def test_fast_lexer_matches_antlr(src):
+    check_same(src)
+
+
+def test_fast_lexer_matches_antlr_random():
+    rng = random.Random(2024)
+    pieces = [
+        "a", "_b1", "int", "auto", "0", "12", "3.", ".5", "1e3", "2E-", "e", ".", "+", "-",
+        "=", "==", "!", "&", "&&", "|", "||", "<", ">", "/", "*", "%", "{", "}", "(", ")",
+        ";", ",", ":", " ", "\n", "\t", "\r\n", "\"", "\\", "\\n", "\\q", "abc", "/*", "*/",
+        "//", "#", "$",
+    ]
+    for _ in range(400):
+        source = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 25)))
+        check_same(source)
+
+
+# --- 2. Use as a token source ---
+
+@pytest.mark.parametrize("src", [
+    'int x = "a\\tb"; // done',
+    "x = 1.5e3 @",
+    '"open',
+])
+def test_fast_session_matches_tokenizer(src):
+    from src.frontend.session import FrontEndSession
+
+    assert FrontEndSession(fast_lexer=True).tokenize(src) == Tokenizer(src).get_tokens_as_string()
+
+
+def test_fast_lexer_resumes_after_error():
+    lexer = FastLexer('a "bad\\z" b @ c')
+    assert lexer.nextToken().text == "a"
+    with pytest.raises(Exception) as e:
+        lexer.nextToken()
+    assert str(e.value) == "Illegal Escape In String: bad\\z"
+    # Like TyCLexer, the scanner has already moved past the bad lexeme.
+    with pytest.raises(Exception) as e:
+        lexer.nextToken()
+    assert str(e.value) == "Unclosed String:  b @ c"
+    assert lexer.nextToken().type == -1
+
+
+@pytest.mark.parametrize("src", [
+    "void main() { int x = 1; printInt(x + 2 * 3); }",
+    "struct P { int x; }; P f(P p) { p.x = p.x - 1; return p; }",
+    "void main() { x = ; }",
+    "void main() { int x = 1 2; }",
+    "void main() { string s = \"abc; }",
+])
+def test_fast_lexer_feeds_parser(src):
+    def parse(lexer):
+        parser = TyCParser(CommonTokenStream(lexer))
+        try:
+            return parse_program(parser).toStringTree(recog=parser)
+        except Exception as e:
+            return str(e)
+
+    assert parse(FastLexer(src)) == parse(TyCLexer(InputStream(src)))
@@ -0,0 +1,167 @@
+import pytest
+from tests.utils import Parser
+from build.TyCLexer import TyCLexer
+from build.TyCParser import TyCParser
+from antlr4 import InputStream, CommonTokenStream
+from src.utils.error_listener import NewErrorListener
+from src.frontend.parsing import parse_program
+
+
+def parse_ll_only(source):
+    parser = TyCParser(CommonTokenStream(TyCLexer(InputStream(source))))
+    parser.removeErrorListeners()
+    parser.addErrorListener(NewErrorListener.INSTANCE)
+    try:
+        parser.program()
+        return "success"
+    except Exception as e:
+        return str(e)
+
+
+# --- 1. Two-stage SLL/LL parsing ---
+
+@pytest.mark.parametrize("src", [
+    "void main() { int x = 1; x = x + 2 * 3; printInt(x); }",
+    "struct P { int x; }; P f(P p) { return p; }",
+    "void main() { if (x) if (y) a = 1; else a = 2; }",
+    "void main() { for (i = 0; i < 10; i++) { a.b.c = {1, 2}; } }",
+    "void main() { switch (x) { case 1: case 2: break; default: y--; } }",
+])
+def test_two_stage_valid(src):
+    parser = TyCParser(CommonTokenStream(TyCLexer(InputStream(src))))
+    tree = parse_program(parser)
+    assert tree.getText() == src.replace(" ", "") + "<EOF>"
+
+
+@pytest.mark.parametrize("src", [
+    "void main() { int x = ; }",
+    "void main() { a b c; }",
+    "struct S { int x; ",
+    "void f(int a,) {}",
+    "void main() { x = 1 2; }",
+    "int f;",
+])
+def test_two_stage_errors_match_ll(src):
+    assert Parser(src).parse() == parse_ll_only(src)
+    assert Parser(src).parse().startswith("Error on line")
+
+
+# --- 2. Persistent DFA cache ---
+
+def test_dfa_cache_roundtrip(tmp_path):
+    import os
+    import pickle
+    import subprocess
+    import sys
+    from src.frontend import dfa_cache
+
+    src = "struct P { int x; }; void main() { P p = {1}; p.x = p.x * 2 + 1; printInt(p.x); }"
+    Parser(src).parse()
+    path = str(tmp_path / "tyc.dfa")
+    assert dfa_cache.save_dfa_cache(path)
+    assert not dfa_cache.save_dfa_cache(path)  # nothing new since the last save
+
+    script = (
+        "import sys\n"
+        "from src.frontend import dfa_cache\n"
+        f"print(dfa_cache.load_dfa_cache({path!r}))\n"
+        "before = dfa_cache.dfa_state_count()\n"
+        "from tests.utils import Parser\n"
+        f"print(Parser({src!r}).parse())\n"
+        "print(before > 0 and dfa_cache.dfa_state_count() == before)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={**os.environ, "TYC_DFA_CACHE": "off", "PYTHONPATH": "."},
+    ).stdout.split()
+    assert out == ["True", "success", "True"]
+
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+    payload["key"] = "stale"
+    with open(path, "wb") as f:
+        pickle.dump(payload, f)
+    assert not dfa_cache.load_dfa_cache(path)
+
+
+def test_damaged_dfa_cache_is_ignored(tmp_path):
+    import os
+    import pickle
+    import subprocess
+    import sys
+    from src.frontend import dfa_cache
+
+    Parser("void main() { printInt(1 + 2); }").parse()
+    path = str(tmp_path / "tyc.dfa")
+    assert dfa_cache.save_dfa_cache(path)
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+    data = pickle.dumps(payload)
+    no_parser = {key: value for key, value in payload.items() if key != "parser"}
+    bad_parser = {**payload, "parser": {**payload["parser"], "dfas": [(0, "junk")]}}
+    damaged = {
+        "truncated": data[: len(data) // 2],
+        "garbage": b"\x80\x04\x95" + bytes(range(256)),
+        "no_parser": pickle.dumps(no_parser),
+        "bad_parser": pickle.dumps(bad_parser),
+    }
+    for name, content in damaged.items():
+        with open(str(tmp_path / name), "wb") as f:
+            f.write(content)
+
+    # In a fresh process, so that the DFAs start empty and a half-loaded
+    # cache would show.
+    script = (
+        "from src.frontend import dfa_cache\n"
+        f"for name in {sorted(damaged)!r}:\n"
+        f"    print(dfa_cache.load_dfa_cache({str(tmp_path)!r} + '/' + name), dfa_cache.dfa_state_count())\n"
+        "from tests.utils import Parser\n"
+        "print(Parser('void main() { printInt(1 + 2); }').parse())\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={**os.environ, "TYC_DFA_CACHE": "off", "PYTHONPATH": "."},
+    ).stdout.splitlines()
+    assert out == ["False 0"] * len(damaged) + ["success"]
+
+
+# --- 3. Pooled front-end session ---
+
+def test_session_reuses_pipeline_across_inputs():
+    from src.frontend.session import FrontEndSession
+
+    session = FrontEndSession()
+    assert session.tokenize('int x = "a\\tb";') == 'int,x,=,a\\tb,;,<EOF>'
+    lexer = session._pipeline().lexer
+    assert session.tokenize("x @ y") == "x,Error Token @"
+    assert session.tokenize('"abc') == "Unclosed String: abc"
+    assert session.tokenize("a+b") == "a,+,b,<EOF>"
+    assert session._pipeline().lexer is lexer
+
+    assert session.parse("void main() { x = ; }") == "Error on line 1 col 18: ;"
+    parser = session._pipeline().parser
+    assert session.parse("void main() { x = 1; }") == "success"
+    assert session.parse("void main() {") == "Error on line 1 col 13: <EOF>"
+    assert session._pipeline().parser is parser
+
+
+def test_session_one_pipeline_per_thread():
+    import threading
+    from src.frontend.session import FrontEndSession
+
+    session = FrontEndSession()
+    results, pipelines = [], []
+
+    def work(i):
+        results.append(session.parse(f"int f{i}() {{ return {i} + 1; }}"))
+        pipelines.append(session._pipeline())
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["success"] * 4
+    assert len({id(p) for p in pipelines}) == 4
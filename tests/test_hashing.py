@@ -0,0 +1,113 @@
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+from tests.test_ast_parser import CORPUS
+from src.frontend.ast_parser import ASTParser
+from src.utils.hashing import HashConser, structural_hash, structurally_equal
+from src.utils.nodes import *
+from src.utils.traversal import walk
+
+SOURCE = "\n".join(CORPUS)
+HASH_SOURCE = "void f() { x = a * (b + 1) + a * (b + 1); g(a * (b + 1), 2.5, \"s\"); }"
+
+
+def parse(source=SOURCE):
+    return ASTParser().parse(source)
+
+
+# --- 1. Structural hash and equality ---
+
+def test_equal_trees_hash_equal():
+    a, b = parse(), parse()
+    assert a is not b
+    assert structurally_equal(a, b) and a.structurally_equal(b)
+    assert structural_hash(a) == b.structural_hash()
+    for x, y in zip(walk(a), walk(b)):
+        assert x._hash == y._hash
+        assert structurally_equal(x, y)
+
+
+def test_positions_are_not_structure():
+    a, b = Identifier("x"), Identifier("x")
+    a.line, a.column = 1, 2
+    assert structurally_equal(a, b) and structural_hash(a) == structural_hash(b)
+
+
+@pytest.mark.parametrize("other", [
+    "void f() { x = a * (b + 1) + a * (b + 2); g(a * (b + 1), 2.5, \"s\"); }",
+    "void f() { x = a * (b + 1) - a * (b + 1); g(a * (b + 1), 2.5, \"s\"); }",
+    "void f() { x = a * (b + 1) + a * (c + 1); g(a * (b + 1), 2.5, \"s\"); }",
+    "void f() { x = a * (b + 1) + a * (b + 1); g(a * (b + 1), 2.5); }",
+    "void f() { x = a * (b + 1) + a * (b + 1); g(a * (b + 1), 2.5, \"t\"); }",
+    "void f() { x = a * (b + 1) + a * (b + 1); h(a * (b + 1), 2.5, \"s\"); }",
+    "int f() { x = a * (b + 1) + a * (b + 1); g(a * (b + 1), 2.5, \"s\"); }",
+])
+def test_different_trees_are_not_equal(other):
+    a, b = parse(HASH_SOURCE), parse(other)
+    assert not structurally_equal(a, b)
+    assert structural_hash(a) != structural_hash(b)
+    # The cached hashes settle it without walking the trees.
+    assert not structurally_equal(a, b)
+
+
+def test_hash_is_cached_and_survives_pickle():
+    program = parse()
+    value = structural_hash(program)
+    assert all(node._hash is not None for node in walk(program))
+    loaded = pickle.loads(pickle.dumps(program))
+    assert loaded._hash == value
+    for node in walk(loaded):
+        node._hash = None
+    assert structural_hash(loaded) == value
+
+
+def test_hash_is_the_same_in_every_process():
+    script = ("from src.frontend.ast_parser import ASTParser; import sys; "
+              "print(ASTParser().parse(sys.stdin.read()).structural_hash())")
+    values = {
+        subprocess.run([sys.executable, "-c", script], input=HASH_SOURCE, capture_output=True, text=True,
+                       env={**os.environ, "PYTHONHASHSEED": seed}, check=True).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert values == {str(parse(HASH_SOURCE).structural_hash())}
+
+
+def test_deep_trees():
+    a, b = IntLiteral(0), IntLiteral(0)
+    for _ in range(50000):
+        a, b = PrefixOp("-", a), PrefixOp("-", b)
+    assert structurally_equal(a, b)
+    assert structural_hash(a) == structural_hash(b)
+
+
+# --- 2. Hash-consing ---
+
+def test_share_makes_equal_subtrees_one_object():
+    program = parse(HASH_SOURCE)
+    expected = str(program)
+    conser = HashConser()
+    assert conser.share(program) is program
+    assert str(program) == expected
+    assign, call = (stmt.expr for stmt in program.decls[0].body.statements)
+    product = assign.rhs.left
+    assert assign.rhs.right is product and call.args[0] is product
+    assert str(product) == "BinaryOp(Identifier(a), *, BinaryOp(Identifier(b), +, IntLiteral(1)))"
+    assert len(conser) == len({id(node) for node in walk(program) if isinstance(node, Expr)})
+
+
+def test_share_across_trees_and_make():
+    conser = HashConser()
+    a = conser.share(parse())
+    b = conser.share(parse())
+    exprs_a = [node for node in walk(a) if isinstance(node, Expr)]
+    exprs_b = [node for node in walk(b) if isinstance(node, Expr)]
+    assert all(x is y for x, y in zip(exprs_a, exprs_b))
+    assert a.decls[0] is not b.decls[0]  # declarations are not shared by default
+    one = conser.make(IntLiteral, 1)
+    assert conser.make(BinaryOp, one, "+", conser.make(IntLiteral, 1)).right is one
+    assert conser.make(BreakStmt) is not conser.make(BreakStmt)
+    statements = HashConser(kinds=(Stmt, Expr))
+    assert statements.make(BreakStmt) is statements.make(BreakStmt)
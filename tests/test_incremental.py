@@ -0,0 +1,171 @@
+import random
+
+import pytest
+from tests.utils import Tokenizer
+from tests.test_ast_parser import CORPUS, PIECES
+from lexererr import LexerError
+from src.frontend.ast_parser import ASTParser
+from src.frontend.incremental import IncrementalLexer, IncrementalParser, TokenEdit
+from src.frontend.token_buffer import TokenBuffer
+
+BASE = 'int x = 1.e+y; /* note */\nstring s = "a\\tb"; // tail\nx = a / b * c;\n'
+
+
+def fields(lexer):
+    """Every token of an IncrementalLexer as (type, text, start, stop, line, column)."""
+    return [(lexer.types[i], lexer.text(i), lexer.start(i), lexer.stop(i), lexer.line(i), lexer.column(i))
+            for i in range(len(lexer))]
+
+
+def expected_fields(source):
+    buffer = TokenBuffer.tokenize(source)
+    return [(buffer.types[i], buffer.text(i), buffer.starts[i], buffer.stops[i], buffer.lines[i], buffer.columns[i])
+            for i in range(len(buffer))]
+
+
+def check_edit(lexer, offset, removed, inserted):
+    source = lexer.source[:offset] + inserted + lexer.source[offset + removed:]
+    change = lexer.edit(offset, removed, inserted)
+    assert lexer.source == source
+    assert fields(lexer) == expected_fields(source)
+    return change
+
+
+# --- 1. Same tokens as lexing the edited source ---
+
+@pytest.mark.parametrize("edit", [
+    (BASE.index("y"), 1, "5"),                  # 1.e+y -> one FLOATLIT
+    (BASE.index("/ b"), 1, "/*"),               # unterminated "/*" ...
+    (0, 0, "\n\n"),                             # lines shift
+    (BASE.index("note"), 4, "*/ x /*"),         # comment split in two
+    (BASE.index("a\\t"), 0, '" + "'),            # string split in two
+    (BASE.index("int"), 3, "in"),               # keyword becomes ID
+    (len(BASE), 0, "x"),                        # append
+    (BASE.index("\n"), 1, ""),                  # join lines
+])
+def test_edit_matches_full_relex(edit):
+    check_edit(IncrementalLexer(BASE), *edit)
+
+
+def test_comment_opened_then_closed_far_away():
+    lexer = IncrementalLexer(BASE)
+    check_edit(lexer, BASE.index("/ b"), 1, "/*")
+    check_edit(lexer, len(lexer.source), 0, "*/")
+    assert len(lexer) == 17
+
+
+def test_edits_keep_matching_full_relex():
+    rng = random.Random(3)
+    pieces = ["/*", "*/", "//", "\n", '"', "\\", " ", "x", "1", ".", "e", "+", "/", "*", "{", "int", ";"]
+    lexer = IncrementalLexer(BASE)
+    for _ in range(300):
+        offset = rng.randint(0, len(lexer.source))
+        removed = rng.randint(0, min(3, len(lexer.source) - offset))
+        inserted = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 2)))
+        try:
+            check_edit(lexer, offset, removed, inserted)
+        except LexerError as e:
+            assert str(e) == Tokenizer(lexer.source).get_tokens_as_string().split(",")[-1]
+
+
+# --- 2. Edit ranges and errors ---
+
+def test_edit_reports_replaced_tokens():
+    source = "int a;\n" * 1000
+    lexer = IncrementalLexer(source)
+    change = lexer.edit(source.index("a", 3000), 1, "bc d")
+    # Relexing starts at the ";" ending the line before and stops at the
+    # ";" after the edit: "; int a" became "; int bc d".
+    assert change == TokenEdit(1283, 1286, 1287)
+    assert [lexer.text(i) for i in range(1283, 1288)] == [";", "int", "bc", "d", ";"]
+    assert (lexer.start(3001), lexer.line(3001), lexer.column(3001)) == (len(source) + 3, 1001, 0)
+
+
+def test_lexer_error_then_recovery():
+    lexer = IncrementalLexer("x = 1;")
+    with pytest.raises(Exception) as e:
+        lexer.edit(4, 0, '"')
+    assert str(e.value) == 'Unclosed String: 1;'
+    assert lexer.source == 'x = "1;'
+    change = lexer.edit(6, 0, '"')
+    assert change.first == 0
+    assert fields(lexer) == expected_fields('x = "1";')
+
+
+def test_buffer_and_bad_edit():
+    lexer = IncrementalLexer(BASE)
+    lexer.edit(5, 0, "yz")
+    buffer = lexer.buffer()
+    assert [buffer.text(i) for i in range(len(buffer))] == [lexer.text(i) for i in range(len(lexer))]
+    with pytest.raises(ValueError):
+        lexer.edit(len(lexer.source), 1, "")
+
+
+# --- 3. Incremental reparse ---
+
+PROGRAM = "struct P { int x; };\nint f(int a) { return a + 1; }\nvoid g() { f(2); }\nvoid main() { g(); }\n"
+
+
+def full_parse(source):
+    try:
+        return str(ASTParser().parse(source))
+    except Exception as e:
+        return str(e)
+
+
+def edit_program(parser, offset, removed, inserted):
+    source = parser.tokens.source[:offset] + inserted + parser.tokens.source[offset + removed:]
+    try:
+        result = str(parser.edit(offset, removed, inserted))
+    except Exception as e:
+        result = str(e)
+    assert result == full_parse(source)
+    return parser.program
+
+
+def test_reparse_keeps_untouched_declarations():
+    parser = IncrementalParser(PROGRAM)
+    struct, f, g, main = parser.program.decls
+    program = edit_program(parser, PROGRAM.index("f(2)") + 2, 1, "a + 3")
+    assert program.decls[0] is struct and program.decls[1] is f and program.decls[3] is main
+    assert program.decls[2] is not g
+
+
+def test_reparse_merges_and_splits_declarations():
+    parser = IncrementalParser(PROGRAM)
+    main = parser.program.decls[3]
+    # Without the closing brace of f the rest of the file reads as its body.
+    edit_program(parser, PROGRAM.index("}\nvoid g"), 1, "")
+    program = edit_program(parser, PROGRAM.index("\nvoid g"), 0, "}")
+    assert len(program.decls) == 4 and program.decls[3] is main
+    program = edit_program(parser, PROGRAM.index("void main"), 0, "int h() { return 0; } ")
+    assert len(program.decls) == 5 and program.decls[4] is main
+
+
+def test_reparse_after_errors():
+    parser = IncrementalParser(PROGRAM)
+    struct, f, g, main = parser.program.decls
+
+    def at(text):
+        return parser.tokens.source.index(text)
+
+    assert edit_program(parser, at("a + 1"), 0, "(") is None
+    assert edit_program(parser, at("f(2)"), 0, ")") is None
+    assert edit_program(parser, at("(a + 1"), 1, "") is None
+    program = edit_program(parser, at(")f(2)"), 1, "")
+    assert program.decls[0] is struct and program.decls[3] is main
+    assert str(program) == full_parse(PROGRAM)
+    # A lexer error leaves no tokens to line up with: the next parse is a full one.
+    assert edit_program(parser, at("f(2)"), 0, "@") is None
+    assert edit_program(parser, at("@"), 1, "").decls[0] is not struct
+
+
+def test_reparse_matches_full_parse_on_random_edits():
+    rng = random.Random(7)
+    source = "\n".join([CORPUS[0], PROGRAM, CORPUS[3]])
+    parser = IncrementalParser(source)
+    for _ in range(150):
+        source = parser.tokens.source
+        offset = rng.randint(0, len(source))
+        removed = rng.randint(0, min(4, len(source) - offset))
+        edit_program(parser, offset, removed, rng.choice(["", " ", "}", "{", ";", rng.choice(PIECES)]))
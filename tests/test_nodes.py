@@ -0,0 +1,93 @@
+import copy
+import pickle
+import sys
+
+import pytest
+from tests.test_ast_parser import CORPUS
+from src.frontend.ast_parser import ASTParser
+from src.frontend.session import FrontEndSession
+from src.utils import nodes
+from src.utils.nodes import *
+from src.utils.traversal import walk
+
+NODE_CLASSES = [cls for cls in vars(nodes).values()
+                if isinstance(cls, type) and issubclass(cls, ASTNode)]
+
+
+# --- 1. Slotted layout ---
+
+@pytest.mark.parametrize("cls", NODE_CLASSES, ids=lambda cls: cls.__name__)
+def test_node_classes_have_no_instance_dict(cls):
+    assert "__slots__" in vars(cls)
+    assert cls.__dictoffset__ == 0
+
+
+def test_parsed_nodes_are_slotted():
+    program = ASTParser().parse("\n".join(CORPUS))
+    for node in walk(program):
+        assert not hasattr(node, "__dict__")
+        assert node.line is None and node.column is None
+
+
+def test_positions_and_fields_stay_assignable():
+    node = BinaryOp(Identifier("a"), "+", IntLiteral(1))
+    node.line, node.column = 3, 7
+    node.operator = "-"
+    assert (node.line, node.column, str(node)) == (3, 7, "BinaryOp(Identifier(a), -, IntLiteral(1))")
+    with pytest.raises(AttributeError):
+        node.comment = "not a field"
+
+
+def test_slotted_nodes_pickle():
+    program = ASTParser().parse("\n".join(CORPUS))
+    assert str(pickle.loads(pickle.dumps(program))) == str(program)
+
+
+# --- 2. Shared types and interned names ---
+
+def test_type_nodes_are_shared():
+    assert IntType() is IntType() and VoidType() is VoidType()
+    assert FloatType() is not StringType()
+    assert StructType("Point") is StructType("".join(["Po", "int"]))
+    assert StructType("Point") is not StructType("Line")
+    assert str(StructType("Point")) == "StructType(Point)"
+
+
+@pytest.mark.parametrize("build", [
+    lambda source: ASTParser().parse(source),
+    lambda source: FrontEndSession().build_ast(source),
+], ids=["direct", "antlr"])
+def test_parsed_types_are_shared(build):
+    program = build("struct P { int x; P next; }; int f(int a, P b) { int c; P d; }")
+    struct, func = program.decls
+    assert struct.members[0].member_type is func.return_type is func.params[0].param_type is IntType()
+    assert struct.members[1].member_type is func.params[1].param_type is StructType("P")
+    assert func.body.statements[1].var_type is StructType("P")
+
+
+def test_names_are_interned():
+    name = "".join(["cou", "nt"])
+    assert name is not sys.intern("count")
+    for node in (Identifier(name), FuncCall(name, []), VarDecl(None, name), StructDecl(name, []),
+                 FuncDecl(None, name, [], BlockStmt([])), Param(IntType(), name)):
+        assert node.name is sys.intern("count")
+    assert MemberAccess(Identifier("p"), name).member is sys.intern("count")
+    assert StructType(name).struct_name is sys.intern("count")
+
+
+def test_shared_types_survive_pickle_and_copy():
+    tree = Program([FuncDecl(StructType("P"), "f", [Param(IntType(), "x")], BlockStmt([]))])
+    loaded = pickle.loads(pickle.dumps(tree))
+    assert loaded.decls[0].return_type is StructType("P")
+    assert loaded.decls[0].params[0].param_type is IntType()
+    assert copy.deepcopy(tree).decls[0].return_type is StructType("P")
+
+
+def test_unused_struct_types_are_dropped():
+    before = len(Type._instances)
+    for i in range(1000):
+        ASTParser().parse(f"struct S{i} {{ int x; }}; S{i} f() {{ S{i} s; return s; }}")
+    assert len(Type._instances) < before + 10
+    tree = ASTParser().parse("struct Kept { int x; }; Kept f() { }")
+    assert StructType("Kept") is tree.decls[1].return_type
+    assert IntType() is tree.decls[0].members[0].member_type
@@ -0,0 +1,74 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from tests.test_ast_parser import CORPUS
+from src.frontend.ast_parser import ASTParser
+from src.frontend.parallel import _split, parse_parallel
+
+DECLS = [
+    'struct P { int x; string s; } /* } */ ;',
+    'int f(int n) { string s = "}{"; // }\n  return n * 2; }',
+    "void g() { { {} } P p = {1, \"a\"}; }",
+] + CORPUS[:1]
+SOURCE = "\n".join(DECLS * 6)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ProcessPoolExecutor(2) as executor:
+        yield executor
+
+
+def serial(source):
+    try:
+        return str(ASTParser().parse(source))
+    except Exception as e:
+        return str(e)
+
+
+def parallel(source, pool):
+    try:
+        return str(parse_parallel(source, workers=3, executor=pool))
+    except Exception as e:
+        return str(e)
+
+
+# --- 1. Splitting ---
+
+def test_split_cuts_between_declarations():
+    tasks = _split(SOURCE, len(SOURCE))
+    # One run per declaration: braces in strings and comments are skipped
+    # and a struct keeps its ";".
+    assert len(tasks) == 6 * (3 + 4)
+    assert [text.strip() for text, _, _ in tasks[:3]] == DECLS[:3]
+    offset = 0
+    for text, line, column in tasks:
+        assert line == SOURCE.count("\n", 0, offset) + 1
+        assert column == offset - SOURCE.rfind("\n", 0, offset) - 1
+        offset += len(text)
+    assert offset == len(SOURCE)
+
+
+# --- 2. Same result as a serial parse ---
+
+def test_parallel_matches_serial(pool):
+    program = parse_parallel(SOURCE, workers=3, executor=pool)
+    assert len(program.decls) == 6 * (3 + 4)
+    assert str(program) == serial(SOURCE)
+
+
+@pytest.mark.parametrize("broken", [
+    "int f(int n) { return n * ; }",       # syntax error inside one run
+    "void g() { x = 1; ",                   # unclosed body swallows the rest
+    "void g() { x = 1; } }",                # stray brace
+    'void g() { s = "open; }',              # lexer error
+    "void g() { x = 1; } ;",                # semicolon after a function
+])
+def test_parallel_errors_match_serial(pool, broken):
+    source = "\n".join(DECLS * 3 + [broken] + DECLS * 3)
+    assert parallel(source, pool) == serial(source)
+
+
+def test_parallel_small_input_is_serial():
+    assert str(parse_parallel("void main() {}", workers=4)) == serial("void main() {}")
+    assert parallel("", None) == serial("")
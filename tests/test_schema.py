@@ -0,0 +1,102 @@
+import sys
+
+import pytest
+from tests.test_ast_parser import CORPUS
+from src.frontend.ast_parser import ASTParser
+from src.utils import binary_ast
+from src.utils.hashing import structurally_equal
+from src.utils.nodes import *
+from src.utils.schema import (child_fields, child_nodes, copy, declares_fields, fields, iter_fields, list_fields,
+                              replace, value_fields)
+from src.utils.traversal import walk
+
+SOURCE = "\n".join(CORPUS)
+
+
+# --- 1. Declared fields ---
+
+def test_every_node_class_declares_its_fields():
+    for cls, schema in binary_ast._SCHEMA.items():
+        assert declares_fields(cls)
+        assert fields(cls) == tuple(name for name, _ in schema)
+        assert child_fields(cls) == tuple(name for name, kind in schema if kind == binary_ast._NODE)
+        assert list_fields(cls) == tuple(name for name, kind in schema if kind == binary_ast._NODES)
+        assert set(value_fields(cls)) == set(fields(cls)) - set(child_fields(cls)) - set(list_fields(cls))
+    assert child_fields(ForStmt) == ("init", "condition", "update", "body")
+    assert (child_fields(FuncDecl), list_fields(FuncDecl), value_fields(FuncDecl)) == (
+        ("return_type", "body"), ("params",), ("name",))
+    assert value_fields(IntLiteral) == ("value",) and child_fields(BreakStmt) == ()
+
+
+def test_child_nodes_follow_the_text_order():
+    # The children in the order ``str`` prints them.
+    def printed(node):
+        children = []
+        for part in node._parts():
+            if isinstance(part, ASTNode):
+                children.append(part)
+            elif isinstance(part, list):
+                children.extend(part)
+        return children
+
+    program = ASTParser().parse(SOURCE)
+    for node in walk(program):
+        children = child_nodes(node)
+        assert children == printed(node)
+        assert children is not child_nodes(node)
+    assert dict(iter_fields(BinaryOp(Identifier("a"), "-", IntLiteral(1)))).keys() == {"left", "operator", "right"}
+
+
+def test_undeclared_fields_are_inspected():
+    class Pair(Expr):
+        __slots__ = ("first", "label", "rest")
+
+        def __init__(self, first, label, rest):
+            super().__init__()
+            self.first, self.label, self.rest = first, label, rest
+
+        def accept(self, visitor, o=None):
+            return None
+
+    pair = Pair(Identifier("a"), "l", [IntLiteral(1), IntLiteral(2)])
+    assert not declares_fields(Pair) and declares_fields(IntLiteral)
+    assert child_nodes(pair) == [pair.first, *pair.rest]
+    with pytest.raises(TypeError, match="does not declare"):
+        child_fields(Pair)
+    other = replace(pair, label="m")
+    assert (other.first, other.label, other.rest) == (pair.first, "m", pair.rest)
+    assert other.rest is not pair.rest and other._hash is None
+
+
+# --- 2. Copy and replace ---
+
+def test_replace_shares_the_rest():
+    program = ASTParser().parse("int f(int a) { return a + 1; }")
+    func = program.decls[0]
+    func.line, func.column = 3, 4
+    body = BlockStmt([])
+    new = replace(func, name="".join(["g"]), body=body)
+    assert type(new) is FuncDecl and new is not func
+    assert new.name is sys.intern("g")
+    assert new.body is body and new.return_type is func.return_type
+    assert new.params == func.params and new.params is not func.params
+    assert new.params[0] is func.params[0]
+    assert (new.line, new.column) == (3, 4)
+    assert str(func) == ("FuncDecl(IntType(), f, [Param(IntType(), a)], BlockStmt([ReturnStmt(return "
+                         "BinaryOp(Identifier(a), +, IntLiteral(1)))]))")
+    with pytest.raises(TypeError, match="has no field 'line'"):
+        replace(func, line=1)
+
+
+def test_copy():
+    program = ASTParser().parse(SOURCE)
+    program.structural_hash()
+    for node in walk(program):
+        duplicate = copy(node)
+        assert structurally_equal(duplicate, node)
+        if isinstance(node, Type):
+            assert duplicate is node
+        else:
+            assert duplicate is not node and duplicate._hash is None
+            assert child_nodes(duplicate) == child_nodes(node)
+    assert replace(StructType("P"), struct_name="Q") is StructType("Q")
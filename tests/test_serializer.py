@@ -0,0 +1,70 @@
+import io
+
+import pytest
+from tests.test_ast_parser import CORPUS
+from src.frontend.ast_parser import ASTParser
+from src.utils import serializer
+from src.utils.nodes import *
+from src.utils.serializer import render, write
+
+
+# --- 1. Same text as before, in one pass ---
+
+def test_expected_text_of_every_node_kind():
+    program = ASTParser().parse(
+        'struct P { int x; }; f(float a) { for (;;) {} auto s = "a\\tb"; '
+        "switch (s) { case 1: break; default: } if (a) return; else return -a++ + p.x; } "
+        "void g() { P p = {1, {}}; while (1) continue; h(); }"
+    )
+    assert str(program) == (
+        "Program([StructDecl(P, [MemberDecl(IntType(), x)]), "
+        "FuncDecl(auto, f, [Param(FloatType(), a)], BlockStmt([ForStmt(for None; None; None do BlockStmt([])), "
+        "VarDecl(auto, s = StringLiteral('a\\\\tb')), "
+        "SwitchStmt(switch Identifier(s) cases [CaseStmt(case IntLiteral(1): [BreakStmt()])], default DefaultStmt(default: [])), "
+        "IfStmt(if Identifier(a) then ReturnStmt(return), else ReturnStmt(return BinaryOp(PrefixOp(-PostfixOp(Identifier(a)++)), +, "
+        "MemberAccess(Identifier(p).x))))])), "
+        "FuncDecl(VoidType(), g, [], BlockStmt([VarDecl(StructType(P), p = StructLiteral({IntLiteral(1), StructLiteral({})})), "
+        "WhileStmt(while IntLiteral(1) do ContinueStmt()), ExprStmt(FuncCall(h, []))]))])"
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, serializer.CHUNK_SIZE])
+def test_write_matches_str(monkeypatch, chunk_size):
+    monkeypatch.setattr(serializer, "CHUNK_SIZE", chunk_size)
+    for source in CORPUS:
+        program = ASTParser().parse(source)
+        out = io.StringIO()
+        write(program, out)
+        assert out.getvalue() == str(program) == render(program)
+
+
+def test_write_to_file(tmp_path):
+    program = ASTParser().parse("\n".join(CORPUS))
+    path = tmp_path / "ast.txt"
+    with open(path, "w") as out:
+        write(program, out)
+    assert path.read_text() == str(program)
+
+
+# --- 2. Deep trees and custom nodes ---
+
+def test_str_of_deep_tree():
+    tree = IntLiteral(0)
+    for _ in range(50000):
+        tree = BinaryOp(IntLiteral(1), "+", tree)
+    text = str(tree)
+    assert text.startswith("BinaryOp(IntLiteral(1), +, BinaryOp(")
+    assert text.endswith("IntLiteral(0)" + ")" * 50000)
+
+
+def test_subclass_with_own_str():
+    class Hole(Expr):
+        __slots__ = ()
+
+        def accept(self, visitor, o=None):
+            return None
+
+        def __str__(self):
+            return "?"
+
+    assert str(ExprStmt(BinaryOp(Hole(), "*", Identifier("x")))) == "ExprStmt(BinaryOp(?, *, Identifier(x)))"
@@ -0,0 +1,81 @@
+import tracemalloc
+
+import pytest
+from tests.utils import Tokenizer
+from antlr4 import InputStream
+from build.TyCLexer import TyCLexer
+from src.frontend.fast_lexer import FastLexer
+from src.frontend.streaming import LexError, StreamToken, iter_token_batches, iter_tokens
+
+ERRORS = 'a @ "x\\q b "open\nc'
+
+
+LEXERS = [None, FastLexer(), TyCLexer(InputStream(""))]
+
+
+def events_of(text, lexer):
+    """``iter_tokens`` over ``text``, wrapped in a char stream for TyCLexer."""
+    source = InputStream(text) if isinstance(lexer, TyCLexer) else text
+    return list(iter_tokens(source, lexer))
+
+
+# --- 1. Tokens and error events ---
+
+@pytest.mark.parametrize("lexer", LEXERS)
+def test_stream_tokens(lexer):
+    assert events_of('int x = "s";\n  y', lexer) == [
+        StreamToken(TyCLexer.INT, "int", 1, 0, 0, 2),
+        StreamToken(TyCLexer.ID, "x", 1, 4, 4, 4),
+        StreamToken(TyCLexer.ASSIGN, "=", 1, 6, 6, 6),
+        StreamToken(TyCLexer.STRLIT, "s", 1, 8, 8, 10),
+        StreamToken(TyCLexer.SEMI, ";", 1, 11, 11, 11),
+        StreamToken(TyCLexer.ID, "y", 2, 2, 15, 15),
+        StreamToken(-1, "<EOF>", 2, 3, 16, 15),
+    ]
+
+
+@pytest.mark.parametrize("lexer", LEXERS)
+def test_stream_continues_after_errors(lexer):
+    assert events_of(ERRORS, lexer) == [
+        StreamToken(TyCLexer.ID, "a", 1, 0, 0, 0),
+        LexError("ErrorToken", "Error Token @", 1, 2, 2),
+        LexError("IllegalEscape", "Illegal Escape In String: x\\q", 1, 4, 4),
+        StreamToken(TyCLexer.ID, "b", 1, 9, 9, 9),
+        LexError("UncloseString", "Unclosed String: open", 1, 11, 11),
+        StreamToken(TyCLexer.ID, "c", 2, 0, 17, 17),
+        StreamToken(-1, "<EOF>", 2, 1, 18, 17),
+    ]
+
+
+def test_stream_stop_on_error():
+    events = list(iter_tokens(ERRORS, stop_on_error=True))
+    assert [type(e) for e in events] == [StreamToken, LexError]
+
+
+def test_session_tokenize_keeps_first_error_format():
+    assert Tokenizer(ERRORS).get_tokens_as_string() == "a,Error Token @"
+    assert Tokenizer("@").get_tokens_as_string() == "Error Token @"
+
+
+# --- 2. Batches and memory ---
+
+def test_stream_batches():
+    source = "x = 1;\n" * 10
+    batches = list(iter_token_batches(source, 16))
+    assert [len(b) for b in batches] == [16, 16, 9]
+    assert [e for b in batches for e in b] == list(iter_tokens(source))
+    with pytest.raises(ValueError):
+        next(iter_token_batches(source, 0))
+
+
+def test_stream_memory_is_bounded():
+    def peak(copies):
+        source = "int x = 1; // c\n" * copies
+        tracemalloc.start()
+        count = sum(1 for _ in iter_tokens(source))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert count == copies * 5 + 1
+        return peak
+
+    assert peak(20000) < peak(200) + 10000
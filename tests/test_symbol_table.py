@@ -0,0 +1,95 @@
+import pytest
+from src.semantics.symbol_table import SymbolTable
+
+
+# --- 1. Scopes ---
+
+def test_shadowing_and_pop():
+    table = SymbolTable()
+    table.declare("x", "param")
+    table.declare("y", "y")
+    table.push()
+    table.declare("x", "inner")
+    assert table.lookup("x") == "inner" and table.lookup("y") == "y"
+    assert table.declared_here("x") and not table.declared_here("y")
+    assert table.depth == 1
+    table.pop()
+    assert table.lookup("x") == "param"
+    assert table.depth == 0
+    assert "z" not in table and table.lookup("z", 0) == 0
+
+
+def test_names_of_closed_scopes_are_gone():
+    table = SymbolTable()
+    table.push()
+    table.declare("a", 1)
+    table.push()
+    table.declare("a", 2)
+    table.declare("b", 3)
+    table.pop()
+    table.declare("b", 4)
+    assert table.lookup("a") == 1 and table.lookup("b") == 4
+    table.pop()
+    assert "a" not in table and "b" not in table
+    table.push()
+    assert "a" not in table
+    table.declare("a", 5)
+    assert table.lookup("a") == 5
+
+
+def test_redeclaration_in_one_scope():
+    table = SymbolTable()
+    table.declare("x", 1)
+    before = table.snapshot()
+    table.declare("x", 2)
+    assert table.lookup("x") == 2
+    assert before.lookup("x") == 1
+
+
+def test_pop_outermost():
+    with pytest.raises(IndexError):
+        SymbolTable().pop()
+
+
+# --- 2. Snapshots ---
+
+def test_snapshots_keep_what_was_visible():
+    table = SymbolTable()
+    table.declare("x", "param")
+    empty = table.snapshot()
+    table.push()
+    table.declare("y", "y1")
+    table.push()
+    table.declare("x", "x2")
+    inner = table.snapshot()
+    table.declare("z", "z2")
+    table.pop()
+    middle = table.snapshot()
+    table.declare("w", "w1")
+    table.pop()
+    table.declare("v", "v0")
+
+    assert inner.names() == {"x": "x2", "y": "y1"}
+    assert inner.depth == 2
+    assert "z" not in inner and "w" not in inner
+    assert middle.names() == {"x": "param", "y": "y1"}
+    assert empty.names() == {"x": "param"}
+    assert empty.lookup("v") is None
+    assert table.snapshot().names() == {"x": "param", "v": "v0"}
+
+
+def test_deep_nesting():
+    table = SymbolTable()
+    snapshots = []
+    for depth in range(10000):
+        table.push()
+        table.declare(f"v{depth}", depth)
+        table.declare("shared", depth)
+        snapshots.append(table.snapshot())
+    assert table.lookup("v0") == 0 and table.lookup("shared") == 9999
+    for _ in range(10000):
+        table.pop()
+    assert "shared" not in table
+    assert snapshots[10].lookup("shared") == 10
+    assert snapshots[10].lookup("v11") is None
+    assert snapshots[-1].lookup("v0") == 0
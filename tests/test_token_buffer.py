@@ -0,0 +1,92 @@
+import sys
+
+import pytest
+from tests.utils import Parser
+from antlr4 import CommonTokenStream, InputStream
+from build.TyCLexer import TyCLexer
+from build.TyCParser import TyCParser
+from src.frontend.fast_lexer import FastLexer
+from src.frontend.parsing import parse_program
+from src.frontend.token_buffer import TokenBuffer, TokenBufferStream
+
+SOURCES = [
+    "",
+    'struct P { int x; string s; };\nvoid main() {\n\tP p = {1, "a\\tb"};\n\tp.x = p.x + 2.5e1; // c\n}',
+    "int f(int n) { if (n <= 1) return 1; else return n * f(n - 1); }",
+    "void main() { x = ; }",
+    "void main() { if (a) ) @ }",
+    'void main() { x = 1; "open',
+]
+
+
+def fields(tokens):
+    return [(t.type, t.text, t.line, t.column, t.start, t.stop, t.tokenIndex) for t in tokens]
+
+
+def common_tokens(source):
+    stream = CommonTokenStream(TyCLexer(InputStream(source)))
+    stream.fill()
+    return stream.tokens
+
+
+def parse_with(stream):
+    parser = TyCParser(stream)
+    try:
+        return parse_program(parser).toStringTree(recog=parser)
+    except Exception as e:
+        return str(e)
+
+
+# --- 1. Buffer contents ---
+
+@pytest.mark.parametrize("src", SOURCES[:3])
+@pytest.mark.parametrize("make_lexer", [FastLexer, lambda s: TyCLexer(InputStream(s))])
+def test_buffer_matches_common_tokens(src, make_lexer):
+    buffer = TokenBuffer.tokenize(src, make_lexer(src))
+    assert fields(buffer) == fields(common_tokens(src))
+    assert [str(t) for t in buffer] == [str(t) for t in common_tokens(src)]
+
+
+def test_buffer_raises_lexer_error():
+    with pytest.raises(Exception) as e:
+        TokenBuffer.tokenize('x = "open')
+    assert str(e.value) == "Unclosed String: open"
+
+
+def test_buffer_columns_are_compact():
+    buffer = TokenBuffer.tokenize("int x = 1;\n" * 5000)
+    arrays = (buffer.types, buffer.starts, buffer.stops, buffer.lines, buffer.columns)
+    assert sum(sys.getsizeof(a) for a in arrays) / len(buffer) < 20
+    assert buffer.text(len(buffer) - 2) == ";"
+    assert buffer.lines[len(buffer) - 2] == 5000
+
+
+# --- 2. TyCParser on a TokenBufferStream ---
+
+@pytest.mark.parametrize("src", SOURCES)
+@pytest.mark.parametrize("make_lexer", [FastLexer, lambda s: TyCLexer(InputStream(s))])
+def test_parser_on_buffer_stream(src, make_lexer):
+    expected = parse_with(CommonTokenStream(TyCLexer(InputStream(src))))
+    assert parse_with(TokenBufferStream(make_lexer(src))) == expected
+
+
+def test_buffer_stream_reuse():
+    lexer = FastLexer("")
+    stream = TokenBufferStream(lexer)
+    parser = TyCParser(stream)
+    for src in SOURCES:
+        lexer.inputStream = src
+        stream.setTokenSource(lexer)
+        parser.setTokenStream(stream)
+        try:
+            parse_program(parser)
+            result = "success"
+        except Exception as e:
+            result = str(e)
+        assert result == Parser(src).parse()
+
+
+def test_buffer_stream_get_text():
+    stream = TokenBufferStream(FastLexer('a = "s" + 1;'))
+    assert stream.getText() == "a=s+1;"
+    assert stream.getText(stream.get(1), stream.get(3)) == "=s+"
@@ -0,0 +1,125 @@
+from tests.test_ast_parser import CORPUS
+from src.frontend.ast_parser import ASTParser
+from src.utils.nodes import *
+from src.utils.transformer import NodeTransformer
+from src.utils.traversal import walk
+
+SOURCE = "\n".join(CORPUS)
+
+
+class Fold(NodeTransformer):
+    """Folds ``+`` and ``*`` of two integer literals."""
+
+    def transform_binary_op(self, node):
+        node = self.generic_transform(node)
+        left, right = node.left, node.right
+        if isinstance(left, IntLiteral) and isinstance(right, IntLiteral) and node.operator in "+*":
+            value = left.value + right.value if node.operator == "+" else left.value * right.value
+            return IntLiteral(value)
+        return node
+
+
+class DropBreaks(NodeTransformer):
+    """Drops ``break`` statements and doubles ``continue`` ones."""
+
+    def transform_break_stmt(self, node):
+        return None
+
+    def transform_continue_stmt(self, node):
+        return [node, ContinueStmt()]
+
+
+# --- 1. Copy on write ---
+
+def test_untouched_tree_is_returned_as_is():
+    program = ASTParser().parse(SOURCE)
+    transformer = NodeTransformer()
+    assert transformer.transform(program) is program
+    assert not transformer.changed(program)
+
+
+def test_only_the_path_to_a_change_is_copied():
+    program = ASTParser().parse("int f() { return 1 + 2 * 3; } void g() { h(a + b); } int k() { return x + 1; }")
+    before = str(program)
+    fold = Fold()
+    result = fold.transform(program)
+    assert str(program) == before
+    f, g, k = result.decls
+    assert str(f) == "FuncDecl(IntType(), f, [], BlockStmt([ReturnStmt(return IntLiteral(7))]))"
+    assert result is not program and f is not program.decls[0]
+    assert g is program.decls[1] and k is program.decls[2]
+    assert f.return_type is IntType()
+    assert [fold.changed(decl) for decl in result.decls] == [True, False, False]
+    assert fold.changed(result)
+    original = {id(node) for node in walk(program)}
+    assert sum(id(node) not in original for node in walk(result)) == 5  # Program, f, block, return, literal
+
+
+def test_positions_are_kept_on_copies():
+    program = ASTParser().parse("void f() {\n  x = 2 * 3;\n}")
+    statement = program.decls[0].body.statements[0]
+    result = Fold().transform(program)
+    copied = result.decls[0].body.statements[0]
+    assert copied is not statement
+    assert (copied.line, copied.column) == (statement.line, statement.column)
+    assert (result.decls[0].line, result.decls[0].column) == (program.decls[0].line, program.decls[0].column)
+
+
+# --- 2. Lists ---
+
+def test_list_items_can_be_dropped_or_spliced():
+    program = ASTParser().parse("void f() { while (a) { x; break; continue; y; } z; }")
+    result = DropBreaks().transform(program)
+    loop = result.decls[0].body.statements[0]
+    assert [type(stmt).__name__ for stmt in loop.body.statements] == [
+        "ExprStmt", "ContinueStmt", "ContinueStmt", "ExprStmt"]
+    assert result.decls[0].body.statements[1] is program.decls[0].body.statements[1]
+    original = program.decls[0].body.statements[0].body.statements
+    assert [type(stmt).__name__ for stmt in original] == ["ExprStmt", "BreakStmt", "ContinueStmt", "ExprStmt"]
+
+
+def test_hooks_are_inherited():
+    class FoldAndDrop(Fold, DropBreaks):
+        pass
+
+    result = FoldAndDrop().transform(ASTParser().parse("void f() { while (1) { x = 1 + 1; break; } }"))
+    assert str(result.decls[0].body) == ("BlockStmt([WhileStmt(while IntLiteral(1) do BlockStmt(["
+                                         "ExprStmt(AssignExpr(Identifier(x) = IntLiteral(2)))]))])")
+
+
+# --- 3. Change tracking ---
+
+def test_changes_are_those_of_the_last_call():
+    fold = Fold()
+    first = fold.transform(ASTParser().parse("int f() { return 1 + 2; } int g() { return 3; }"))
+    assert fold.changed(first.decls[0])
+    second = fold.transform(ASTParser().parse("int f() { return x; } int g() { return 4 * 5; }"))
+    assert [fold.changed(decl) for decl in second.decls] == [False, True]
+    assert not fold.changed(first.decls[0]) and not fold.changed(first)
+    assert len(fold._replaced) == 5  # Program, g, its block, return and literal only
+
+
+def test_shared_and_moved_nodes_are_not_changes():
+    class Retype(NodeTransformer):
+        """Makes ``float`` parameters ``int`` and replaces ``a + b`` by ``b``."""
+
+        def transform_param(self, node):
+            return Param(IntType(), node.name) if node.param_type is FloatType() else node
+
+        def transform_float_type(self, node):
+            return IntType()
+
+        def transform_binary_op(self, node):
+            return node.right
+
+    program = ASTParser().parse("void f(float x, int y) { return a + b; } void g(int z) { }")
+    transformer = Retype()
+    result = transformer.transform(program)
+    f, g = result.decls
+    assert transformer.changed(f) and transformer.changed(f.params[0])
+    assert not transformer.changed(f.params[1]) and not transformer.changed(g)
+    assert not transformer.changed(f.params[0].param_type)
+    assert not transformer.changed(g.params[0].param_type)
+    moved = f.body.statements[0].expr
+    assert moved is program.decls[0].body.statements[0].expr.right
+    assert not transformer.changed(moved)
@@ -0,0 +1,170 @@
+import pytest
+from tests.test_ast_parser import CORPUS
+from tests.test_deep_nesting import DEPTH, shapes
+from src.frontend.ast_parser import ASTParser
+from src.utils.nodes import *
+from src.utils.traversal import SKIP, Fused, Walker, traverse, walk
+
+SOURCE = "\n".join(CORPUS)
+
+
+def events(tree, skip=()):
+    seen = []
+
+    def pre(node):
+        seen.append(("pre", node))
+        if isinstance(node, skip):
+            return SKIP
+
+    traverse(tree, pre, lambda node: seen.append(("post", node)))
+    return seen
+
+
+# --- 1. Order, pruning and depth ---
+
+def test_pre_and_post_order():
+    program = ASTParser().parse(SOURCE)
+    seen = events(program)
+    assert [node for event, node in seen if event == "pre"] == list(walk(program))
+    # Every node is left after all of its children, in a balanced sequence.
+    stack = []
+    for event, node in seen:
+        if event == "pre":
+            stack.append(node)
+        else:
+            assert stack.pop() is node
+    assert not stack
+    order = []
+    traverse(program, post=order.append)
+    assert order == [node for event, node in seen if event == "post"]
+
+
+def test_skip_prunes_the_subtree():
+    program = ASTParser().parse("void f(int a) { return a + 1; } void g() { h(x, y); }")
+    seen = events(program, skip=(FuncCall, Param))
+    entered = [str(node) for event, node in seen if event == "pre"]
+    left = [str(node) for event, node in seen if event == "post"]
+    assert "Param(IntType(), a)" in entered and "IntType()" not in entered
+    assert entered[-1] == left[-5] == "FuncCall(h, [Identifier(x), Identifier(y)])"
+    assert "Identifier(x)" not in entered
+    assert "BinaryOp(Identifier(a), +, IntLiteral(1))" in entered
+
+
+@pytest.mark.parametrize("shape", sorted(shapes(1)))
+def test_deep_programs(shape):
+    program = ASTParser().parse(shapes(DEPTH)[shape])
+    depth = deepest = 0
+
+    def pre(node):
+        nonlocal depth, deepest
+        depth += 1
+        deepest = max(deepest, depth)
+
+    def post(node):
+        nonlocal depth
+        depth -= 1
+
+    traverse(program, pre, post)
+    assert depth == 0 and deepest > DEPTH // 2
+
+
+# --- 2. Walkers ---
+
+class Counts(Walker):
+    def __init__(self):
+        self.calls, self.functions, self.depth, self.deepest_block = [], 0, 0, 0
+
+    def enter_func_decl(self, node):
+        self.functions += 1
+
+    def enter_func_call(self, node):
+        self.calls.append(node.name)
+        return SKIP
+
+    def enter_block_stmt(self, node):
+        self.depth += 1
+        self.deepest_block = max(self.deepest_block, self.depth)
+
+    def leave_block_stmt(self, node):
+        self.depth -= 1
+
+
+def test_walker():
+    program = ASTParser().parse("void f() { g(h(1)); { { k(); } } } int m() { return n(); }")
+    counts = Counts().run(program)
+    assert counts.calls == ["g", "k", "n"]
+    assert counts.functions == 2 and counts.depth == 0 and counts.deepest_block == 3
+
+
+def test_walker_on_nodes_from_elsewhere():
+    class Hole(Expr):
+        __slots__ = ("inner",)
+
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def accept(self, visitor, o=None):
+            return visitor.visit(self.inner, o)
+
+        def _parts(self):
+            return ("Hole(", self.inner, ")")
+
+    counts = Counts().run(ExprStmt(Hole(FuncCall("g", [FuncCall("h", [])]))))
+    assert counts.calls == ["g"]
+
+
+# --- 3. Fused walkers ---
+
+class Log(Walker):
+    """Logs its hooks into a shared list; prunes the kinds in ``skip``."""
+
+    def __init__(self, name, log, skip=()):
+        self.name, self.log, self.skip = name, log, skip
+
+    def enter_func_call(self, node):
+        self.log.append((self.name, "enter", node.name))
+        if FuncCall in self.skip:
+            return SKIP
+
+    def leave_func_call(self, node):
+        self.log.append((self.name, "leave", node.name))
+
+    def enter_identifier(self, node):
+        self.log.append((self.name, "id", node.name))
+
+
+def test_fused_matches_separate_runs():
+    program = ASTParser().parse(SOURCE)
+    separate = [Counts().run(program) for _ in range(3)]
+    fused = Fused(Counts(), Counts(), Counts()).run(program)
+    assert [vars(walker) for walker in fused.walkers] == [vars(walker) for walker in separate]
+    assert Fused().run(program).walkers == ()
+
+
+def test_fused_order_and_pruning_per_walker():
+    program = ASTParser().parse("void f() { g(a, h(b)); c; }")
+    log = []
+    Fused(Log("A", log), Log("B", log, skip=(FuncCall,))).run(program)
+    assert log == [
+        ("A", "enter", "g"), ("B", "enter", "g"),
+        ("A", "id", "a"),
+        ("A", "enter", "h"),
+        ("A", "id", "b"),
+        ("A", "leave", "h"),
+        ("A", "leave", "g"), ("B", "leave", "g"),
+        ("A", "id", "c"), ("B", "id", "c"),
+    ]
+    # Children pruned by every walker are not reached at all.
+    log.clear()
+    reached = []
+
+    class Reached(Walker):
+        def enter_identifier(self, node):
+            reached.append(node.name)
+
+        def enter_func_call(self, node):
+            return SKIP
+
+    Fused(Reached(), Log("B", log, skip=(FuncCall,))).run(program)
+    assert reached == ["c"] and [entry[2] for entry in log] == ["g", "g", "c"]
@@ -0,0 +1,228 @@
+import pytest
+from benchmarks.corpus import program
+from src.frontend.ast_parser import ASTParser
+from src.semantics.static_error import *
+from src.semantics.type_inference import TypeVariables, infer_types
+from src.utils.nodes import *
+from src.utils.traversal import walk
+
+
+def check(source):
+    tree = ASTParser().parse(source)
+    return tree, infer_types(tree)
+
+
+def local_types(source, function=0):
+    tree, table = check(source)
+    body = [decl for decl in tree.decls if isinstance(decl, FuncDecl)][function].body
+    return {node.name: table.type_of(node) for node in walk(body) if isinstance(node, VarDecl)}
+
+
+# --- 1. Union-find ---
+
+def test_type_variables():
+    variables = TypeVariables()
+    a, b, c, d = (variables.new() for _ in range(4))
+    assert variables.unify(a, b) and variables.unify(c, d) and variables.unify(b, d)
+    assert len({variables.find(var) for var in (a, b, c, d)}) == 1
+    assert variables.resolve(c) == variables.find(a)
+    assert variables.unify(a, IntType())
+    assert variables.resolve(d) is IntType()
+    assert variables.unify(d, IntType())
+    assert not variables.unify(c, FloatType())
+    assert not variables.unify(IntType(), FloatType())
+    assert len(variables) == 4
+
+
+def test_find_compresses_paths():
+    variables = TypeVariables()
+    chain = [variables.new() for _ in range(100000)]
+    for child, parent in zip(chain, chain[1:]):
+        variables.parent[child] = parent
+    root = variables.find(chain[0])
+    assert root == chain[-1]
+    assert all(variables.parent[var] == root for var in chain)
+
+
+# --- 2. Inference ---
+
+def test_auto_with_value():
+    types = local_types("""
+        void f() {
+            auto x = 10; auto y = 3.14; auto msg = "hello"; auto z = x + y;
+            auto flag = x < y; auto result = flag && 1; auto n = ++x; auto m = -y;
+        }
+    """)
+    assert types == {
+        "x": IntType(), "y": FloatType(), "msg": StringType(), "z": FloatType(),
+        "flag": IntType(), "result": IntType(), "n": IntType(), "m": FloatType(),
+    }
+
+
+def test_auto_from_first_use():
+    types = local_types("""
+        void f() {
+            auto a; a = 10;
+            auto b; b = 3.14;
+            auto c; c = a + b;
+            auto d; d = readInt();
+            auto e; printString(e);
+            auto g; g++;
+            auto h; auto i; h = i; i = 2.5;
+        }
+    """)
+    assert types == {
+        "a": IntType(), "b": FloatType(), "c": FloatType(), "d": IntType(),
+        "e": StringType(), "g": IntType(), "h": FloatType(), "i": FloatType(),
+    }
+
+
+def test_auto_from_return_and_member():
+    tree, table = check("""
+        struct P { int x; float y; };
+        float f(P p) { auto a; auto b; b = p.y; a = p.x; return b; }
+    """)
+    a, b = tree.decls[1].body.statements[:2]
+    assert table.type_of(a) is IntType() and table.type_of(b) is FloatType()
+
+
+def test_return_types():
+    _, table = check("""
+        half(int n) { return n / 2.0; }
+        nothing() { printInt(1); }
+        early(int n) { if (n) return; printInt(n); }
+        fact(int n) { if (n <= 1) return 1; return n * fact(n - 1); }
+        even(int n) { if (n == 0) return 1; return odd(n - 1); }
+        odd(int n) { if (n == 0) return 0; return even(n - 1); }
+        void main() { auto x = later(); printFloat(x); }
+        later() { return readFloat(); }
+        ping(int n) { if (n) return pong(n - 1); return 1.5; }
+        pong(int n) { return ping(n); }
+    """)
+    assert table.return_type("half") is FloatType()
+    assert table.return_type("nothing") is VoidType()
+    assert table.return_type("early") is VoidType()
+    assert table.return_type("fact") is IntType()
+    assert table.return_type("even") is table.return_type("odd") is IntType()
+    assert table.return_type("later") is FloatType()
+    assert table.return_type("ping") is table.return_type("pong") is FloatType()
+    assert table.return_type("readString") is StringType()
+
+
+def test_expression_types():
+    tree, table = check("""
+        struct P { int x; string s; };
+        void f(P p) { p.x = 7 % 2; p.s; f(p); p = {1, "a"}; readFloat() + 1; }
+    """)
+    for node in walk(tree.decls[1].body):
+        if isinstance(node, Expr):
+            assert isinstance(table.type_of(node), Type), node
+    statements = tree.decls[1].body.statements
+    assert table.type_of(statements[0].expr) is IntType()
+    assert table.type_of(statements[1].expr) is StringType()
+    assert table.type_of(statements[2].expr) is VoidType()
+    assert table.type_of(statements[3].expr.rhs) is StructType("P")
+    assert table.type_of(statements[4].expr) is FloatType()
+    assert table.type_of(statements[0]) is None
+
+
+def test_scopes():
+    types = local_types("""
+        void f(float x) {
+            auto y = x;
+            { int x = 1; auto z = x; }
+            for (auto x = "s"; readInt(); ) { auto w = x; }
+            auto v = x;
+        }
+    """)
+    assert types == {"y": FloatType(), "x": StringType(), "z": IntType(), "w": StringType(), "v": FloatType()}
+
+
+def test_corpus_type_checks():
+    tree, table = check(program(3))
+    assert table.return_type("scale2") is FloatType()
+    assert table.return_type("main0") is VoidType()
+    assert all(table.type_of(node) is not None for node in walk(tree) if isinstance(node, Expr))
+
+
+# --- 3. Errors ---
+
+@pytest.mark.parametrize("source, error, node", [
+    ("void f() { auto x; }", TypeCannotBeInferred, "VarDecl(auto, x)"),
+    ("void f() { auto x; auto y; x = x + y; }", TypeCannotBeInferred, "BinaryOp"),
+    ("void f() { auto x; auto y; x = y; }", TypeCannotBeInferred, "VarDecl(auto, x)"),
+    ("struct P { int x; }; void f() { auto p = {1}; }", TypeCannotBeInferred, "VarDecl"),
+    ("struct P { int x; }; void f() { auto p; p.x = 1; }", TypeCannotBeInferred, "MemberAccess"),
+    ("void f() { auto x = printInt(1); }", TypeMismatchInStatement, "VarDecl"),
+    ("void f() { int x = 1.0; }", TypeMismatchInStatement, "VarDecl"),
+    ("void f() { float x = 1; }", TypeMismatchInStatement, "VarDecl"),
+    ("void f() { if (1.5) return; }", TypeMismatchInStatement, "IfStmt"),
+    ("void f() { while (\"s\") return; }", TypeMismatchInStatement, "WhileStmt"),
+    ("void f() { switch (1) { case 1.0: break; } }", TypeMismatchInStatement, "SwitchStmt"),
+    ("f() { return 1; return 2.0; }", TypeMismatchInStatement, "ReturnStmt(return FloatLiteral"),
+    ("f() { return; return 1; }", TypeMismatchInStatement, "ReturnStmt(return IntLiteral"),
+    ("int f() { return; }", TypeMismatchInStatement, "ReturnStmt"),
+    ("f(int n) { return f(n); }", TypeCannotBeInferred, "FuncDecl(auto, f"),
+    ("k() { auto x; return x; }", TypeCannotBeInferred, "VarDecl(auto, x)"),
+    ("f() { return printInt(1); }", TypeMismatchInStatement, "ReturnStmt"),
+    ("nothing() { } int f() { return nothing(); }", TypeMismatchInStatement, "ReturnStmt"),
+    ("void f() { auto a; a = 1; a = 1.0; }", TypeMismatchInExpression, "AssignExpr"),
+    ("void f() { \"a\" + \"b\"; }", TypeMismatchInExpression, "BinaryOp"),
+    ("void f() { 3.14 % 2; }", TypeMismatchInExpression, "BinaryOp"),
+    ("void f() { auto x = 1.0; x++; }", TypeMismatchInExpression, "PostfixOp"),
+    ("void f() { -\"s\"; }", TypeMismatchInExpression, "PrefixOp"),
+    ("void f() { printInt(1, 2); }", TypeMismatchInExpression, "FuncCall"),
+    ("void f() { printInt(1.0); }", TypeMismatchInExpression, "FuncCall"),
+    ("struct P { int x; }; void f(P p) { p.y; }", TypeMismatchInExpression, "MemberAccess"),
+    ("struct P { int x; }; void f(P p) { p = {1, 2}; }", TypeMismatchInExpression, "AssignExpr"),
+])
+def test_type_errors(source, error, node):
+    with pytest.raises(error) as info:
+        check(source)
+    assert info.type is error
+    assert str(info.value).split(": ", 1)[1].startswith(node)
+
+
+def test_undeclared():
+    with pytest.raises(UndeclaredIdentifier, match="Undeclared Identifier: y"):
+        check("void f() { { int y; } y = 1; }")
+    with pytest.raises(UndeclaredFunction, match="Undeclared Function: g"):
+        check("void f() { g(); }")
+    with pytest.raises(UndeclaredStruct, match="Undeclared Struct: Q"):
+        check("void f(Q q) { }")
+
+
+# --- 4. Scaling ---
+
+def test_long_unification_chain():
+    # a0 = a1; a1 = a2; ... merges every variable before the last one is bound.
+    count = 2000
+    declarations = " ".join(f"auto a{i};" for i in range(count))
+    assignments = " ".join(f"a{i} = a{i + 1};" for i in range(count - 1))
+    types = local_types(f"void f() {{ {declarations} {assignments} a{count - 1} = 1.5; }}")
+    assert set(types.values()) == {FloatType()}
+
+
+# --- 5. Scopes ---
+
+SCOPED = """
+    void f(int x) {
+        auto y = x;
+        { float x = 1.0; printFloat(x); }
+        for (auto i = 0; i < 3; i++) printInt(i + y);
+        printInt(x);
+    }
+"""
+
+
+def test_scope_at_statements():
+    tree = ASTParser().parse(SCOPED)
+    assert infer_types(tree).scope_at(tree.decls[0].body.statements[0]) is None
+    table = infer_types(tree, scopes=True)
+    param = tree.decls[0].params[0]
+    first, block, loop, last = tree.decls[0].body.statements
+    assert table.scope_at(first).names() == {"x": param}
+    assert table.scope_at(block.statements[1]).names() == {"x": block.statements[0], "y": first}
+    assert table.scope_at(loop.body).lookup("i") is loop.init
+    assert table.scope_at(last).names() == {"x": param, "y": first}
+    assert table.type_of(table.scope_at(block.statements[1]).lookup("x")) is FloatType()
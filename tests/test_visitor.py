@@ -0,0 +1,89 @@
+import pytest
+from tests.test_ast_parser import CORPUS
+from src.frontend.ast_parser import ASTParser
+from src.utils.nodes import *
+from src.utils.traversal import walk
+from src.utils.visitor import BaseVisitor
+
+SOURCE = "\n".join(CORPUS)
+
+
+class Recorder(BaseVisitor):
+    """Records the class of every node it reaches, in order."""
+
+    def __init__(self):
+        self.seen = []
+
+    def visit(self, node, o=None):
+        self.seen.append(type(node))
+        return super().visit(node, o)
+
+
+class AcceptRecorder(Recorder):
+    def visit(self, node, o=None):
+        self.seen.append(type(node))
+        return node.accept(self, o)
+
+
+# --- 1. Same visits as through accept ---
+
+@pytest.mark.parametrize("source", CORPUS)
+def test_table_visits_what_accept_visits(source):
+    program = ASTParser().parse(source)
+    table, accept = Recorder(), AcceptRecorder()
+    table.visit(program)
+    accept.visit(program)
+    assert table.seen == accept.seen == [type(node) for node in walk(program)]
+
+
+def test_overridden_methods_and_results():
+    class Names(BaseVisitor):
+        def __init__(self):
+            self.names = []
+
+        def visit_identifier(self, node, o=None):
+            self.names.append((node.name, o))
+
+        def visit_func_call(self, node, o=None):
+            super().visit_func_call(node, o)
+            return node.name
+
+    class Calls(Names):
+        def visit_identifier(self, node, o=None):
+            self.names.append(node.name)
+
+    program = ASTParser().parse("void f() { g(a, h(b)); c = d.e; }")
+    names = Names()
+    names.visit(program, "ctx")
+    assert names.names == [("a", "ctx"), ("b", "ctx"), ("c", "ctx"), ("d", "ctx")]
+    calls = Calls()
+    calls.visit(program)
+    assert calls.names == ["a", "b", "c", "d"]
+    assert calls.visit(program.decls[0].body.statements[0].expr) == "g"
+    assert Calls._dispatch[Identifier] is Calls.visit_identifier
+    assert Names._dispatch[Identifier] is Names.visit_identifier
+
+
+# --- 2. Nodes from elsewhere ---
+
+def test_node_classes_outside_nodes_py_use_their_accept():
+    recorder = Recorder()
+
+    class Pair(Expr):
+        __slots__ = ("first", "second")
+
+        def __init__(self, first, second):
+            super().__init__()
+            self.first, self.second = first, second
+
+        def accept(self, visitor, o=None):
+            visitor.visit(self.first, o)
+            return visitor.visit(self.second, o)
+
+    class Tagged(Identifier):
+        __slots__ = ()
+
+    tree = ExprStmt(BinaryOp(Pair(Tagged("x"), IntLiteral(1)), "+", Tagged("y")))
+    recorder.visit(tree)
+    assert recorder.seen == [ExprStmt, BinaryOp, Pair, Tagged, IntLiteral, Tagged]
+    assert BaseVisitor._dispatch[Pair] is BaseVisitor._dispatch[Tagged]
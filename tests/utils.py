@@ -13,8 +13,22 @@ sys.path.insert(0, build_dir)
 
 from build.TyCLexer import TyCLexer
 from build.TyCParser import TyCParser
-from antlr4 import InputStream, CommonTokenStream
-from src.utils.error_listener import NewErrorListener
+from src.frontend.dfa_cache import install_dfa_cache
+from src.frontend.session import FrontEndSession
+
+# Start from the warmed lexer/parser DFAs of previous runs.
+install_dfa_cache()
+
+# Shared lexer/parser instances (one pair per thread) for all wrappers below.
+session = FrontEndSession()
+
+# Checked once: the session builds ASTs with its own per-thread generator.
+try:
+    from src.astgen.ast_generation import ASTGeneration  # noqa: F401
+
+    HAS_AST_GENERATION = True
+except ImportError:
+    HAS_AST_GENERATION = False
 
 
 class ASTGenerator:
@@ -22,31 +36,13 @@ class ASTGenerator:
 
     def __init__(self, input_string: str):
         self.input_string = input_string
-        self.input_stream = InputStream(input_string)
-        self.lexer = TyCLexer(self.input_stream)
-        self.token_stream = CommonTokenStream(self.lexer)
-        self.parser = TyCParser(self.token_stream)
-        self.parser.removeErrorListeners()
-        self.parser.addErrorListener(NewErrorListener.INSTANCE)
-        # Import here to avoid circular dependency issues during build
-        try:
-            from src.astgen.ast_generation import ASTGeneration
-
-            self.ast_generator = ASTGeneration()
-        except ImportError:
-            self.ast_generator = None
 
     def generate(self):
         """Generate AST from the input string."""
-        if self.ast_generator is None:
+        if not HAS_AST_GENERATION:
             return "AST Generation Error: ASTGeneration class not found. Please implement src/astgen/ast_generation.py"
         try:
-            # Parse the program starting from the entry point
-            parse_tree = self.parser.program()
-
-            # Generate AST using the visitor
-            ast = self.ast_generator.visit(parse_tree)
-            return ast
+            return session.build_ast(self.input_string)
         except Exception as e:
             return f"AST Generation Error: {str(e)}"
 
@@ -59,26 +55,7 @@ class Tokenizer:
 
     def get_tokens_as_string(self) -> str:
         """Get tokens as comma-separated string (only token text)"""
-        input_stream = InputStream(self.source_code)
-        lexer = TyCLexer(input_stream)
-
-        tokens = []
-        try:
-            while True:
-                token = lexer.nextToken()
-                if token.type == -1:  # EOF
-                    tokens.append("<EOF>")
-                    break
-                tokens.append(token.text if token.text else "")
-        except Exception as e:
-            # If we already have some tokens, append error message
-            if tokens:
-                tokens.append(str(e))
-            else:
-                # If no tokens yet, just return error message
-                return str(e)
-
-        return ",".join(tokens)
+        return session.tokenize(self.source_code)
 
 
 class Parser:
@@ -89,15 +66,4 @@ class Parser:
 
     def parse(self) -> str:
         """Parse source code and return result"""
-        input_stream = InputStream(self.source_code)
-        lexer = TyCLexer(input_stream)
-        token_stream = CommonTokenStream(lexer)
-        parser = TyCParser(token_stream)
-        parser.removeErrorListeners()
-        parser.addErrorListener(NewErrorListener.INSTANCE)
-
-        try:
-            tree = parser.program()
-            return "success"
-        except Exception as e:
-            return str(e)
+        return session.parse(self.source_code)